@@ -0,0 +1,99 @@
+"""Ansible callback that records per-host task timings for the ATL CLI"""
+
+import json
+import os
+import time
+
+from ansible.plugins.callback import CallbackBase
+
+DOCUMENTATION = """
+    name: atl_trace
+    type: aggregate
+    short_description: Record per-host task timings as JSON lines
+    description:
+      - Writes one JSON object per finished task and host to the file named
+        by the C(ATL_TRACE_FILE) environment variable.
+      - Used by the atl CLI to build deploy traces.
+    requirements:
+      - enable in configuration
+"""
+
+
+class CallbackModule(CallbackBase):
+    """Record task start/end times per host"""
+
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = "aggregate"
+    CALLBACK_NAME = "atl_trace"
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self):
+        super().__init__()
+        self._path = os.environ.get("ATL_TRACE_FILE")
+        self._play = ""
+        self._task_start: dict[str, float] = {}
+        self._host_start: dict[tuple[str, str], float] = {}
+
+    def _write(self, event: dict):
+        if not self._path:
+            return
+        with open(self._path, "a") as f:
+            f.write(json.dumps(event) + "\n")
+
+    def v2_playbook_on_play_start(self, play):
+        self._play = play.get_name().strip()
+
+    def v2_playbook_on_task_start(self, task, is_conditional):
+        self._task_start[task._uuid] = time.time()
+
+    def v2_playbook_on_handler_task_start(self, task):
+        self._task_start[task._uuid] = time.time()
+
+    def v2_runner_on_start(self, host, task):
+        self._host_start[(host.get_name(), task._uuid)] = time.time()
+
+    def _record(self, result, status: str):
+        task = result._task
+        host = result._host.get_name()
+        start = self._host_start.pop(
+            (host, task._uuid), self._task_start.get(task._uuid, time.time())
+        )
+        self._write(
+            {
+                "event": "task",
+                "play": self._play,
+                "task": task.get_name().strip(),
+                "role": task._role.get_name() if task._role else "",
+                "action": task.action,
+                "host": host,
+                "start": start,
+                "end": time.time(),
+                "status": status,
+            }
+        )
+
+    def v2_runner_on_ok(self, result):
+        self._record(result, "changed" if result._result.get("changed") else "ok")
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._record(result, "ignored" if ignore_errors else "failed")
+
+    def v2_runner_on_skipped(self, result):
+        self._record(result, "skipped")
+
+    def v2_runner_on_unreachable(self, result):
+        self._record(result, "unreachable")
+
+    def v2_playbook_on_stats(self, stats):
+        for host in sorted(stats.processed.keys()):
+            summary = stats.summarize(host)
+            self._write(
+                {
+                    "event": "stats",
+                    "host": host,
+                    "failures": summary["failures"],
+                    "unreachable": summary["unreachable"],
+                    "changed": summary["changed"],
+                    "ok": summary["ok"],
+                }
+            )
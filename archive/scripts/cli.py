@@ -4,13 +4,18 @@ All Things Linux Infrastructure CLI
 Unified command-line interface for all infrastructure operations
 """
 
+from pathlib import Path
+
 import click
 from rich.console import Console
 
 # Import all command modules at the top
 from .commands.deploy import cli as deploy_group
+from .commands.deploy import init_context
 from .commands.diagrams import cli as diagrams_command
 from .commands.docs import cli as docs_command
+from .commands.docs import serve_cli as docs_serve_command
+from .commands.emergency import cli as emergency_group
 from .commands.lint import cli as lint_command
 from .commands.update_collections import cli as update_collections_command
 
@@ -38,15 +43,13 @@ def cli():
 # === Infrastructure Commands ===
 
 
-@cli.group(name="infra")
-def infra():
-    """Infrastructure management commands (Terraform + Ansible)"""
-    pass
+# The deploy group itself, so its callback sets up the logger and manager
+cli.add_command(deploy_group, name="infra")
+
 
+# === Emergency Commands ===
 
-# Add all deploy commands to the infra group
-for command_name, command in deploy_group.commands.items():
-    infra.add_command(command, name=command_name)
+cli.add_command(emergency_group, name="emergency")
 
 
 # === Quality Commands ===
@@ -72,6 +75,7 @@ def docs():
 
 docs.add_command(docs_command, name="build")
 docs.add_command(diagrams_command, name="diagrams")
+docs.add_command(docs_serve_command, name="serve")
 
 
 # === Utility Commands ===
@@ -97,14 +101,21 @@ utils.add_command(update_collections_command, name="update-collections")
 @click.option(
     "--max-age", "-a", type=int, default=7, help="Maximum age of log files in days"
 )
+@click.option(
+    "--max-archive-size",
+    type=int,
+    default=256,
+    show_default=True,
+    help="Size budget of the compressed log archives in MB",
+)
 @click.option(
     "--dry-run",
     "-d",
     is_flag=True,
     help="Show what would be cleaned up without doing it",
 )
-def cleanup_logs(max_files, max_age, dry_run):
-    """Clean up old log files"""
+def cleanup_logs(max_files, max_age, max_archive_size, dry_run):
+    """Archive old log files and prune the archives"""
     from pathlib import Path
 
     from .common.logging import LogCleaner
@@ -115,50 +126,103 @@ def cleanup_logs(max_files, max_age, dry_run):
         console.print("No logs directory found", style="yellow")
         return
 
+    cleaner = LogCleaner(log_dir)
+    log_groups, _ = cleaner.scan()
+
     # Count current log files
-    log_files = list(log_dir.glob("*.log"))
-    if not log_files:
+    log_count = sum(len(files) for files in log_groups.values())
+    if not log_count:
         console.print("No log files found to clean up", style="green")
         return
 
-    console.print(f"Found {len(log_files)} log files in {log_dir}")
+    console.print(f"Found {log_count} log files in {log_dir}")
 
     if dry_run:
         console.print(
-            f"[dim]Would clean up logs older than {max_age} days and keep only {max_files} files per tool type[/dim]"
+            f"[dim]Would archive logs older than {max_age} days and keep only {max_files} files per tool type[/dim]"
+        )
+        archive_bytes = sum(size for _path, size in cleaner.archive.archives())
+        console.print(
+            f"[dim]Archives use {archive_bytes / 1024 / 1024:.1f} of {max_archive_size} MB[/dim]"
         )
         # Show what would be cleaned
-        cleaner = LogCleaner(log_dir)
-
-        # Get log groups for display
-        import re
-
-        log_groups = {}
-        for log_file in log_files:
-            match = re.match(r"^([^-]+)-\d{8}_\d{6}\.log$", log_file.name)
-            if match:
-                tool_name = match.group(1)
-                if tool_name not in log_groups:
-                    log_groups[tool_name] = []
-                log_groups[tool_name].append(log_file)
-
         for tool_name, files in log_groups.items():
-            files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
             console.print(f"  [blue]{tool_name}[/blue]: {len(files)} files")
-            if len(files) > max_files:
+            expired = cleaner.expired(files, max_files, max_age)
+            if expired:
                 console.print(
-                    f"    [dim]Would remove {len(files) - max_files} older files[/dim]"
+                    f"    [dim]Would archive {len(expired)} older files[/dim]"
                 )
     else:
-        cleaner = LogCleaner(log_dir)
-        files_removed = cleaner.cleanup_logs(max_files, max_age)
+        files_removed = cleaner.cleanup_logs(max_files, max_age, max_archive_size)
 
         if files_removed > 0:
-            console.print(f"✅ Cleaned up {files_removed} log files", style="green")
+            console.print(
+                f"✅ Archived or removed {files_removed} log files", style="green"
+            )
         else:
             console.print("No old log files to clean up", style="green")
 
 
+@utils.command(name="search-logs")
+@click.argument("pattern")
+@click.option("--tool", "-t", help="Only search logs of this tool (e.g. deploy)")
+@click.option(
+    "--since",
+    "-s",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Only search logs from this day on (YYYY-MM-DD)",
+)
+@click.option("--ignore-case", "-i", is_flag=True, help="Match case-insensitively")
+@click.option(
+    "--archived-only", is_flag=True, help="Skip the current (unarchived) log files"
+)
+def search_logs(pattern, tool, since, ignore_case, archived_only):
+    """Search current and archived logs for a regular expression"""
+    import re
+    from itertools import chain
+
+    from .common.archive import LOG_NAME, search_file
+    from .common.logging import LogCleaner
+
+    try:
+        regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+    except re.error as e:
+        raise click.BadParameter(str(e), param_hint="PATTERN") from e
+
+    cleaner = LogCleaner(Path.cwd() / "logs")
+    day = since.strftime("%Y%m%d") if since else None
+
+    # Archives hold the older logs, so search them first
+    matches = cleaner.archive.search(regex, tool, day)
+    if not archived_only:
+        log_groups, _ = cleaner.scan()
+        current = sorted(
+            name
+            for group, files in log_groups.items()
+            if not tool or group == tool
+            for _mtime, name in files
+            if not day or LOG_NAME.match(name)["day"] >= day
+        )
+        matches = chain(
+            matches,
+            chain.from_iterable(
+                search_file(cleaner.log_dir / name, regex) for name in current
+            ),
+        )
+
+    count = 0
+    for name, number, line in matches:
+        console.print(f"[blue]{name}[/blue]:[dim]{number}[/dim]: ", end="")
+        console.print(line, markup=False, highlight=False)
+        count += 1
+
+    for path in cleaner.archive.damaged:
+        console.print(f"Archive {path.name} is truncated or corrupt", style="yellow")
+    if not count:
+        console.print("No matches found", style="yellow")
+
+
 # === Quick Access Commands ===
 
 
@@ -187,16 +251,15 @@ def plan(
     """Quick plan command (equivalent to 'atl infra plan')"""
     from .commands.deploy import plan as deploy_plan
 
-    ctx = click.Context(deploy_plan)
-    ctx.obj = {"environment": environment, "verbose": verbose, "dry_run": dry_run}
-
-    ctx.invoke(
-        deploy_plan,
-        target=target,
-        domain_name=domain_name,
-        ansible_only=ansible_only,
-        terraform_only=terraform_only,
-    )
+    with click.Context(deploy_group, info_name="infra") as ctx:
+        init_context(ctx, environment, verbose, dry_run)
+        ctx.invoke(
+            deploy_plan,
+            target=target,
+            domain_name=domain_name,
+            ansible_only=ansible_only,
+            terraform_only=terraform_only,
+        )
 
 
 @cli.command()
@@ -219,6 +282,36 @@ def plan(
 @click.option("--auto-approve", "-y", is_flag=True, help="Auto-approve changes")
 @click.option("--ansible-only", is_flag=True, help="Run only Ansible configuration")
 @click.option("--terraform-only", is_flag=True, help="Run only Terraform provisioning")
+@click.option(
+    "--pipeline",
+    is_flag=True,
+    help="Bootstrap servers as soon as Terraform creates them",
+)
+@click.option(
+    "--bootstrap-workers",
+    type=int,
+    default=4,
+    help="Concurrent bootstrap runs in pipeline mode",
+)
+@click.option(
+    "--batch-size",
+    help="Roll Ansible out in batches of N hosts or N% of each domain",
+)
+@click.option(
+    "--max-failures",
+    default="0",
+    help="Failed hosts (N or N%) tolerated before a rollout stops",
+)
+@click.option(
+    "--health-gate/--no-health-gate",
+    default=True,
+    help="Run the health-check playbook between rollout batches",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Continue the last failed apply, skipping completed phases and hosts",
+)
 def apply(
     environment,
     verbose,
@@ -228,21 +321,32 @@ def apply(
     auto_approve,
     ansible_only,
     terraform_only,
+    pipeline,
+    bootstrap_workers,
+    batch_size,
+    max_failures,
+    health_gate,
+    resume,
 ):
     """Quick apply command (equivalent to 'atl infra apply')"""
     from .commands.deploy import apply as deploy_apply
 
-    ctx = click.Context(deploy_apply)
-    ctx.obj = {"environment": environment, "verbose": verbose, "dry_run": dry_run}
-
-    ctx.invoke(
-        deploy_apply,
-        target=target,
-        domain_name=domain_name,
-        auto_approve=auto_approve,
-        ansible_only=ansible_only,
-        terraform_only=terraform_only,
-    )
+    with click.Context(deploy_group, info_name="infra") as ctx:
+        init_context(ctx, environment, verbose, dry_run)
+        ctx.invoke(
+            deploy_apply,
+            target=target,
+            domain_name=domain_name,
+            auto_approve=auto_approve,
+            ansible_only=ansible_only,
+            terraform_only=terraform_only,
+            pipeline=pipeline,
+            bootstrap_workers=bootstrap_workers,
+            batch_size=batch_size,
+            max_failures=max_failures,
+            health_gate=health_gate,
+            resume=resume,
+        )
 
 
 @cli.command()
@@ -268,12 +372,64 @@ def apply(
 @click.option("--verbose", "-v", is_flag=True, help="Enable verbose output")
 @click.option("--fix", "-f", is_flag=True, help="Try to auto-fix issues where possible")
 @click.option("--strict", is_flag=True, help="Use strict mode (exit on warnings)")
-def lint(target, verbose, fix, strict):
+@click.option(
+    "--jobs",
+    "-j",
+    type=int,
+    help="Linters to run at once (default: CPU count, 1 runs them serially)",
+)
+@click.option(
+    "--no-cache", is_flag=True, help="Lint every file, ignoring cached passes"
+)
+@click.option("--since", metavar="REF", help="Only lint files changed since a git ref")
+@click.option("--staged", is_flag=True, help="Only lint files staged for commit")
+@click.option(
+    "--sarif",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write merged findings as SARIF here (default: next to the log file)",
+)
+@click.option(
+    "--watch",
+    "-w",
+    is_flag=True,
+    help="Relint changed files whenever they are saved, until interrupted",
+)
+@click.option(
+    "--benchmark-overhead",
+    is_flag=True,
+    help="Time tool startup via 'uv run' versus direct execution, then exit",
+)
+def lint(
+    target,
+    verbose,
+    fix,
+    strict,
+    jobs,
+    no_cache,
+    since,
+    staged,
+    sarif,
+    watch,
+    benchmark_overhead,
+):
     """Quick lint command (equivalent to 'atl quality lint')"""
     from .commands.lint import cli as lint_cli
 
     ctx = click.Context(lint_cli)
-    ctx.invoke(lint_cli, target=target, verbose=verbose, fix=fix, strict=strict)
+    ctx.invoke(
+        lint_cli,
+        target=target,
+        verbose=verbose,
+        fix=fix,
+        strict=strict,
+        jobs=jobs,
+        no_cache=no_cache,
+        since=since,
+        staged=staged,
+        sarif=sarif,
+        watch=watch,
+        benchmark_overhead=benchmark_overhead,
+    )
 
 
 # === Help and Info Commands ===
@@ -289,13 +445,17 @@ def info():
     console.print(
         "  [cyan]infra[/cyan]     - Infrastructure management (Terraform + Ansible)"
     )
-    console.print("    • plan, apply, destroy, check, enable, disable, config")
+    console.print(
+        "    • plan, apply, destroy, check, enable, disable, config, history, facts"
+    )
+    console.print("  [cyan]emergency[/cyan] - Low-latency emergency actions")
+    console.print("    • restart, isolate, warm, index")
     console.print("  [cyan]quality[/cyan]   - Code quality and linting")
     console.print("    • lint")
     console.print("  [cyan]docs[/cyan]      - Documentation and diagrams")
-    console.print("    • build, diagrams")
+    console.print("    • build, diagrams, serve")
     console.print("  [cyan]utils[/cyan]     - Utility and maintenance commands")
-    console.print("    • update-collections, cleanup-logs")
+    console.print("    • update-collections, cleanup-logs, search-logs")
     console.print()
     console.print("[bold]Quick Access Commands:[/bold]")
     console.print("  [green]plan[/green]      - Plan infrastructure changes")
@@ -308,10 +468,17 @@ def info():
         "  atl apply -y                      # Apply changes with auto-approve"
     )
     console.print("  atl infra destroy                 # Destroy infrastructure")
+    console.print(
+        "  atl infra -e production history   # Deploy timings and regressions"
+    )
+    console.print("  atl emergency restart mail        # Restart hosts running mail")
     console.print("  atl quality lint --fix            # Run linting with auto-fix")
     console.print("  atl docs build --serve            # Build and serve documentation")
     console.print("  atl utils update-collections      # Update Ansible collections")
     console.print("  atl utils cleanup-logs            # Clean up old log files")
+    console.print(
+        '  atl utils search-logs "timed out" # Search current and archived logs'
+    )
     console.print()
     console.print("Use 'atl <command> --help' for detailed help on any command.")
 
@@ -4,26 +4,49 @@ All Things Linux Infrastructure Deployment Script
 Python version of the bash deploy.sh script with enhanced features
 """
 
+import json
 import os
+import re
+import sqlite3
 import subprocess
 import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 import click
+import httpx
 from rich.console import Console
+from rich.table import Table
 
 from ..common.config import ConfigManager
+from ..common.history import GROUPS, DeployHistory, percentile
+from ..common.journal import RunJournal, fingerprint
 from ..common.logging import InfraLogger
+from ..common.process import StreamResult, run_streaming
+from ..common.rollout import RollingScheduler
+from ..common.tracing import Tracer
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
 
 
 class DeploymentManager:
     """Main deployment manager"""
 
+    # Seconds cached facts stay valid (fact_caching_timeout in ansible.cfg)
+    FACT_CACHE_TIMEOUT = 86400
+
     def __init__(self, project_root: Path, logger: InfraLogger):
         self.project_root = project_root
         self.logger = logger
         self.config_manager = ConfigManager(project_root, logger)
         self.console = Console()
+        self.tracer = Tracer("deploy")
+        self.callback_dir = project_root / "ansible" / "plugins" / "callback"
+        self.fact_cache_dir = project_root / ".ansible" / "facts_cache"
+        self.journal: RunJournal | None = None
+        self.history = DeployHistory(project_root / ".state" / "history.db")
+        self.started = time.time()
 
     def run_terraform(
         self, action: str, environment: str, auto_approve: bool = False
@@ -32,8 +55,203 @@ class DeploymentManager:
         self.logger.info(f"Running Terraform {action} for {environment} environment...")
 
         terraform_dir = self.project_root / "terraform"
+        inputs = self._terraform_fingerprint(environment)
+        if action == "apply" and self._phase_done("terraform apply", inputs):
+            return True
+
+        env = self._terraform_env()
+
+        try:
+            self._terraform_init(environment, env, terraform_dir)
+
+            # Run the terraform action
+            cmd = ["terraform", action, f"-var=environment={environment}"]
+
+            if auto_approve and action in ["apply", "destroy"]:
+                cmd.append("-auto-approve")
+
+            with self.tracer.span(f"terraform {action}", environment=environment):
+                self._stream(cmd, "terraform", terraform_dir, env)
+
+            if action == "apply" and self.journal:
+                self.journal.complete_phase("terraform apply", inputs)
+
+            self.logger.success(f"Terraform {action} completed successfully")
+            return True
+
+        except subprocess.CalledProcessError as e:
+            self.logger.error(f"Terraform {action} failed: {e}")
+            return False
+
+    def run_pipelined_apply(
+        self,
+        environment: str,
+        auto_approve: bool = False,
+        verbose: bool = False,
+        dry_run: bool = False,
+        workers: int = 4,
+    ) -> bool:
+        """Apply Terraform and bootstrap servers as soon as they are created
+
+        Streams ``terraform apply -json`` and queues a bootstrap run for each
+        ``hcloud_server`` the moment its creation completes, so Ansible work
+        overlaps with the rest of the Terraform apply.
+        """
+        self.logger.info(
+            f"Running pipelined Terraform apply for {environment} environment..."
+        )
+
+        terraform_dir = self.project_root / "terraform"
+        inputs = self._terraform_fingerprint(environment)
+        if self._phase_done("terraform apply", inputs):
+            return True
+
+        env = self._terraform_env()
+        plan_file = self.project_root / ".terraform" / f"{environment}.tfplan"
+
+        try:
+            self._terraform_init(environment, env, terraform_dir)
+
+            cmd = ["terraform", "apply", "-json"]
+            if auto_approve:
+                cmd.extend([f"-var=environment={environment}", "-auto-approve"])
+            else:
+                # -json cannot prompt, so review a saved plan first
+                with self.tracer.span("terraform plan", environment=environment):
+                    self._stream(
+                        [
+                            "terraform",
+                            "plan",
+                            f"-var=environment={environment}",
+                            f"-out={plan_file}",
+                        ],
+                        "terraform",
+                        terraform_dir,
+                        env,
+                    )
+                if not click.confirm("Apply this plan?"):
+                    self.logger.info("Apply cancelled")
+                    return False
+                cmd.append(str(plan_file))
+
+        except subprocess.CalledProcessError as e:
+            self.logger.error(f"Terraform apply failed: {e}")
+            return False
+
+        bootstraps: dict[str, Future] = {}
+        with (
+            ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="bootstrap"
+            ) as executor,
+            self.tracer.span("terraform apply", environment=environment) as span,
+        ):
+            process = subprocess.Popen(
+                cmd,
+                cwd=terraform_dir,
+                env=env,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            for line in process.stdout or ():
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    self.logger.debug(f"terraform: {line.rstrip()}")
+                    continue
+
+                if event.get("@level") == "error":
+                    self.logger.error(event.get("@message", ""))
+                elif event.get("type") in ("apply_complete", "apply_errored"):
+                    self.logger.info(event.get("@message", ""))
+
+                hook = event.get("hook", {})
+                resource = hook.get("resource", {})
+                if (
+                    event.get("type") != "apply_complete"
+                    or resource.get("resource_type") != "hcloud_server"
+                    or hook.get("action") != "create"
+                ):
+                    continue
+
+                server = self._resolve_server(hook.get("id_value", ""))
+                ip = (
+                    server.get("public_net", {}).get("ipv4", {}).get("ip")
+                    if server
+                    else None
+                )
+                if not ip:
+                    self.logger.warn(
+                        f"No IP known for {resource.get('addr')}, "
+                        "it will be configured after the apply"
+                    )
+                    continue
+
+                host = self._inventory_host(
+                    str(resource.get("resource_key", "")), server
+                )
+                if not host:
+                    self.logger.warn(
+                        f"Cannot tell which inventory host {server.get('name')} is, "
+                        "it will be configured after the apply"
+                    )
+                    continue
+
+                self.logger.info(f"Queueing bootstrap for {host} ({ip})")
+                bootstraps[host] = executor.submit(
+                    self._bootstrap_host, host, ip, verbose, dry_run
+                )
+
+            span["exit_code"] = process.wait()
+            terraform_ok = span["exit_code"] == 0
+            if not terraform_ok:
+                span["status"] = "error"
+
+        plan_file.unlink(missing_ok=True)
+
+        failed = [host for host, future in bootstraps.items() if not future.result()]
+        if not terraform_ok:
+            self.logger.error("Terraform apply failed")
+        if failed:
+            self.logger.error(f"Bootstrap failed on: {', '.join(sorted(failed))}")
+        # Bootstraps are not journaled: a resumed apply only reports creates
+        # for new servers, which always need bootstrapping, and site.yml
+        # bootstraps every host again in the Ansible phase
+        if not terraform_ok or failed:
+            return False
 
-        # Set up environment for project-specific terraform configuration
+        if self.journal:
+            self.journal.complete_phase("terraform apply", inputs)
+
+        self.logger.success(
+            f"Terraform apply completed, {len(bootstraps)} new hosts bootstrapped"
+        )
+        return True
+
+    def _stream(
+        self,
+        cmd: list[str],
+        source: str,
+        cwd: Path | None = None,
+        env: dict[str, str] | None = None,
+        mirror: bool = True,
+    ) -> StreamResult:
+        """Run a command, teeing its output into the deploy log line by line
+
+        Raises:
+            subprocess.CalledProcessError: If the command fails; its
+                ``stderr`` holds the last lines of output
+        """
+        result = run_streaming(
+            cmd,
+            lambda _stream, line: self.logger.output(source, line, mirror),
+            cwd=cwd or self.project_root,
+            env=env,
+        )
+        result.check()
+        return result
+
+    def _terraform_env(self) -> dict[str, str]:
+        """Build the environment for project-specific terraform configuration"""
         env = os.environ.copy()
         env["TF_CLI_CONFIG_FILE"] = str(self.project_root / ".terraformrc")
         env["TF_PLUGIN_CACHE_DIR"] = str(self.project_root / ".terraform" / "cache")
@@ -49,43 +267,119 @@ class DeploymentManager:
         self.logger.info(f"Plugin cache directory: {cache_dir}")
         self.logger.info(f"Terraform data directory: {data_dir}")
 
-        try:
-            # Change to terraform directory
-            os.chdir(terraform_dir)
+        return env
 
-            # Initialize Terraform with project-specific configuration
-            subprocess.run(["terraform", "init"], check=True, env=env)
+    def _terraform_init(self, environment: str, env: dict, terraform_dir: Path):
+        """Initialize Terraform and select (or create) the environment workspace"""
+        with self.tracer.span("terraform init"):
+            self._stream(["terraform", "init"], "terraform", terraform_dir, env)
 
-            # Select or create workspace
-            try:
+        try:
+            with self.tracer.span("terraform workspace select"):
                 subprocess.run(
                     ["terraform", "workspace", "select", environment],
                     check=True,
                     capture_output=True,
                     env=env,
+                    cwd=terraform_dir,
                 )
-            except subprocess.CalledProcessError:
-                subprocess.run(
-                    ["terraform", "workspace", "new", environment], check=True, env=env
+        except subprocess.CalledProcessError:
+            with self.tracer.span("terraform workspace new"):
+                self._stream(
+                    ["terraform", "workspace", "new", environment],
+                    "terraform",
+                    terraform_dir,
+                    env,
                 )
 
-            # Run the terraform action
-            cmd = ["terraform", action, f"-var=environment={environment}"]
-
-            if auto_approve and action in ["apply", "destroy"]:
-                cmd.append("-auto-approve")
-
-            subprocess.run(cmd, check=True, env=env)
+    def _resolve_server(self, server_id: str) -> dict | None:
+        """Look up a Hetzner Cloud server (name, labels, addresses)"""
+        token = os.getenv("HCLOUD_TOKEN")
+        if not server_id or not token:
+            return None
 
-            self.logger.success(f"Terraform {action} completed successfully")
-            return True
+        try:
+            with self.tracer.span("resolve server", server_id=server_id):
+                response = httpx.get(
+                    f"https://api.hetzner.cloud/v1/servers/{server_id}",
+                    headers={"Authorization": f"Bearer {token}"},
+                    timeout=30,
+                )
+            response.raise_for_status()
+            return response.json()["server"]
+        except (httpx.HTTPError, KeyError, TypeError, ValueError) as e:
+            self.logger.debug(f"Could not look up server {server_id}: {e}")
+            return None
+
+    def _inventory_host(self, resource_key: str, server: dict) -> str | None:
+        """Pick the one inventory host a created server is
+
+        Components with several hosts (a ``servers:`` cluster or a ``count``)
+        are told apart by the server's ``inventory_host`` label, or else by
+        exactly one of their hostnames appearing in the server name.
+        """
+        labels = server.get("labels") or {}
+        hosts = self.config_manager.get_inventory_hosts(
+            labels.get("role") or resource_key
+        )
+        if labels.get("inventory_host") in hosts:
+            return labels["inventory_host"]
+        if len(hosts) == 1:
+            return hosts[0]
+
+        name = server.get("name", "")
+        matches = [
+            host for host in hosts if re.search(rf"(^|-){re.escape(host)}(-|$)", name)
+        ]
+        return matches[0] if len(matches) == 1 else None
+
+    def _bootstrap_host(
+        self, host: str, ip: str, verbose: bool = False, dry_run: bool = False
+    ) -> bool:
+        """Run the bootstrap playbook against a single freshly created host"""
+        cmd = [
+            "ansible-playbook",
+            "playbooks/infrastructure/bootstrap.yml",
+            "-i",
+            "inventories/dynamic.py",
+            "--limit",
+            host,
+            "--extra-vars",
+            f"ansible_host={ip}",
+        ]
+        if verbose:
+            cmd.append("-vvv")
+        if dry_run:
+            cmd.extend(["--check", "--diff"])
+
+        # Parallel runs would interleave on the terminal, so keep output in the log
+        env = self.ansible_env()
+        try:
+            with (
+                self.tracer.span("bootstrap", "playbook", host=host) as span,
+                self.tracer.ansible_events(env, self.callback_dir),
+            ):
+                result = run_streaming(
+                    cmd,
+                    lambda _stream, line: self.logger.output(
+                        f"bootstrap {host}", line, mirror=False
+                    ),
+                    cwd=self.project_root,
+                    env=env,
+                )
+                span["exit_code"] = result.returncode
+        except OSError as e:
+            self.logger.error(f"Bootstrap of {host} failed: {e}")
+            return False
 
-        except subprocess.CalledProcessError as e:
-            self.logger.error(f"Terraform {action} failed: {e}")
+        if result.returncode != 0:
+            self.logger.error(f"Bootstrap of {host} failed:")
+            for line in result.tail[-20:]:
+                self.logger.error(f"  {line}")
             return False
-        finally:
-            # Change back to project root
-            os.chdir(self.project_root)
+
+        self.logger.success(f"Bootstrap of {host} completed")
+        return True
 
     def run_ansible(
         self,
@@ -97,54 +391,346 @@ class DeploymentManager:
         """Run Ansible operations"""
         self.logger.info(f"Running Ansible for target: {target}")
 
+        phase = self._ansible_phase(target, domain_name)
+        if self._phase_done(phase):
+            return True
+
+        limit = None
+        done = self.journal.hosts_done(phase) if self.journal else []
+        if done:
+            self.logger.info(
+                f"Skipping hosts that already completed: {', '.join(done)}"
+            )
+            excluded = ":".join(f"!{host}" for host in done)
+            limit = f"{domain_name or 'all'}:localhost:{excluded}"
+
+        cmd = self._playbook_command(target, verbose, dry_run, domain_name, limit)
+        if cmd is None:
+            return False
+
         try:
-            os.chdir(self.project_root)
+            recap = self._run_playbook(cmd, f"ansible {target}")
+            self._checkpoint_hosts(phase, recap)
+            if self.journal:
+                self.journal.complete_phase(phase)
+
+            self.logger.success(f"Ansible {target} completed successfully")
+            return True
+
+        except subprocess.CalledProcessError as e:
+            # A failed run may have stopped before later plays reached hosts
+            # with a clean recap, so none of them count as done
+            self.logger.error(f"Ansible {target} failed: {e}")
+            return False
 
-            cmd = ["ansible-playbook"]
-            inventory = "inventories/dynamic.py"
+    def run_ansible_rolling(
+        self,
+        target: str,
+        verbose: bool = False,
+        dry_run: bool = False,
+        domain_name: str | None = None,
+        batch_size: str = "25%",
+        max_failures: str = "0",
+        health_gate: bool = True,
+    ) -> bool:
+        """Run Ansible over the target's hosts in rolling batches
+
+        Each batch is limited to at most ``batch_size`` hosts of every domain,
+        and the health-check playbook gates the next batch.
+        """
+        if target == "domain" and domain_name:
+            names = [domain_name]
+        else:
+            config = self.config_manager.load_domains_config()
+            names = list(config.get("domains", {})) + list(
+                config.get("shared_infrastructure", {})
+            )
+
+        phase = self._ansible_phase(target, domain_name)
+        done = self.journal.hosts_done(phase) if self.journal else []
+
+        groups = {}
+        for name in names:
+            hosts = self.config_manager.get_inventory_hosts(name)
+            remaining = [host for host in hosts if host not in done]
+            if remaining:
+                groups[name] = remaining
+            elif hosts and self.journal:
+                self.journal.complete_domain(phase, name)
+
+        if not groups and done:
+            self.logger.info(f"All hosts already completed {phase}, skipping")
+            return True
+        if not groups:
+            self.logger.error(f"No hosts found for target: {target}")
+            return False
 
-            if verbose:
-                cmd.append("-vvv")
+        self.logger.info(
+            f"Rolling Ansible {target} over {sum(map(len, groups.values()))} hosts "
+            f"(batch size {batch_size}, max failures {max_failures})"
+        )
 
-            if dry_run:
-                cmd.extend(["--check", "--diff"])
+        def deploy(batch: list[str]) -> list[str]:
+            # localhost keeps the inventory/bookkeeping plays of the playbook
+            cmd = self._playbook_command(
+                target, verbose, dry_run, domain_name, ",".join([*batch, "localhost"])
+            )
+            if cmd is None:
+                return batch
 
-            # Determine playbook and additional options
-            if target == "all":
-                cmd.extend(["playbooks/site.yml", "-i", inventory])
-            elif target == "domains":
-                cmd.extend(["playbooks/dynamic-deploy.yml", "-i", inventory])
-            elif target == "domain":
-                if not domain_name:
-                    self.logger.error("Domain name required for domain deployment")
-                    return False
-                cmd.extend(
-                    [
-                        "playbooks/domains/generic-domain.yml",
-                        "-i",
-                        inventory,
-                        "--limit",
-                        domain_name,
-                        "--extra-vars",
-                        f"target_domain={domain_name}",
-                    ]
-                )
-            elif target == "infrastructure":
-                cmd.extend(["playbooks/infrastructure/bootstrap.yml", "-i", inventory])
-            else:
-                self.logger.error(f"Unknown Ansible target: {target}")
+            try:
+                recap = self._run_playbook(cmd, f"ansible {target} batch")
+            except subprocess.CalledProcessError as e:
+                # Nothing is checkpointed: the run may have stopped before
+                # later plays reached hosts with a clean recap. Hosts that
+                # failed count against the budget; if the failure was
+                # elsewhere (e.g. on localhost), the whole batch did.
+                self.logger.error(f"Ansible {target} batch failed: {e}")
+                recap = e.output if isinstance(e.output, dict) else {}
+                failed = [
+                    host
+                    for host in batch
+                    if recap.get(host, {}).get("failures")
+                    or recap.get(host, {}).get("unreachable")
+                ]
+                return failed or batch
+
+            completed = self._checkpoint_hosts(phase, recap)
+            if self.journal:
+                finished = set(self.journal.hosts_done(phase))
+                for name, hosts in groups.items():
+                    if finished.issuperset(hosts):
+                        self.journal.complete_domain(phase, name)
+
+            return [host for host in batch if host not in completed]
+
+        def gate(batch: list[str]) -> bool:
+            cmd = [
+                "ansible-playbook",
+                "playbooks/validation/health-check.yml",
+                "-i",
+                "inventories/dynamic.py",
+                "--limit",
+                ",".join(batch),
+            ]
+            try:
+                self._run_playbook(cmd, "health gate", category="gate")
+                return True
+            except subprocess.CalledProcessError:
                 return False
 
-            # Run ansible-playbook
-            subprocess.run(cmd, check=True)
-
-            self.logger.success(f"Ansible {target} completed successfully")
+        scheduler = RollingScheduler(self.logger, batch_size, max_failures)
+        result = scheduler.run(groups, deploy, gate if health_gate else None)
+
+        if result["failed"]:
+            self.logger.error(
+                f"Ansible {target} failed on: {', '.join(result['failed'])}"
+            )
+        if result["success"]:
+            if self.journal:
+                self.journal.complete_phase(phase)
+            self.logger.success(
+                f"Ansible {target} rolled out to {len(result['completed'])} hosts"
+            )
+        return result["success"]
+
+    def _ansible_phase(self, target: str, domain_name: str | None = None) -> str:
+        """Journal phase name for an Ansible target"""
+        if target == "domain" and domain_name:
+            return f"ansible domain {domain_name}"
+        return f"ansible {target}"
+
+    def _phase_done(self, phase: str, inputs: str | None = None) -> bool:
+        """Check the run journal for a phase that can be skipped on resume"""
+        if self.journal and self.journal.phase_done(phase, inputs):
+            self.logger.info(f"Skipping {phase}: already completed in this run")
             return True
+        return False
+
+    def _checkpoint_hosts(self, phase: str, recap: dict[str, dict]) -> list[str]:
+        """Journal the hosts of a successful run's play recap
+
+        Only call this after the playbook succeeded: after a failure, a host
+        with a clean recap may never have reached the later plays.
+        """
+        completed = [
+            host
+            for host, stats in recap.items()
+            if host != "localhost"
+            and not stats["failures"]
+            and not stats["unreachable"]
+        ]
+        if self.journal and completed:
+            self.journal.complete_hosts(phase, completed)
+        return completed
+
+    def _terraform_fingerprint(self, environment: str) -> str:
+        """Hash everything a Terraform plan depends on
+
+        An unchanged fingerprint means the plan is unchanged, so a resumed run
+        can skip an apply that already succeeded.
+        """
+        terraform_dir = self.project_root / "terraform"
+        inputs = [
+            path
+            for path in terraform_dir.rglob("*")
+            if path.is_file()
+            and ".terraform" not in path.parts
+            and path.suffix in (".tf", ".tfvars", ".yml", ".hcl")
+        ]
+        inputs.append(self.project_root / "config" / "domains.yml")
+        return fingerprint(inputs, environment)
+
+    def _playbook_command(
+        self,
+        target: str,
+        verbose: bool = False,
+        dry_run: bool = False,
+        domain_name: str | None = None,
+        limit: str | None = None,
+    ) -> list[str] | None:
+        """Build the ansible-playbook command line for a deployment target"""
+        cmd = ["ansible-playbook"]
+        inventory = "inventories/dynamic.py"
+
+        if verbose:
+            cmd.append("-vvv")
+
+        if dry_run:
+            cmd.extend(["--check", "--diff"])
+
+        # Determine playbook and additional options
+        if target == "all":
+            cmd.extend(["playbooks/site.yml", "-i", inventory])
+        elif target == "domains":
+            cmd.extend(["playbooks/dynamic-deploy.yml", "-i", inventory])
+        elif target == "domain":
+            if not domain_name:
+                self.logger.error("Domain name required for domain deployment")
+                return None
+            cmd.extend(
+                [
+                    "playbooks/domains/generic-domain.yml",
+                    "-i",
+                    inventory,
+                    "--limit",
+                    limit or domain_name,
+                    "--extra-vars",
+                    f"target_domain={domain_name}",
+                ]
+            )
+            return cmd
+        elif target == "infrastructure":
+            cmd.extend(["playbooks/infrastructure/bootstrap.yml", "-i", inventory])
+        else:
+            self.logger.error(f"Unknown Ansible target: {target}")
+            return None
+
+        if limit:
+            cmd.extend(["--limit", limit])
+
+        return cmd
+
+    def _run_playbook(
+        self, cmd: list[str], span_name: str, category: str = "playbook"
+    ) -> dict[str, dict]:
+        """Run ansible-playbook with task tracing enabled
+
+        Returns:
+            dict: Play recap keyed by host
+
+        Raises:
+            subprocess.CalledProcessError: If the playbook fails; its
+                ``output`` attribute carries the play recap
+        """
+        env = self.ansible_env()
+        playbook = next(arg for arg in cmd if arg.endswith(".yml"))
+
+        with self.tracer.span(span_name, category, playbook=playbook):
+            with self.tracer.ansible_events(env, self.callback_dir) as run:
+                result = run_streaming(
+                    cmd,
+                    lambda _stream, line: self.logger.output("ansible", line),
+                    cwd=self.project_root,
+                    env=env,
+                )
+
+            if result.returncode != 0:
+                raise subprocess.CalledProcessError(
+                    result.returncode, cmd, output=run["hosts"]
+                )
+
+        return run["hosts"]
 
+    def warm_facts(
+        self, limit: str = "all", subset: str = "min,network", forks: int = 50
+    ) -> bool:
+        """Gather facts for the inventory into the persistent fact cache
+
+        Plays use ``gathering = smart``, so hosts with cached facts skip the
+        setup phase until the cache entry expires.
+        """
+        self.logger.info(
+            f"Warming fact cache for '{limit}' (subset: {subset}, forks: {forks})..."
+        )
+
+        cmd = [
+            "ansible",
+            limit,
+            "-i",
+            "inventories/dynamic.py",
+            "-m",
+            "ansible.builtin.setup",
+            "-a",
+            f"gather_subset={subset}",
+            "--forks",
+            str(forks),
+            "--one-line",
+        ]
+
+        # The facts themselves are only interesting in the cache, not on screen
+        try:
+            with self.tracer.span("facts warm", limit=limit, subset=subset):
+                self._stream(cmd, "facts", env=self.ansible_env(), mirror=False)
+        except FileNotFoundError:
+            self.logger.error("ansible not found in PATH")
+            return False
         except subprocess.CalledProcessError as e:
-            self.logger.error(f"Ansible {target} failed: {e}")
+            self.logger.error(f"Fact gathering failed: {e}")
+            for line in e.stderr.splitlines():
+                if "UNREACHABLE" in line or "FAILED" in line:
+                    self.logger.error(line[:200])
+            self.logger.info(f"Full output is in {self.logger.log_file}")
             return False
 
+        cached = len(list(self.fact_cache_dir.glob("ansible_facts*")))
+        self.logger.success(f"Fact cache warmed ({cached} hosts cached)")
+        return True
+
+    def clear_facts(self) -> int:
+        """Remove all cached host facts"""
+        removed = 0
+        for fact_file in self.fact_cache_dir.glob("ansible_facts*"):
+            fact_file.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    def ansible_env(self) -> dict[str, str]:
+        """Build the environment for Ansible runs
+
+        Points every run at the project fact cache, even when Ansible is not
+        picking up ``config/ansible/ansible.cfg``.
+        """
+        self.fact_cache_dir.mkdir(parents=True, exist_ok=True)
+
+        env = os.environ.copy()
+        env.setdefault("ANSIBLE_CACHE_PLUGIN", "jsonfile")
+        env.setdefault("ANSIBLE_CACHE_PLUGIN_CONNECTION", str(self.fact_cache_dir))
+        env.setdefault("ANSIBLE_CACHE_PLUGIN_PREFIX", "ansible_facts")
+        env.setdefault("ANSIBLE_CACHE_PLUGIN_TIMEOUT", str(self.FACT_CACHE_TIMEOUT))
+        env.setdefault("ANSIBLE_GATHERING", "smart")
+        return env
+
     def run_syntax_check(self) -> bool:
         """Run Ansible syntax check"""
         self.logger.info("Running syntax checks...")
@@ -153,7 +739,8 @@ class DeploymentManager:
             os.chdir(self.project_root)
 
             cmd = ["ansible-playbook", "playbooks/site.yml", "--syntax-check"]
-            subprocess.run(cmd, check=True)
+            with self.tracer.span("ansible syntax-check"):
+                self._stream(cmd, "ansible")
 
             self.logger.success("Syntax check passed")
             return True
@@ -162,6 +749,117 @@ class DeploymentManager:
             self.logger.error(f"Syntax check failed: {e}")
             return False
 
+    def finish_trace(self):
+        """Write the deploy trace next to the log file and show the slowest spans"""
+        if not self.tracer.spans:
+            return
+
+        trace_file = self.tracer.write(self.logger.log_file.with_suffix(".trace.json"))
+        self.logger.flush()
+        self.tracer.print_summary(self.console)
+        self.logger.info(f"Trace written to {trace_file}")
+
+    def record_history(self, command: str, environment: str, success: bool):
+        """Store this run's timings and warn about phases slower than usual"""
+        domains = {}
+        config = self.config_manager.load_domains_config()
+        for section in ("domains", "shared_infrastructure"):
+            for name in config.get(section, {}):
+                for host in self.config_manager.get_inventory_hosts(name):
+                    domains[host] = name
+
+        try:
+            self.history.record(
+                command,
+                environment,
+                self.tracer,
+                self.started,
+                time.time(),
+                success,
+                domains,
+            )
+            regressions = self.history.regressions(command, environment)
+        except sqlite3.Error as e:
+            self.logger.warn(f"Could not record deploy history: {e}")
+            return
+
+        for item in regressions:
+            if item["sigma"] is None:
+                above = f"{item['seconds'] - item['mean']:.1f}s above its constant"
+            else:
+                above = f"{item['sigma']:.1f}σ above its"
+            self.logger.warn(
+                f"'{item['name']}' took {item['seconds']:.1f}s, "
+                f"{above} {item['mean']:.1f}s baseline"
+            )
+
+    def show_history(
+        self,
+        command: str,
+        environment: str,
+        group: str = "phase",
+        runs: int = 30,
+        limit: int = 20,
+    ):
+        """Show duration percentiles from the deploy history"""
+        recent = self.history.runs(command, environment, limit=runs)
+        if not recent:
+            self.logger.info(f"No {command} runs recorded for {environment} yet")
+            return
+
+        failed = sum(1 for run in recent if run["status"] != "success")
+        totals = [run["duration"] for run in recent]
+        self.logger.info(
+            f"{len(recent)} {command} runs in {environment}: "
+            f"p50 {percentile(totals, 50):.1f}s, p90 {percentile(totals, 90):.1f}s, "
+            f"{failed} failed"
+        )
+
+        durations = self.history.durations(command, environment, group, runs)
+        flagged = {
+            item["name"]: item
+            for item in self.history.regressions(
+                command, environment, group, window=runs - 1
+            )
+        }
+
+        table = Table(title=f"{command} duration by {group} ({environment})")
+        table.add_column(group.title())
+        table.add_column("Runs", justify="right")
+        table.add_column("p50", justify="right")
+        table.add_column("p90", justify="right")
+        table.add_column("p99", justify="right")
+        table.add_column("Last", justify="right")
+        table.add_column("Regression")
+
+        rows = sorted(
+            durations.items(),
+            key=lambda item: percentile([s for _, s in item[1]], 50),
+            reverse=True,
+        )
+        for name, samples in rows[:limit]:
+            seconds = [s for _, s in samples]
+            regression = flagged.get(name)
+            if not regression:
+                label = ""
+            elif regression["sigma"] is None:
+                # Constant baseline, so σ is meaningless
+                label = f"[red]+{regression['seconds'] - regression['mean']:.1f}s[/red]"
+            else:
+                label = f"[red]+{regression['sigma']:.1f}σ[/red]"
+            table.add_row(
+                name,
+                str(len(seconds)),
+                f"{percentile(seconds, 50):.1f}s",
+                f"{percentile(seconds, 90):.1f}s",
+                f"{percentile(seconds, 99):.1f}s",
+                f"{seconds[-1]:.1f}s",
+                label,
+            )
+
+        self.logger.flush()
+        self.console.print(table)
+
     def run_lint(self) -> bool:
         """Run linting checks"""
         self.logger.info("Running linting checks...")
@@ -169,7 +867,8 @@ class DeploymentManager:
         lint_script = self.project_root / "scripts" / "lint.sh"
 
         try:
-            subprocess.run([str(lint_script), "--strict"], check=True)
+            with self.tracer.span("lint"):
+                self._stream([str(lint_script), "--strict"], "lint")
             self.logger.success("Linting completed successfully")
             return True
 
@@ -178,30 +877,19 @@ class DeploymentManager:
             return False
 
 
-# Click CLI interface
-@click.group()
-@click.option(
-    "--environment",
-    "-e",
-    default="development",
-    help="Target environment (development/staging/production)",
-)
-@click.option("--verbose", "-v", is_flag=True, help="Enable verbose output")
-@click.option("--dry-run", "-d", is_flag=True, help="Show what would be deployed")
-@click.pass_context
-def cli(ctx, environment, verbose, dry_run):
-    """All Things Linux Infrastructure Deployment
+def init_context(ctx: click.Context, environment: str, verbose: bool, dry_run: bool):
+    """Fill ctx.obj with the settings, logger and manager the commands use
 
-    Unified deployment interface for Terraform + Ansible with uv integration
+    Shared by this group and the quick ``plan``/``apply`` commands of the
+    top-level CLI, which invoke the commands below without running the group.
     """
-    # Setup context
     ctx.ensure_object(dict)
     ctx.obj["environment"] = environment
     ctx.obj["verbose"] = verbose
     ctx.obj["dry_run"] = dry_run
 
     # Initialize logger
-    project_root = Path(__file__).parent.parent
+    project_root = PROJECT_ROOT
     logger = InfraLogger("deploy", project_root / "logs")
     ctx.obj["logger"] = logger
     ctx.obj["project_root"] = project_root
@@ -213,7 +901,28 @@ def cli(ctx, environment, verbose, dry_run):
     )
 
     # Initialize deployment manager
-    ctx.obj["deployment_manager"] = DeploymentManager(project_root, logger)
+    deployment_manager = DeploymentManager(project_root, logger)
+    ctx.obj["deployment_manager"] = deployment_manager
+    ctx.call_on_close(deployment_manager.finish_trace)
+
+
+# Click CLI interface
+@click.group()
+@click.option(
+    "--environment",
+    "-e",
+    default="development",
+    help="Target environment (development/staging/production)",
+)
+@click.option("--verbose", "-v", is_flag=True, help="Enable verbose output")
+@click.option("--dry-run", "-d", is_flag=True, help="Show what would be deployed")
+@click.pass_context
+def cli(ctx, environment, verbose, dry_run):
+    """All Things Linux Infrastructure Deployment
+
+    Unified deployment interface for Terraform + Ansible with uv integration
+    """
+    init_context(ctx, environment, verbose, dry_run)
 
 
 @cli.command()
@@ -257,6 +966,8 @@ def plan(ctx, target, domain_name, ansible_only, terraform_only):
         ):
             success = False
 
+    deployment_manager.record_history("plan", ctx.obj["environment"], success)
+
     if success:
         logger.success("Planning completed successfully")
     else:
@@ -276,9 +987,61 @@ def plan(ctx, target, domain_name, ansible_only, terraform_only):
 @click.option("--auto-approve", "-y", is_flag=True, help="Auto-approve changes")
 @click.option("--ansible-only", is_flag=True, help="Run only Ansible configuration")
 @click.option("--terraform-only", is_flag=True, help="Run only Terraform provisioning")
+@click.option(
+    "--pipeline",
+    is_flag=True,
+    help="Bootstrap servers as soon as Terraform creates them",
+)
+@click.option(
+    "--bootstrap-workers",
+    type=int,
+    default=4,
+    show_default=True,
+    help="Concurrent bootstrap runs in pipeline mode",
+)
+@click.option(
+    "--batch-size",
+    help="Roll Ansible out in batches of N hosts or N% of each domain",
+)
+@click.option(
+    "--max-failures",
+    default="0",
+    show_default=True,
+    help="Failed hosts (N or N%) tolerated before a rollout stops",
+)
+@click.option(
+    "--health-gate/--no-health-gate",
+    default=True,
+    show_default=True,
+    help="Run the health-check playbook between rollout batches",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Continue the last failed apply, skipping completed phases and hosts",
+)
 @click.pass_context
-def apply(ctx, target, domain_name, auto_approve, ansible_only, terraform_only):
+def apply(
+    ctx,
+    target,
+    domain_name,
+    auto_approve,
+    ansible_only,
+    terraform_only,
+    pipeline,
+    bootstrap_workers,
+    batch_size,
+    max_failures,
+    health_gate,
+    resume,
+):
     """Apply infrastructure and configuration"""
+    if pipeline and ctx.obj["dry_run"]:
+        raise click.UsageError(
+            "--pipeline runs a real terraform apply and cannot be combined with "
+            "--dry-run; use 'plan' to preview changes"
+        )
+
     logger = ctx.obj["logger"]
     deployment_manager = ctx.obj["deployment_manager"]
 
@@ -295,26 +1058,70 @@ def apply(ctx, target, domain_name, auto_approve, ansible_only, terraform_only):
     logger.info(f"Applying deployment for {ctx.obj['environment']} environment")
     logger.info(f"Target: {target}")
 
+    # Dry runs change nothing, so there is nothing to checkpoint
+    journal = None
+    if not ctx.obj["dry_run"]:
+        journal = RunJournal(
+            ctx.obj["project_root"] / ".state", f"deploy-{ctx.obj['environment']}"
+        )
+        run_args = {
+            "target": target,
+            "domain_name": domain_name,
+            "ansible_only": ansible_only,
+            "terraform_only": terraform_only,
+        }
+        if journal.start(run_args, resume):
+            logger.info(f"Resuming previous apply from {journal.path}")
+        elif resume:
+            logger.warn("No unfinished apply with these arguments, starting fresh")
+        deployment_manager.journal = journal
+
     success = True
 
     # Run Terraform apply
-    if not ansible_only:
+    if not ansible_only and pipeline and not terraform_only:
+        if not deployment_manager.run_pipelined_apply(
+            ctx.obj["environment"],
+            auto_approve,
+            ctx.obj["verbose"],
+            ctx.obj["dry_run"],
+            workers=bootstrap_workers,
+        ):
+            success = False
+    elif not ansible_only:
         if not deployment_manager.run_terraform(
             "apply", ctx.obj["environment"], auto_approve
         ):
             success = False
 
     # Run Ansible
-    if not terraform_only and success:
+    if not terraform_only and success and batch_size:
+        if not deployment_manager.run_ansible_rolling(
+            target,
+            ctx.obj["verbose"],
+            ctx.obj["dry_run"],
+            domain_name=domain_name,
+            batch_size=batch_size,
+            max_failures=max_failures,
+            health_gate=health_gate,
+        ):
+            success = False
+    elif not terraform_only and success:
         if not deployment_manager.run_ansible(
             target, ctx.obj["verbose"], ctx.obj["dry_run"], domain_name=domain_name
         ):
             success = False
 
+    if journal:
+        journal.finish(success)
+        deployment_manager.record_history("apply", ctx.obj["environment"], success)
+
     if success:
         logger.success("Deployment completed successfully")
     else:
         logger.error("Deployment failed")
+        if journal:
+            logger.info("Re-run with --resume to continue from the failure point")
         sys.exit(1)
 
 
@@ -383,6 +1190,77 @@ def disable(ctx, domain_name):
         sys.exit(1)
 
 
+@cli.command()
+@click.option(
+    "--command",
+    "command_name",
+    type=click.Choice(["apply", "plan"]),
+    default="apply",
+    show_default=True,
+    help="Which runs to report on",
+)
+@click.option(
+    "--by",
+    "group",
+    type=click.Choice(list(GROUPS)),
+    default="phase",
+    show_default=True,
+    help="Group durations by phase, domain, host or task",
+)
+@click.option(
+    "--runs",
+    "-n",
+    type=click.IntRange(min=2),
+    default=30,
+    show_default=True,
+    help="Recent runs to use (at least 2)",
+)
+@click.option("--limit", type=int, default=20, show_default=True, help="Rows to show")
+@click.pass_context
+def history(ctx, command_name, group, runs, limit):
+    """Show deploy duration percentiles and regressions"""
+    ctx.obj["deployment_manager"].show_history(
+        command_name, ctx.obj["environment"], group, runs, limit
+    )
+
+
+@cli.group()
+def facts():
+    """Manage the persistent Ansible fact cache"""
+    pass
+
+
+@facts.command()
+@click.option("--limit", "-l", default="all", help="Host pattern to gather facts for")
+@click.option(
+    "--subset",
+    default="min,network",
+    show_default=True,
+    help="gather_subset passed to the setup module",
+)
+@click.option(
+    "--forks", "-f", type=int, default=50, show_default=True, help="Parallel hosts"
+)
+@click.pass_context
+def warm(ctx, limit, subset, forks):
+    """Gather facts concurrently so later runs skip the setup phase"""
+    deployment_manager = ctx.obj["deployment_manager"]
+
+    if not deployment_manager.warm_facts(limit, subset, forks):
+        sys.exit(1)
+
+
+@facts.command()
+@click.pass_context
+def clear(ctx):
+    """Remove all cached facts"""
+    logger = ctx.obj["logger"]
+    deployment_manager = ctx.obj["deployment_manager"]
+
+    removed = deployment_manager.clear_facts()
+    logger.success(f"Removed cached facts for {removed} hosts")
+
+
 @cli.command()
 @click.pass_context
 def check(ctx):
@@ -1,67 +1,328 @@
 #!/usr/bin/env python3
 """
-Generates infrastructure diagrams using the built-in `terraform graph` command.
+Generates infrastructure diagrams using the built-in `terraform graph` command,
+or a topology diagram straight from config/domains.yml.
 """
 
+import hashlib
+import json
+import os
 import subprocess
+import sys
 from pathlib import Path
 
 import click
+import yaml
 
+from ..common.config import ConfigManager
+from ..common.journal import fingerprint
 from ..common.logging import InfraLogger
 
 
-@click.command()
-@click.option(
-    "--output-file",
-    default="docs/assets/infrastructure.svg",
-    help="Path to save the output SVG file.",
-)
-def cli(output_file: str):
-    """Generates an infrastructure diagram using Terraform."""
-    logger = InfraLogger("diagrams")
-    logger.banner("Infrastructure Diagram Generator")
+class DiagramGenerator:
+    """Render infrastructure diagrams with Graphviz, caching each stage
+
+    Diagrams come from one of two sources:
+
+    - ``terraform``: the DOT text from ``terraform graph``, cached by a hash
+      of the ``.tf`` files (and lock file), so unchanged configuration never
+      needs ``terraform init``.
+    - ``domains``: a topology built in-process from ``config/domains.yml``,
+      with no Terraform or network access needed.
+
+    Rendering is skipped when the DOT text is identical to what produced the
+    existing output file.
+    """
+
+    SOURCES = ("terraform", "domains")
+    FORMATS = ("svg", "png", "pdf", "dot")
+
+    def __init__(self, project_root: Path, logger: InfraLogger):
+        self.logger = logger
+        self.config = ConfigManager(project_root, logger)
+        self.terraform_dir = project_root / "terraform"
+        self.cache_dir = project_root / ".cache" / "diagrams"
+
+    def generate(
+        self, output_path: Path, fmt: str = "svg", source: str = "terraform"
+    ) -> bool:
+        """Generate a diagram from a source at output_path"""
+        if source == "terraform" and not self.terraform_dir.exists():
+            self.logger.error("Terraform directory not found.")
+            return False
+
+        try:
+            dot = self.terraform_dot() if source == "terraform" else self.domains_dot()
+            return self.render(dot, output_path, fmt)
+
+        except FileNotFoundError:
+            self.logger.error(
+                "Terraform or Graphviz (dot) not found. Please ensure they are installed and in your PATH."
+            )
+        except (OSError, yaml.YAMLError) as e:
+            self.logger.error(f"Failed to read domains config: {e}")
+        except subprocess.CalledProcessError as e:
+            self.logger.error(f"An error occurred: {e}")
+            if e.stderr:
+                self.logger.error(e.stderr)
+            if e.stdout:
+                self.logger.info(e.stdout)
+        return False
 
-    output_path = Path(output_file)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    def terraform_dot(self) -> str:
+        """Get the `terraform graph` DOT text, from cache if inputs are unchanged"""
+        inputs = [
+            path
+            for path in self.terraform_dir.rglob("*.tf")
+            if ".terraform" not in path.parts
+        ] + [self.terraform_dir / ".terraform.lock.hcl"]
+        key = fingerprint(inputs)
 
-    terraform_dir = Path("terraform")
-    if not terraform_dir.exists():
-        logger.error("Terraform directory not found.")
-        return
+        cache_file = self.cache_dir / "terraform.json"
+        cached = self._load(cache_file)
+        if cached.get("key") == key:
+            self.logger.info("Terraform configuration unchanged, using cached graph")
+            return cached["dot"]
 
-    try:
-        logger.info("Initializing Terraform...")
+        self.logger.info("Initializing Terraform...")
         subprocess.run(
-            ["terraform", "init"], check=True, cwd=terraform_dir, capture_output=True
+            ["terraform", "init"],
+            check=True,
+            cwd=self.terraform_dir,
+            capture_output=True,
+            text=True,
         )
 
-        logger.info("Generating Terraform graph...")
-        graph_dot = subprocess.check_output(
-            ["terraform", "graph"], text=True, cwd=terraform_dir
+        self.logger.info("Generating Terraform graph...")
+        dot = subprocess.check_output(
+            ["terraform", "graph"], text=True, cwd=self.terraform_dir
         )
 
-        logger.info(f"Rendering SVG diagram to {output_path}...")
-        subprocess.run(
-            ["dot", "-Tsvg"],
-            input=graph_dot,
-            text=True,
-            check=True,
-            stdout=open(output_path, "w"),
+        self._save(cache_file, {"key": key, "dot": dot})
+        return dot
+
+    def domains_dot(self) -> str:
+        """Build a topology DOT graph from domains.yml, from cache if unchanged
+
+        Domains and shared components are grouped by their ``group``, each
+        showing its hosts, subnet and services. Edges show public traffic,
+        metrics scraping (from the component running Prometheus) and backups.
+        """
+        key = fingerprint([self.config.domains_file], "topology")
+        cache_file = self.cache_dir / "domains.json"
+        cached = self._load(cache_file)
+        if cached.get("key") == key:
+            return cached["dot"]
+
+        config = self.config.load_domains_config()
+        settings = config.get("global", {})
+        components = [
+            (name, item, False) for name, item in config.get("domains", {}).items()
+        ] + [
+            (name, item, True)
+            for name, item in config.get("shared_infrastructure", {}).items()
+        ]
+
+        lines = [
+            "digraph topology {",
+            f"  graph [rankdir=LR, fontname=Helvetica, labelloc=t, "
+            f"label={_quote(settings.get('project_name', 'infrastructure'))}];",
+            '  node [shape=box, style="rounded,filled", fillcolor=white, '
+            "fontname=Helvetica, fontsize=10];",
+            "  edge [fontname=Helvetica, fontsize=9];",
+            '  internet [label="Internet", shape=ellipse, fillcolor="#e8f0fe"];',
+        ]
+
+        groups: dict[str, list[tuple[str, dict, bool]]] = {}
+        for name, item, shared in components:
+            if item.get("enabled", False) and not item.get("external"):
+                groups.setdefault(item.get("group", "ungrouped"), []).append(
+                    (name, item, shared)
+                )
+            else:
+                # Disabled and external components, outside the clusters
+                label = item.get("domain", name)
+                if item.get("provider"):
+                    label += f"\n({item['provider']})"
+                lines.append(
+                    f"  {_quote(name)} [label={_quote(label)}, "
+                    'style="rounded,dashed", fontcolor=gray50, color=gray50];'
+                )
+
+        hosts_of: dict[str, list[str]] = {}
+        for group, members in sorted(groups.items()):
+            lines.append(f"  subgraph {_quote(f'cluster_{group}')} {{")
+            lines.append(f'    label={_quote(group)}; style="rounded"; color=gray60;')
+            for name, item, shared in members:
+                hosts_of[name] = self._component_dot(name, item, shared, lines)
+            lines.append("  }")
+
+        monitor = next(
+            (
+                name
+                for name, item, _ in components
+                if name in hosts_of and "prometheus" in item.get("services", [])
+            ),
+            None,
         )
+        backup = "backup" if "backup" in hosts_of else None
+
+        for name, item, shared in components:
+            if name not in hosts_of:
+                continue
+            first_host = _quote(f"{name}/host/{hosts_of[name][0]}")
+            if not shared and item.get("domain"):
+                lines.append(
+                    f"  internet -> {first_host} [label={_quote(item['domain'])}];"
+                )
+            if (
+                monitor
+                and name != monitor
+                and item.get("monitoring", {}).get("enabled")
+            ):
+                lines.append(
+                    f"  {_quote(f'{monitor}/host/{hosts_of[monitor][0]}')} -> "
+                    f'{first_host} [style=dotted, color=gray40, label="metrics"];'
+                )
+            if backup and name != backup and settings.get("backup_enabled"):
+                lines.append(
+                    f"  {_quote(f'backup/host/{hosts_of[backup][0]}')} -> "
+                    f'{first_host} [style=dashed, color=gray40, label="backup"];'
+                )
 
-        logger.success(f"Diagram saved successfully to {output_path}")
+        lines.append("}")
+        dot = "\n".join(lines) + "\n"
 
-    except FileNotFoundError:
-        logger.error(
-            "Terraform or Graphviz (dot) not found. Please ensure they are installed and in your PATH."
+        self._save(cache_file, {"key": key, "dot": dot})
+        return dot
+
+    def _component_dot(
+        self, name: str, item: dict, shared: bool, lines: list[str]
+    ) -> list[str]:
+        """Append a cluster for a domain or shared component
+
+        Returns:
+            list: Its inventory hostnames
+        """
+        label = item.get("domain", name) if not shared else name.replace("_", " ")
+        subnet = item.get("network", {}).get("subnet")
+        if subnet:
+            label += f"\n{subnet}"
+
+        lines.append(f"    subgraph {_quote(f'cluster_{name}')} {{")
+        lines.append(
+            f"      label={_quote(label)}; style=filled; "
+            f"fillcolor={_quote('#fff7e6' if shared else '#f5f5f5')};"
         )
-    except subprocess.CalledProcessError as e:
-        logger.error(f"An error occurred: {e}")
-        if e.stderr:
-            logger.error(e.stderr)
-        if e.stdout:
-            logger.info(e.stdout)
+
+        hosts = self.config.get_inventory_hosts(name) or [name.replace("_", "-")]
+        if "servers" in item:
+            specs = [
+                f"{server.get('type', '?')} @ {server.get('location', '?')}"
+                for server in item["servers"]
+            ]
+        else:
+            server = item.get("server", {})
+            specs = [f"{server.get('type', '?')} @ {server.get('location', '?')}"]
+        for index, host in enumerate(hosts):
+            label = host + "\n" + specs[min(index, len(specs) - 1)]
+            lines.append(
+                f"      {_quote(f'{name}/host/{host}')} "
+                f'[label={_quote(label)}, shape=box3d, fillcolor="#dbe9f6"];'
+            )
+
+        for service in item.get("services", []):
+            lines.append(
+                f"      {_quote(f'{name}/service/{service}')} "
+                f"[label={_quote(service)}, shape=component];"
+            )
+            lines.append(
+                f"      {_quote(f'{name}/host/{hosts[0]}')} -> "
+                f"{_quote(f'{name}/service/{service}')} [arrowhead=none];"
+            )
+
+        lines.append("    }")
+        return hosts
+
+    def render(self, dot: str, output_path: Path, fmt: str = "svg") -> bool:
+        """Render DOT text with Graphviz unless the output is already current"""
+        digest = hashlib.sha256(f"{fmt}\0{dot}".encode()).hexdigest()
+        renders_file = self.cache_dir / "renders.json"
+        renders = self._load(renders_file)
+        if output_path.exists() and renders.get(str(output_path)) == digest:
+            self.logger.info(f"Diagram unchanged: {output_path}")
+            return True
+
+        self.logger.info(f"Rendering {fmt.upper()} diagram to {output_path}...")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if fmt == "dot":
+            output_path.write_text(dot)
+        else:
+            subprocess.run(
+                ["dot", f"-T{fmt}", "-o", str(output_path)],
+                input=dot,
+                text=True,
+                check=True,
+                capture_output=True,
+            )
+
+        renders[str(output_path)] = digest
+        self._save(renders_file, renders)
+        self.logger.success(f"Diagram saved successfully to {output_path}")
+        return True
+
+    @staticmethod
+    def _load(path: Path) -> dict:
+        try:
+            return json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save(self, path: Path, data: dict):
+        """Write a cache file atomically"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data))
+        os.replace(tmp_path, path)
+
+
+def _quote(value: str) -> str:
+    """Quote a DOT identifier or label (newlines become DOT line breaks)"""
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return '"' + escaped.replace("\n", "\\n") + '"'
+
+
+@click.command()
+@click.option(
+    "--source",
+    type=click.Choice(DiagramGenerator.SOURCES),
+    default="terraform",
+    help="Diagram the Terraform graph, or the topology in config/domains.yml (offline).",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(DiagramGenerator.FORMATS),
+    default="svg",
+    help="Output format ('dot' writes the graph without Graphviz).",
+)
+@click.option(
+    "--output-file",
+    help="Path to save the diagram (default: docs/assets/infrastructure.<format> "
+    "or docs/assets/topology.<format>).",
+)
+def cli(source: str, fmt: str, output_file: str | None):
+    """Generates an infrastructure diagram using Terraform or domains.yml."""
+    logger = InfraLogger("diagrams")
+    logger.banner("Infrastructure Diagram Generator")
+
+    if output_file is None:
+        name = "infrastructure" if source == "terraform" else "topology"
+        output_file = f"docs/assets/{name}.{fmt}"
+
+    generator = DiagramGenerator(Path.cwd(), logger)
+    if not generator.generate(Path(output_file), fmt, source):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -6,28 +6,54 @@ This module provides automated documentation generation for infrastructure,
 including Terraform modules, Ansible playbooks, and live infrastructure diagrams.
 """
 
+import hashlib
+import json
 import os
 import shutil
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from fnmatch import fnmatch
 from pathlib import Path
 
 import click
 import yaml
 
 from ..common.config import ConfigManager
+from ..common.journal import fingerprint
 from ..common.logging import InfraLogger
+from ..common.playbooks import PlaybookIndex
+from ..common.watch import FileWatcher
+from .diagrams import DiagramGenerator
 
 
 class DocumentationManager:
     """Manages infrastructure documentation generation and automation."""
 
+    # Directories watched by `atl docs serve`
+    WATCH_DIRS = ("ansible", "terraform", "config")
+
+    # Generated page for each source pattern (first match wins)
+    PAGE_SOURCES = (
+        ("ansible/roles/*", "roles"),
+        ("ansible/inventories/*", "inventory"),
+        ("ansible/group_vars/*", "inventory"),
+        ("ansible/host_vars/*", "inventory"),
+        ("ansible/*.yml", "playbooks"),
+        ("ansible/*.yaml", "playbooks"),
+        ("terraform/*.tf", "terraform"),
+        ("config/domains.yml", "topology"),
+    )
+
     def __init__(self, logger: InfraLogger):
         """Initialize the documentation manager."""
         self.logger = logger
         self.config = ConfigManager(Path.cwd(), logger)
         self.docs_dir = Path("docs")
+        self.ansible_dir = Path("ansible")
         self.scripts_dir = Path("scripts")
+        self.cache_dir = Path(".cache") / "docs"
 
     def check_dependencies(self) -> bool:
         """Check if required tools are installed."""
@@ -108,8 +134,14 @@ class DocumentationManager:
                 self.logger.error(e.stderr.decode())
             return False
 
-    def generate_terraform_docs(self) -> bool:
-        """Generate Terraform module documentation."""
+    def generate_terraform_docs(self, jobs: int | None = None) -> bool:
+        """Generate Terraform module documentation.
+
+        Modules are documented concurrently. A module is skipped when its
+        ``.tf`` files, its README and the terraform-docs version all match the
+        manifest from the last run. Every failure is reported, not just the
+        first one.
+        """
         self.logger.info("Generating Terraform documentation...")
 
         terraform_dir = Path("terraform")
@@ -117,45 +149,138 @@ class DocumentationManager:
             self.logger.warn("No terraform directory found")
             return True
 
-        modules_processed = 0
+        modules = []
         for root, dirs, files in os.walk(terraform_dir):
             # Exclude the .terraform directory from the walk
             if ".terraform" in dirs:
                 dirs.remove(".terraform")
-
-            root_path = Path(root)
             if any(f.endswith(".tf") for f in files):
-                self.logger.info(f"Processing Terraform module: {root_path}")
-                try:
-                    subprocess.run(
-                        [
-                            "terraform-docs",
-                            "markdown",
-                            "table",
-                            "--output-file",
-                            "README.md",
-                            "--output-mode",
-                            "inject",
-                            str(root_path),
-                        ],
-                        check=True,
-                        capture_output=True,
-                    )
-                    modules_processed += 1
-                except subprocess.CalledProcessError as e:
-                    self.logger.error(f"Failed to generate docs for {root_path}: {e}")
-                    return False
+                modules.append(Path(root))
 
-        if modules_processed > 0:
-            self._generate_terraform_index(terraform_dir)
-            self.logger.success(
-                f"Generated Terraform documentation for {modules_processed} modules"
-            )
-        else:
+        if not modules:
             self.logger.warn("No Terraform modules found to document")
+            return True
+
+        version = self._terraform_docs_version()
+        manifest_file = self.cache_dir / "terraform-docs.json"
+        manifest = self._load_manifest(manifest_file)
+
+        pending = {}
+        for module in sorted(modules):
+            inputs = self._module_inputs_hash(module, version)
+            entry = manifest.get(str(module), {})
+            readme = self._file_hash(module / "README.md")
+            if entry.get("inputs") != inputs or entry.get("readme") != readme:
+                pending[module] = inputs
+
+        if not pending:
+            self.logger.info(f"All {len(modules)} Terraform modules are up to date")
+        else:
+            self.logger.info(
+                f"Documenting {len(pending)} of {len(modules)} Terraform modules..."
+            )
+
+        failures = []
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = {
+                executor.submit(self._run_terraform_docs, module): module
+                for module in pending
+            }
+            for future in as_completed(futures):
+                module = futures[future]
+                error = future.result()
+                if error:
+                    failures.append((module, error))
+                    manifest.pop(str(module), None)
+                else:
+                    self.logger.debug(f"Documented Terraform module: {module}")
+                    manifest[str(module)] = {
+                        "inputs": pending[module],
+                        "readme": self._file_hash(module / "README.md"),
+                    }
+
+        self._save_manifest(manifest_file, manifest)
+        self._generate_terraform_index(terraform_dir)
+
+        if failures:
+            for module, error in sorted(failures):
+                self.logger.error(f"Failed to generate docs for {module}: {error}")
+            self.logger.error(
+                f"terraform-docs failed for {len(failures)} of {len(pending)} modules"
+            )
+            return False
 
+        if pending:
+            self.logger.success(
+                f"Generated Terraform documentation for {len(pending)} modules"
+            )
         return True
 
+    def _run_terraform_docs(self, module: Path) -> str | None:
+        """Inject terraform-docs output into a module README (worker thread)
+
+        Returns:
+            str: The error, or None on success
+        """
+        try:
+            result = subprocess.run(
+                [
+                    "terraform-docs",
+                    "markdown",
+                    "table",
+                    "--output-file",
+                    "README.md",
+                    "--output-mode",
+                    "inject",
+                    str(module),
+                ],
+                capture_output=True,
+                text=True,
+            )
+        except FileNotFoundError as e:
+            return str(e)
+        if result.returncode != 0:
+            return result.stderr.strip() or f"exit code {result.returncode}"
+        return None
+
+    def _terraform_docs_version(self) -> str:
+        """Get the terraform-docs version, so upgrades regenerate every README"""
+        try:
+            result = subprocess.run(
+                ["terraform-docs", "--version"], capture_output=True, text=True
+            )
+        except FileNotFoundError:
+            return ""
+        return result.stdout.strip()
+
+    @staticmethod
+    def _module_inputs_hash(module: Path, version: str) -> str:
+        """Hash a module's .tf files and terraform-docs config"""
+        inputs = list(module.glob("*.tf")) + [module / ".terraform-docs.yml"]
+        return fingerprint(inputs, version)
+
+    @staticmethod
+    def _file_hash(path: Path) -> str | None:
+        try:
+            return hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _load_manifest(path: Path) -> dict:
+        try:
+            return json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def _save_manifest(path: Path, manifest: dict):
+        """Write a manifest atomically"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+        os.replace(tmp_path, path)
+
     def _generate_terraform_index(self, terraform_dir: Path):
         """Generate a Terraform module index page for MkDocs."""
         self.logger.info("Generating Terraform module index...")
@@ -234,15 +359,11 @@ class DocumentationManager:
     def generate_infrastructure_diagrams(self) -> bool:
         """Generate infrastructure visualization diagrams."""
         self.logger.info("Generating infrastructure diagrams...")
-        try:
-            subprocess.run(["atl", "docs", "diagrams"], check=True)
-            self.logger.success("Infrastructure diagrams generated successfully.")
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError) as e:
-            self.logger.error(f"Failed to generate infrastructure diagrams: {e}")
-            if isinstance(e, subprocess.CalledProcessError):
-                self.logger.error(e.stderr.decode())
+        generator = DiagramGenerator(Path.cwd(), self.logger)
+        if not generator.generate(self.docs_dir / "assets" / "infrastructure.svg"):
+            self.logger.error("Failed to generate infrastructure diagrams")
             return False
+        return True
 
     def generate_ansible_docs(self) -> bool:
         """Generate Ansible playbook and role documentation."""
@@ -251,13 +372,12 @@ class DocumentationManager:
         automation_dir = self.docs_dir / "automation"
         automation_dir.mkdir(parents=True, exist_ok=True)
 
-        # Document playbooks
-        playbooks_dir = Path("playbooks")
-        if playbooks_dir.exists():
-            self._document_playbooks(playbooks_dir, automation_dir)
+        # Document playbooks (recursively, following includes)
+        if (self.ansible_dir / "playbooks").exists():
+            self._document_playbooks(self.ansible_dir, automation_dir)
 
         # Document roles
-        roles_dir = Path("roles")
+        roles_dir = self.ansible_dir / "roles"
         if roles_dir.exists():
             self._document_roles(roles_dir, automation_dir)
 
@@ -266,49 +386,52 @@ class DocumentationManager:
 
         return True
 
-    def _document_playbooks(self, playbooks_dir: Path, output_dir: Path):
+    def _document_playbooks(self, ansible_dir: Path, output_dir: Path):
         """Document Ansible playbooks."""
-        playbook_docs = []
+        index = PlaybookIndex(ansible_dir, self.cache_dir / "playbooks.json")
+        entries = index.build()
 
-        for playbook_file in playbooks_dir.glob("*.yml"):
-            try:
-                with open(playbook_file) as f:
-                    content = list(yaml.safe_load_all(f))
-
-                for play in content:
-                    if isinstance(play, list):
-                        for item in play:
-                            if isinstance(item, dict) and "name" in item:
-                                doc = {
-                                    "name": item["name"],
-                                    "file": str(playbook_file),
-                                    "hosts": item.get("hosts", "undefined"),
-                                    "tasks": [],
-                                }
-
-                                if "tasks" in item:
-                                    for task in item["tasks"]:
-                                        if isinstance(task, dict) and "name" in task:
-                                            doc["tasks"].append(task["name"])
-
-                                playbook_docs.append(doc)
-                    elif isinstance(play, dict) and "name" in play:
-                        doc = {
-                            "name": play["name"],
-                            "file": str(playbook_file),
-                            "hosts": play.get("hosts", "undefined"),
-                            "tasks": [],
-                        }
-
-                        if "tasks" in play:
-                            for task in play["tasks"]:
-                                if isinstance(task, dict) and "name" in task:
-                                    doc["tasks"].append(task["name"])
-
-                        playbook_docs.append(doc)
-
-            except Exception as e:
-                self.logger.warn(f"Failed to parse playbook {playbook_file}: {e}")
+        for path, entry in sorted(entries.items()):
+            if entry["error"]:
+                self.logger.warn(f"Failed to parse playbook {path}: {entry['error']}")
+        for path, reference in index.missing:
+            self.logger.warn(f"{path}: included file not found: {reference}")
+
+        playbook_docs = []
+        for playbook_file in index.playbooks():
+            entry = entries[playbook_file]
+            imports = [
+                str(entry["resolved"].get(reference, reference))
+                for keyword, reference, _name in entry["includes"]
+                if keyword == "import_playbook"
+            ]
+            for play in entry["plays"]:
+                if not play["name"]:
+                    continue
+                playbook_docs.append(
+                    {
+                        "name": play["name"],
+                        "file": str(playbook_file),
+                        "hosts": play["hosts"],
+                        "tasks": index.expand_tasks(playbook_file, play),
+                        "imports": [],
+                    }
+                )
+            if imports:
+                playbook_docs.append(
+                    {
+                        "name": f"{playbook_file.name} imports",
+                        "file": str(playbook_file),
+                        "hosts": "-",
+                        "tasks": [],
+                        "imports": imports,
+                    }
+                )
+
+        self.logger.info(
+            f"Indexed {len(entries)} playbook and task files, "
+            f"{len(playbook_docs)} plays"
+        )
 
         # Generate markdown documentation
         with open(output_dir / "playbooks.md", "w") as f:
@@ -328,6 +451,12 @@ class DocumentationManager:
                         f.write(f"- {task}\n")
                     f.write("\n")
 
+                if doc["imports"]:
+                    f.write("### Imported Playbooks\n\n")
+                    for playbook in doc["imports"]:
+                        f.write(f"- `{playbook}`\n")
+                    f.write("\n")
+
     def _document_roles(self, roles_dir: Path, output_dir: Path):
         """Document Ansible roles."""
         roles_docs = []
@@ -405,7 +534,7 @@ class DocumentationManager:
             )
 
             # List inventory files
-            inventories_dir = Path("inventories")
+            inventories_dir = self.ansible_dir / "inventories"
             if inventories_dir.exists():
                 f.write("## Inventory Files\n\n")
                 for inv_file in inventories_dir.glob("*"):
@@ -414,7 +543,7 @@ class DocumentationManager:
                 f.write("\n")
 
             # List group variables
-            group_vars_dir = Path("group_vars")
+            group_vars_dir = self.ansible_dir / "group_vars"
             if group_vars_dir.exists():
                 f.write("## Group Variables\n\n")
                 for var_file in group_vars_dir.glob("*.yml"):
@@ -422,12 +551,96 @@ class DocumentationManager:
                 f.write("\n")
 
             # List host variables
-            host_vars_dir = Path("host_vars")
+            host_vars_dir = self.ansible_dir / "host_vars"
             if host_vars_dir.exists():
                 f.write("## Host Variables\n\n")
                 for var_file in host_vars_dir.glob("*.yml"):
                     f.write(f"- `{var_file}`\n")
 
+    def serve(self, dev_addr: str = "127.0.0.1:8000") -> bool:
+        """Serve the docs, regenerating affected pages as sources change
+
+        Generates everything once, starts ``mkdocs serve`` in the background
+        and then watches ``ansible/``, ``terraform/`` and ``config/``. Each
+        batch of changes regenerates only the pages built from those files,
+        and mkdocs live-reloads them.
+        """
+        if not self.build_docs():
+            self.logger.warn("Initial documentation build had failures")
+
+        self.logger.info(f"Starting MkDocs development server on {dev_addr}...")
+        try:
+            server = subprocess.Popen(["mkdocs", "serve", "--dev-addr", dev_addr])
+        except FileNotFoundError:
+            self.logger.error("mkdocs not found")
+            return False
+
+        roots = [Path.cwd() / directory for directory in self.WATCH_DIRS]
+        try:
+            with FileWatcher(roots) as watcher:
+                self.logger.info(
+                    f"Watching {', '.join(self.WATCH_DIRS)} ({watcher.backend})"
+                )
+                for changed in watcher.batches():
+                    if server.poll() is not None:
+                        self.logger.error(
+                            f"MkDocs server exited with code {server.returncode}"
+                        )
+                        return False
+
+                    if changed is None:
+                        pages = {page for _, page in self.PAGE_SOURCES}
+                    else:
+                        pages = self._affected_pages(changed)
+                    for page in sorted(pages):
+                        started = time.perf_counter()
+                        self._regenerate(page)
+                        self.logger.info(
+                            f"Regenerated {page} in "
+                            f"{time.perf_counter() - started:.2f}s"
+                        )
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+        return True
+
+    def _affected_pages(self, paths: set[Path]) -> set[str]:
+        """Map changed source files to the generated pages built from them"""
+        pages = set()
+        for path in paths:
+            try:
+                relative = path.relative_to(Path.cwd()).as_posix()
+            except ValueError:
+                continue
+            for pattern, page in self.PAGE_SOURCES:
+                if fnmatch(relative, pattern):
+                    pages.add(page)
+                    break
+        return pages
+
+    def _regenerate(self, page: str):
+        """Regenerate one generated page"""
+        automation_dir = self.docs_dir / "automation"
+        automation_dir.mkdir(parents=True, exist_ok=True)
+
+        if page == "playbooks":
+            self._document_playbooks(self.ansible_dir, automation_dir)
+        elif page == "roles":
+            self._document_roles(self.ansible_dir / "roles", automation_dir)
+        elif page == "inventory":
+            self._document_inventory(automation_dir)
+        elif page == "terraform":
+            # Incremental: only modules whose inputs changed are re-documented
+            self.generate_terraform_docs()
+        elif page == "topology":
+            DiagramGenerator(Path.cwd(), self.logger).generate(
+                self.docs_dir / "assets" / "topology.svg", source="domains"
+            )
+
     def setup_mkdocs(self) -> bool:
         """Set up MkDocs configuration and structure."""
         self.logger.info("Setting up MkDocs configuration...")
@@ -534,5 +747,27 @@ def cli(serve: bool, install_tools: bool, check_deps: bool, verbose: bool):
         sys.exit(1)
 
 
+@click.command()
+@click.option(
+    "--dev-addr",
+    default="127.0.0.1:8000",
+    help="Address for the MkDocs development server",
+)
+def serve_cli(dev_addr: str):
+    """Serve documentation locally, regenerating pages as sources change.
+
+    Watches ansible/, terraform/ and config/ and regenerates only the
+    affected generated page; MkDocs live-reloads it in the browser.
+    """
+    logger = InfraLogger("docs")
+    logger.banner("All Things Linux Infrastructure Documentation")
+
+    try:
+        if not DocumentationManager(logger).serve(dev_addr):
+            sys.exit(1)
+    except KeyboardInterrupt:
+        logger.info("Documentation server stopped")
+
+
 if __name__ == "__main__":
     cli()
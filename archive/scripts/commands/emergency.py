@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+All Things Linux Infrastructure Emergency Actions
+Low-latency entry point for the emergency restart and isolation playbooks
+"""
+
+import json
+import subprocess
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import click
+import yaml
+
+from ..common.logging import InfraLogger
+from ..common.process import run_streaming
+from .deploy import DeploymentManager
+
+# Same options as ansible.cfg, but keep masters alive long enough to be reused
+SSH_ARGS = (
+    "-o ControlMaster=auto -o ControlPersist=30m "
+    "-o UserKnownHostsFile=/dev/null -o StrictHostKeyChecking=no "
+    "-o ServerAliveInterval=60 -o ServerAliveCountMax=3"
+)
+
+# Time-to-first-action budget on a warm controller (index built, facts cached)
+FIRST_ACTION_TARGET = 2.0
+
+# Cached facts this close to expiring are gathered again instead
+FACT_EXPIRY_MARGIN = 300
+
+
+class EmergencyManager:
+    """Run emergency playbooks without inventory generation or fact gathering
+
+    Target hosts come from a precomputed service index, which also backs a
+    static inventory, so the dynamic inventory script (and its Terraform and
+    Vagrant lookups) never runs on the emergency path. Facts come from the
+    persistent fact cache and SSH reuses ControlPersist master connections.
+    """
+
+    def __init__(self, project_root: Path, logger: InfraLogger):
+        self.project_root = project_root
+        self.logger = logger
+        self.deployment = DeploymentManager(project_root, logger)
+        self.config_manager = self.deployment.config_manager
+        self.tracer = self.deployment.tracer
+
+        state_dir = project_root / ".state"
+        self.index_file = state_dir / "service-index.json"
+        self.inventory_file = state_dir / "emergency-inventory.yml"
+        self.playbooks_dir = project_root / "ansible" / "playbooks" / "emergency"
+        self.control_path_dir = project_root / ".ansible" / "cp"
+
+    def build_index(self) -> dict:
+        """Build the service -> host index and its static inventory"""
+        self.logger.info("Building emergency service index...")
+
+        config = self.config_manager.load_domains_config()
+        addresses = self._terraform_addresses()
+
+        services: dict[str, list[str]] = {}
+        hosts: dict[str, dict] = {}
+        for section in ("domains", "shared_infrastructure"):
+            for name, item in config.get(section, {}).items():
+                inventory_hosts = self.config_manager.get_inventory_hosts(name)
+                for host in inventory_hosts:
+                    hosts[host] = {"server_role": name}
+                    if name in addresses and len(inventory_hosts) == 1:
+                        hosts[host]["ansible_host"] = addresses[name]
+
+                for service in [name, *item.get("services", [])]:
+                    targets = services.setdefault(service, [])
+                    targets.extend(h for h in inventory_hosts if h not in targets)
+
+        index = {
+            "source_mtime": self.config_manager.domains_file.stat().st_mtime_ns,
+            "services": {k: v for k, v in services.items() if v},
+            "hosts": hosts,
+        }
+
+        inventory = {
+            "all": {
+                "vars": {
+                    "ansible_user": config.get("global", {}).get(
+                        "default_user", "ansible"
+                    )
+                },
+                "hosts": hosts,
+            }
+        }
+
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        self.index_file.write_text(json.dumps(index, indent=2))
+        self.inventory_file.write_text(yaml.safe_dump(inventory, sort_keys=False))
+
+        self.logger.success(
+            f"Indexed {len(index['services'])} services on {len(hosts)} hosts"
+        )
+        return index
+
+    def load_index(self) -> dict:
+        """Load the service index, rebuilding it if domains.yml changed"""
+        try:
+            index = json.loads(self.index_file.read_text())
+            if (
+                index.get("source_mtime")
+                == self.config_manager.domains_file.stat().st_mtime_ns
+                and self.inventory_file.exists()
+            ):
+                return index
+        except (OSError, json.JSONDecodeError):
+            pass
+
+        return self.build_index()
+
+    def resolve(self, target: str) -> list[str]:
+        """Resolve a service, domain or host name to target hosts"""
+        index = self.load_index()
+        if target in index["services"]:
+            return index["services"][target]
+        if target in index["hosts"]:
+            return [target]
+
+        self.logger.error(f"Unknown service or host: {target}")
+        self.logger.info(f"Known services: {', '.join(sorted(index['services']))}")
+        return []
+
+    def warm(self) -> bool:
+        """Open SSH master connections and cache facts for every indexed host"""
+        self.build_index()
+        self.logger.info("Opening SSH master connections and caching facts...")
+
+        cmd = [
+            "ansible",
+            "all",
+            "-i",
+            str(self.inventory_file),
+            "-m",
+            "ansible.builtin.setup",
+            "-a",
+            "gather_subset=min,network",
+            "--forks",
+            "50",
+            "--one-line",
+        ]
+        result = run_streaming(
+            cmd,
+            lambda _stream, line: self.logger.output("warm", line),
+            cwd=self.project_root,
+            env=self._env(),
+        )
+        if result.returncode != 0:
+            for line in result.tail:
+                if "UNREACHABLE" in line or "FAILED" in line:
+                    self.logger.error(line[:200])
+            return False
+
+        self.logger.success("Emergency path is warm")
+        return True
+
+    def run(
+        self,
+        playbook: str,
+        hosts: list[str],
+        extra_vars: dict,
+        started: float,
+        gather_facts: bool = False,
+    ) -> bool:
+        """Run an emergency playbook against the given hosts"""
+        env = self._env()
+        if not gather_facts and not self._facts_cached(hosts, env):
+            self.logger.warn("No current cached facts for some hosts, gathering them")
+            gather_facts = True
+
+        extra_vars["emergency_gather_facts"] = gather_facts
+        if not gather_facts:
+            # Cached facts carry a stale clock; extra vars take precedence
+            now = datetime.now(UTC)
+            extra_vars["ansible_date_time"] = {
+                "iso8601": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "epoch": str(int(now.timestamp())),
+                "date": now.strftime("%Y-%m-%d"),
+                "time": now.strftime("%H:%M:%S"),
+                "tz": "UTC",
+            }
+
+        cmd = [
+            "ansible-playbook",
+            str(self.playbooks_dir / playbook),
+            "-i",
+            str(self.inventory_file),
+            "--extra-vars",
+            json.dumps(extra_vars),
+        ]
+
+        with (
+            self.tracer.span(playbook, "playbook", hosts=",".join(hosts)) as span,
+            self.tracer.ansible_events(env, self.deployment.callback_dir),
+        ):
+            result = run_streaming(
+                cmd,
+                lambda _stream, line: self.logger.output("ansible", line),
+                cwd=self.project_root,
+                env=env,
+            )
+            span["exit_code"] = result.returncode
+
+        self._report_first_action(started)
+
+        if result.returncode != 0:
+            self.logger.error(f"{playbook} failed with exit code {result.returncode}")
+            return False
+
+        self.logger.success(f"{playbook} completed on {', '.join(hosts)}")
+        return True
+
+    def _facts_cached(self, hosts: list[str], env: dict[str, str]) -> bool:
+        """Check that every host has cached facts the cache will still serve
+
+        The jsonfile cache ignores entries older than its timeout (0 means
+        they never expire), and with fact gathering off the plays would then
+        run without any facts. Other cache plugins are not read from disk.
+        """
+        if env.get("ANSIBLE_CACHE_PLUGIN", "jsonfile") != "jsonfile":
+            return False
+        timeout = int(
+            env.get("ANSIBLE_CACHE_PLUGIN_TIMEOUT", self.deployment.FACT_CACHE_TIMEOUT)
+        )
+        # Leave the playbook itself some time before the entries expire
+        cutoff = time.time() - timeout + FACT_EXPIRY_MARGIN
+        for host in hosts:
+            try:
+                mtime = (
+                    (self.deployment.fact_cache_dir / f"ansible_facts{host}")
+                    .stat()
+                    .st_mtime
+                )
+            except OSError:
+                return False
+            if timeout and mtime < cutoff:
+                return False
+        return True
+
+    def _report_first_action(self, started: float):
+        """Log the time from command start to the first task on a host"""
+        starts = [
+            span["ts"] / 1_000_000
+            for span in self.tracer.spans
+            if span["cat"] == "task" and span["args"].get("host") != "localhost"
+        ]
+        if not starts:
+            return
+
+        elapsed = min(starts) - started
+        message = (
+            f"Time to first action: {elapsed:.2f}s "
+            f"(target < {FIRST_ACTION_TARGET:.0f}s)"
+        )
+        if elapsed <= FIRST_ACTION_TARGET:
+            self.logger.info(message)
+        else:
+            self.logger.warn(f"{message}; run 'atl emergency warm' beforehand")
+
+    def _env(self) -> dict[str, str]:
+        """Ansible environment for the emergency path"""
+        env = self.deployment.ansible_env()
+        env["ANSIBLE_SSH_ARGS"] = SSH_ARGS
+        env["ANSIBLE_SSH_CONTROL_PATH_DIR"] = str(self.control_path_dir)
+        env["ANSIBLE_HOST_KEY_CHECKING"] = "False"
+        self.control_path_dir.mkdir(parents=True, exist_ok=True)
+        return env
+
+    def _terraform_addresses(self) -> dict[str, str]:
+        """Get public IPs per domain from Terraform outputs, if available"""
+        try:
+            result = subprocess.run(
+                ["terraform", "output", "-json", "servers"],
+                cwd=self.project_root / "terraform",
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return {}
+
+        if result.returncode != 0:
+            self.logger.debug(f"Terraform outputs not available: {result.stderr}")
+            return {}
+
+        try:
+            servers = json.loads(result.stdout)
+        except json.JSONDecodeError:
+            return {}
+
+        return {
+            name: server["public_ip"]
+            for name, server in servers.items()
+            if server.get("public_ip")
+        }
+
+
+# Click CLI interface
+@click.group()
+@click.pass_context
+def cli(ctx):
+    """Emergency actions with minimal startup latency
+
+    Run 'atl emergency warm' ahead of time so actions start from a cached
+    service index, cached facts and open SSH connections.
+    """
+    ctx.ensure_object(dict)
+    ctx.obj["started"] = time.time()
+
+    project_root = Path(__file__).parent.parent.parent
+    logger = InfraLogger("emergency", project_root / "logs")
+    manager = EmergencyManager(project_root, logger)
+
+    ctx.obj["logger"] = logger
+    ctx.obj["emergency_manager"] = manager
+    ctx.call_on_close(manager.deployment.finish_trace)
+
+
+@cli.command()
+@click.pass_context
+def index(ctx):
+    """Rebuild the service -> host index"""
+    ctx.obj["emergency_manager"].build_index()
+
+
+@cli.command()
+@click.pass_context
+def warm(ctx):
+    """Rebuild the index, cache facts and open SSH master connections"""
+    if not ctx.obj["emergency_manager"].warm():
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument("service")
+@click.option(
+    "--mode",
+    type=click.Choice(["graceful", "emergency"]),
+    default="graceful",
+    show_default=True,
+    help="Restart mode",
+)
+@click.option(
+    "--serial", type=int, default=1, show_default=True, help="Hosts at a time"
+)
+@click.option("--gather-facts", is_flag=True, help="Gather fresh facts first")
+@click.option("--yes", "-y", is_flag=True, help="Skip the confirmation prompt")
+@click.pass_context
+def restart(ctx, service, mode, serial, gather_facts, yes):
+    """Restart the stack on every host running SERVICE"""
+    manager = ctx.obj["emergency_manager"]
+
+    hosts = manager.resolve(service)
+    if not hosts:
+        sys.exit(1)
+
+    if not yes and not click.confirm(f"Restart services on {', '.join(hosts)}?"):
+        return
+
+    extra_vars = {
+        "target_hosts": ",".join(hosts),
+        "restart_mode": mode,
+        "restart_serial": serial,
+        "confirm_restart": False,
+    }
+    if not manager.run(
+        "service-restart.yml", hosts, extra_vars, ctx.obj["started"], gather_facts
+    ):
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument("service")
+@click.option(
+    "--action",
+    type=click.Choice(["stop", "quarantine", "status", "restore"]),
+    default="stop",
+    show_default=True,
+    help="Isolation action",
+)
+@click.option("--gather-facts", is_flag=True, help="Gather fresh facts first")
+@click.option("--yes", "-y", is_flag=True, help="Skip the confirmation prompt")
+@click.pass_context
+def isolate(ctx, service, action, gather_facts, yes):
+    """Isolate SERVICE on every host running it"""
+    manager = ctx.obj["emergency_manager"]
+
+    hosts = manager.resolve(service)
+    if not hosts:
+        sys.exit(1)
+
+    if (
+        action != "status"
+        and not yes
+        and not click.confirm(f"{action.title()} {service} on {', '.join(hosts)}?")
+    ):
+        return
+
+    extra_vars = {
+        "target_host": ",".join(hosts),
+        "isolation_action": action,
+        "confirm_isolation": False,
+    }
+    if service not in hosts:
+        extra_vars["service_name"] = service
+
+    if not manager.run(
+        "isolate-service.yml", hosts, extra_vars, ctx.obj["started"], gather_facts
+    ):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    cli()
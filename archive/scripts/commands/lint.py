@@ -5,16 +5,45 @@ Unified linting orchestrator that delegates to specialized tools
 """
 
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from datetime import datetime
+from fnmatch import fnmatch
 from pathlib import Path
 
 import click
 from rich.console import Console
+from rich.table import Table
 
+from ..common.cache import LintCache
 from ..common.config import ConfigManager
-from ..common.logging import InfraLogger
+from ..common.files import ProjectFiles
+from ..common.findings import (
+    Finding,
+    parse_ansible_lint,
+    parse_pymarkdown,
+    parse_ruff,
+    parse_shellcheck,
+    parse_shfmt,
+    parse_terraform_fmt,
+    parse_terraform_validate,
+    parse_tflint,
+    parse_yamllint,
+    summarize,
+    write_sarif,
+)
+from ..common.journal import fingerprint
+from ..common.logging import BufferedLogger, InfraLogger
+from ..common.process import run_streaming
+from ..common.tools import ToolResolver
+from ..common.watch import FileWatcher
 
 
 class LintManager:
@@ -30,13 +59,64 @@ class LintManager:
     - shell: Uses shellcheck + shfmt
 
     Each tool handles its own file discovery and exclusion patterns.
+    Linters run concurrently outside of fix mode; each one logs into its own
+    buffer, which is replayed in linter order once it finishes. Tools run in
+    machine-readable output modes and their findings are collected into one
+    list, written out as SARIF after the run.
     """
 
-    def __init__(self, project_root: Path, logger: InfraLogger):
+    # File patterns each linter owns, for routing changed files to linters
+    LINTER_ROUTES = {
+        "Python (ruff)": ("*.py",),
+        "YAML (yamllint)": ("*.yml", "*.yaml"),
+        "Ansible (ansible-lint)": ("ansible/*.yml", "ansible/*.yaml"),
+        "Terraform (terraform)": ("terraform/*.tf", "terraform/*.tfvars"),
+        "Shell (shellcheck)": ("*.sh",),
+        "Markdown (pymarkdown)": ("*.md",),
+    }
+
+    # Directories watched by --watch
+    WATCH_DIRS = ("ansible", "terraform", "scripts", "docs")
+
+    # Characters read from a linter's stdout at a time while parsing findings
+    READ_SIZE = 64 * 1024
+
+    # Binaries and config files each cached linter result depends on
+    CACHE_TOOLS = {
+        "ruff": (["ruff"], ["pyproject.toml"]),
+        "yamllint": (["yamllint"], [".yamllint.yml", "config/linting/.yamllint.yml"]),
+        "ansible-lint": (
+            ["ansible-lint", "ansible"],
+            [".ansible-lint", "config/ansible/.ansible-lint"],
+        ),
+        "terraform": (
+            ["terraform", "tflint"],
+            [".terraformrc", ".tflint.hcl", "config/terraform/.tflint.hcl"],
+        ),
+        "shell": (["shellcheck", "shfmt"], [".shellcheckrc", ".editorconfig"]),
+        "pymarkdown": (["pymarkdown"], [".pymarkdown.json", ".pymarkdown.yml"]),
+    }
+
+    def __init__(self, project_root: Path, logger: InfraLogger, use_cache: bool = True):
         self.project_root = project_root
-        self.logger = logger
+        self._logger = logger
+        self._local = threading.local()
         self.console = Console()
         self.config_manager = ConfigManager(project_root, logger)
+        self.files = ProjectFiles(project_root)
+        self.tools = ToolResolver(project_root, logger)
+        self.cache = (
+            LintCache(project_root / ".cache" / "lint", self.tools)
+            if use_cache
+            else None
+        )
+        self.findings: list[Finding] = []
+        self._findings_lock = threading.Lock()
+
+    @property
+    def logger(self) -> InfraLogger:
+        """The logger for the current thread (a buffer while linters run concurrently)"""
+        return getattr(self._local, "logger", self._logger)
 
     def check_prerequisites(self) -> dict[str, bool]:
         """Check if all linting tools are available"""
@@ -55,7 +135,7 @@ class LintManager:
 
         available = {}
         for tool_name, command in tools.items():
-            available[tool_name] = self._command_exists(command)
+            available[tool_name] = self.tools.resolve(command) is not None
             if available[tool_name]:
                 self.logger.debug(f"✅ {tool_name} available")
             else:
@@ -74,13 +154,25 @@ class LintManager:
         verbose: bool = False,
         fix: bool = False,
         strict: bool = False,
+        jobs: int | None = None,
+        paths: list[Path] | None = None,
+        sarif: Path | None = None,
     ) -> bool:
-        """Run targeted linters based on the target parameter"""
+        """Run targeted linters based on the target parameter
+
+        Args:
+            jobs: Linters to run at once (default: CPU count). Fix mode always
+                runs serially since fixers may rewrite files other linters read.
+            paths: Only lint these files, running only the linters that own
+                at least one of them
+            sarif: Where to write the merged SARIF log (default: next to the
+                log file)
+        """
         self.logger.info("Starting comprehensive linting...")
+        self.findings = []
 
         # Check prerequisites but don't store unused result
         self.check_prerequisites()
-        overall_success = True
         results = {}
 
         # Define all available linters
@@ -113,43 +205,130 @@ class LintManager:
             self.logger.error(f"Unknown target: {target}")
             return False
 
+        if paths is not None:
+            self.files = ProjectFiles(self.project_root, paths)
+            linters = [
+                (linter_name, linter_func)
+                for linter_name, linter_func in linters
+                if self._owns(linter_name, paths)
+            ]
+            if not linters:
+                self.logger.info("No changed files for the selected linters")
+                return True
+            self.logger.info(
+                f"Linting {len(paths)} changed files with "
+                f"{', '.join(name for name, _ in linters)}"
+            )
+
+        args = (target, verbose, fix, strict)
+        workers = min(jobs or os.cpu_count() or 1, len(linters))
+
         # Run selected linters
-        for linter_name, linter_func in linters:
-            self.logger.info(f"Running {linter_name}...")
-            try:
-                success = linter_func(target, verbose, fix, strict)
-                results[linter_name] = success
-                if not success:
-                    overall_success = False
-                    self.logger.error(f"❌ {linter_name} failed")
-                else:
-                    self.logger.success(f"✅ {linter_name} passed")
-            except Exception as e:
-                self.logger.error(f"❌ {linter_name} error: {e}")
-                results[linter_name] = False
-                overall_success = False
+        if fix or workers <= 1:
+            for linter_name, linter_func in linters:
+                results[linter_name] = self._run_linter(linter_name, linter_func, args)
+        else:
+            self.logger.info(f"Running {len(linters)} linters with {workers} workers")
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(self._run_buffered, linter_name, linter_func, args)
+                    for linter_name, linter_func in linters
+                ]
+                for (linter_name, _), future in zip(linters, futures, strict=True):
+                    success, buffer = future.result()
+                    buffer.replay()
+                    results[linter_name] = success
+
+        overall_success = all(results.values())
 
         # Summary
+        self._print_findings()
+        sarif_file = write_sarif(
+            self.findings, sarif or self._logger.log_file.with_suffix(".sarif")
+        )
+        self.logger.info(f"SARIF written: {sarif_file}")
         self._print_summary(results, overall_success)
         return overall_success
 
+    def watch(
+        self,
+        target: str = "all",
+        verbose: bool = False,
+        strict: bool = False,
+        jobs: int | None = None,
+        sarif: Path | None = None,
+    ):
+        """Relint files as they change until interrupted
+
+        Each batch of saved files is routed to the linters that own it, as
+        with --since. The manager, its resolved tool paths and its lint cache
+        stay alive between batches, so only the edited files are linted.
+        """
+        roots = [self.project_root / directory for directory in self.WATCH_DIRS]
+        with FileWatcher(roots) as watcher:
+            self.logger.info(
+                f"Watching {', '.join(self.WATCH_DIRS)} ({watcher.backend}), "
+                "press Ctrl+C to stop"
+            )
+            for changed in watcher.batches():
+                started = time.perf_counter()
+                if changed is None:
+                    self.logger.warn("Missed file events, relinting everything")
+                    self.files = ProjectFiles(self.project_root)
+                    paths = None
+                else:
+                    paths = sorted(path for path in changed if path.is_file())
+                    if not paths:
+                        continue
+
+                self.run_all_linters(target, verbose, False, strict, jobs, paths, sarif)
+                self.logger.info(
+                    f"Linted in {time.perf_counter() - started:.2f}s, "
+                    "waiting for changes..."
+                )
+
+    def _run_linter(self, linter_name: str, linter_func, args: tuple) -> bool:
+        """Run a single linter and log its result"""
+        self.logger.info(f"Running {linter_name}...")
+        try:
+            success = linter_func(*args)
+            if not success:
+                self.logger.error(f"❌ {linter_name} failed")
+            else:
+                self.logger.success(f"✅ {linter_name} passed")
+            return success
+        except Exception as e:
+            self.logger.error(f"❌ {linter_name} error: {e}")
+            return False
+
+    def _run_buffered(
+        self, linter_name: str, linter_func, args: tuple
+    ) -> tuple[bool, BufferedLogger]:
+        """Run a single linter on a worker thread with its output buffered"""
+        buffer = BufferedLogger(self._logger)
+        self._local.logger = buffer
+        try:
+            return self._run_linter(linter_name, linter_func, args), buffer
+        finally:
+            del self._local.logger
+
     def run_ruff_lint(
         self, target: str, verbose: bool, fix: bool, strict: bool
     ) -> bool:
         """Run ruff Python linting via uv"""
-        cmd = ["uv", "run", "ruff", "check"]
+        cmd = [*self.tools.command("ruff"), "check", "--output-format", "json-lines"]
         if fix:
             cmd.append("--fix")
         if verbose:
             cmd.append("--verbose")
 
-        # Add target paths for Python files
-        if target == "all":
-            cmd.append("scripts/")
-        elif target == "python":
-            cmd.append("scripts/")
-
-        return self._run_command(cmd, "ruff")
+        files = self.files.of_type("python", ["scripts/"])
+        return self._cached_run(
+            "ruff",
+            files,
+            lambda paths: self._run_chunked(cmd, paths, "ruff", parse_ruff),
+            flags={"fix": fix},
+        )
 
     def run_yaml_lint(
         self, target: str, verbose: bool, fix: bool, strict: bool
@@ -165,17 +344,28 @@ class LintManager:
             ".github/",
         ]
 
-        cmd = ["uv", "run", "yamllint"] + paths_to_scan
+        cmd = [*self.tools.command("yamllint"), "-f", "parsable"]
         if strict:
             cmd.append("--strict")
 
-        return self._run_command(cmd, "yamllint")
+        files = self.files.of_type("yaml", paths_to_scan)
+        return self._cached_run(
+            "yamllint",
+            files,
+            lambda paths: self._run_chunked(cmd, paths, "yamllint", parse_yamllint),
+            flags={"strict": strict},
+        )
 
     def run_ansible_lint(
         self, target: str, verbose: bool, fix: bool, strict: bool
     ) -> bool:
         """Run ansible-lint using .ansible-lint configuration via uv"""
-        cmd = ["uv", "run", "ansible-lint", "--config-file=.ansible-lint"]
+        cmd = [
+            *self.tools.command("ansible-lint"),
+            "--config-file=.ansible-lint",
+            "-f",
+            "codeclimate",
+        ]
 
         if verbose:
             cmd.append("-v")
@@ -186,72 +376,291 @@ class LintManager:
 
         # Add specific paths for targeted linting
         if target == "playbooks":
-            cmd.append("ansible/playbooks/")
+            lint_dir = "ansible/playbooks/"
         elif target == "roles":
-            cmd.append("ansible/roles/")
+            lint_dir = "ansible/roles/"
         elif target == "inventories":
-            cmd.append("ansible/inventories/")
+            lint_dir = "ansible/inventories/"
         else:
             # For "all", scan the entire ansible directory
-            cmd.append("ansible/")
-
-        return self._run_command(cmd, "ansible-lint")
+            lint_dir = "ansible/"
+
+        # A playbook's result depends on the roles, vars and includes it pulls
+        # in, so the cache is keyed on the whole ansible tree (not just the
+        # files linted): any change under ansible/ relints the full scope
+        flags = {"strict": strict, "fix": fix, "scope": lint_dir}
+        if self.cache is not None:
+            tree = ProjectFiles(self.project_root).of_type("yaml", ["ansible/"])
+            flags["tree"] = fingerprint(tree)
+
+        files = self.files.of_type("yaml", [lint_dir])
+        return self._cached_run(
+            "ansible-lint",
+            files,
+            lambda paths: self._run_chunked(
+                cmd, paths, "ansible-lint", parse_ansible_lint
+            ),
+            record_all=True,
+            flags=flags,
+        )
 
     def run_terraform_lint(
         self, target: str, verbose: bool, fix: bool, strict: bool
     ) -> bool:
         """Run terraform formatting and validation via terraform CLI"""
-        self.logger.info("Running terraform fmt and validate...")
+        # fmt/validate work on the whole configuration, so it is cached as a unit
+        files = self.files.of_type("terraform", ["terraform/"])
+        return self._cached_run(
+            "terraform",
+            files,
+            lambda _paths: self._run_terraform_checks(verbose, fix),
+            record_all=True,
+            flags={"fix": fix},
+        )
+
+    def _run_terraform_checks(self, verbose: bool, fix: bool) -> bool:
+        """Run terraform fmt, then validate and tflint every module concurrently"""
+        modules = sorted(
+            {
+                path.parent
+                for path in self.files.of_type("terraform", ["terraform/"])
+                if path.suffix == ".tf"
+            }
+        )
+        self.logger.info(
+            f"Running terraform fmt, then validate on {len(modules)} modules..."
+        )
+        env = self._terraform_env()
 
-        # Set up environment for project-specific terraform configuration
-        env = os.environ.copy()
-        config_file = str(self.project_root / ".terraformrc")
-        env["TF_CLI_CONFIG_FILE"] = config_file
-        env["TF_PLUGIN_CACHE_DIR"] = str(self.project_root / ".terraform" / "cache")
-        env["TF_DATA_DIR"] = str(self.project_root / ".terraform" / "data")
-
-        # Ensure terraform directories exist
-        data_dir = self.project_root / ".terraform" / "data"
-        cache_dir = self.project_root / ".terraform" / "cache"
-        data_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            # Format check/fix (one recursive pass covers every module)
+            fmt_cmd = ["terraform", "fmt", "-recursive", "-list=true"]
+            if fix:
+                fmt_ok = self._run_command(
+                    fmt_cmd, "terraform fmt", cwd="terraform", env=env
+                )
+            else:
+                fmt_ok = self._run_findings(
+                    fmt_cmd + ["-check"],
+                    "terraform fmt",
+                    parse_terraform_fmt,
+                    cwd="terraform",
+                    env=env,
+                    fail_on_findings=True,
+                )
+                if not fmt_ok and verbose:
+                    self._run_command(
+                        ["terraform", "fmt", "-recursive", "-check", "-diff"],
+                        "terraform fmt",
+                        cwd="terraform",
+                        env=env,
+                    )
+
+            if not modules:
+                return fmt_ok
+
+            # Modules share nothing but the read-only provider mirror, so the
+            # whole stage takes as long as the slowest module
+            scratch = self._terraform_scratch()
+            with ThreadPoolExecutor(max_workers=len(modules)) as executor:
+                results = list(
+                    executor.map(
+                        lambda module: self._check_terraform_module(
+                            module, scratch, env
+                        ),
+                        modules,
+                    )
+                )
+
+        except Exception as e:
+            self.logger.error(f"Terraform linting failed: {e}")
+            return False
+
+        # Log from this thread, which holds the linter's buffered logger; fmt
+        # findings fail the unit too, so it is not cached as a pass
+        success = fmt_ok
+        for module, (ok, findings, errors) in zip(modules, results, strict=True):
+            for finding in findings:
+                self._add_finding(finding, module)
+            for error in errors:
+                self.logger.error(error)
+            if not ok:
+                success = False
+        return success
+
+    def _terraform_env(self) -> dict[str, str]:
+        """Environment for lint-time terraform runs
+
+        The provider plugin cache that deploys fill is exposed to each module's
+        init as a filesystem mirror. Terraform only reads from a mirror, so
+        modules can init concurrently (the plugin cache itself is not safe
+        for concurrent writers). Providers missing from it are downloaded into
+        the module's own data directory.
+        """
+        terraform_dir = self.project_root / ".terraform"
+        cache_dir = terraform_dir / "cache"
         cache_dir.mkdir(parents=True, exist_ok=True)
 
-        try:
-            # Change to terraform directory
-            terraform_dir = self.project_root / "terraform"
-            original_cwd = os.getcwd()
-            os.chdir(terraform_dir)
+        cli_config = terraform_dir / "lint.tfrc"
+        cli_config.write_text(
+            "provider_installation {\n"
+            f'  filesystem_mirror {{\n    path = "{cache_dir}"\n  }}\n'
+            "  direct {}\n"
+            "}\n"
+        )
 
-            # Format check/fix
-            fmt_cmd = ["terraform", "fmt"]
-            if not fix:
-                fmt_cmd.append("-check")
-            if verbose:
-                fmt_cmd.append("-diff")
+        env = os.environ.copy()
+        env.pop("TF_PLUGIN_CACHE_DIR", None)
+        env["TF_CLI_CONFIG_FILE"] = str(cli_config)
+        env["TF_IN_AUTOMATION"] = "1"
+        return env
 
-            self._run_command(fmt_cmd, "terraform fmt", env=env)
+    def _terraform_scratch(self) -> Path:
+        """Mirror terraform/ into a scratch tree for init, validate and tflint
 
-            # Validation
-            validate_cmd = ["terraform", "validate"]
-            if not Path(".terraform").exists():
-                # Need to init first
-                init_cmd = ["terraform", "init", "-backend=false"]
-                self._run_command(init_cmd, "terraform init", env=env)
+        terraform init writes .terraform.lock.hcl next to the configuration,
+        so running against a copy keeps the checkout clean. The copy keeps
+        its lock files between runs, and only changed files are copied, so
+        unchanged modules do not need to init again.
 
-            return self._run_command(validate_cmd, "terraform validate", env=env)
+        Returns:
+            Path: The scratch copy of terraform/
+        """
+        source = self.project_root / "terraform"
+        scratch = self.project_root / ".terraform" / "lint" / "src"
+        generated = {".terraform", ".terraform.lock.hcl"}
+
+        copied = set()
+        for root, dirs, names in os.walk(source):
+            dirs[:] = [d for d in dirs if d not in generated]
+            target = scratch / Path(root).relative_to(source)
+            target.mkdir(parents=True, exist_ok=True)
+            for name in names:
+                if name in generated or ".tfstate" in name:
+                    continue
+                src, dst = Path(root) / name, target / name
+                copied.add(dst)
+                src_stat = src.stat()
+                try:
+                    dst_stat = dst.stat()
+                    if (dst_stat.st_size, dst_stat.st_mtime_ns) == (
+                        src_stat.st_size,
+                        src_stat.st_mtime_ns,
+                    ):
+                        continue
+                except FileNotFoundError:
+                    pass
+                shutil.copy2(src, dst)
+
+        # Drop files deleted from the checkout, keeping init's own output
+        for root, dirs, names in os.walk(scratch):
+            dirs[:] = [d for d in dirs if d not in generated]
+            for name in names:
+                path = Path(root) / name
+                if name not in generated and path not in copied:
+                    path.unlink()
+        return scratch
+
+    def _check_terraform_module(
+        self, module: Path, scratch: Path, env: dict[str, str]
+    ) -> tuple[bool, list[Finding], list[str]]:
+        """Init (when needed), validate and tflint one module root
+
+        Runs on a worker thread, so results are returned rather than logged.
+
+        Args:
+            module: The module root in the checkout
+            scratch: The scratch copy of terraform/ the commands run in
+
+        Returns:
+            tuple: Success, findings (with module-relative paths) and errors
+        """
+        relative = module.relative_to(self.project_root)
+        workdir = scratch / module.relative_to(self.project_root / "terraform")
+        data_dir = self.project_root / ".terraform" / "lint" / "-".join(relative.parts)
+        env = {**env, "TF_DATA_DIR": str(data_dir)}
+        errors: list[str] = []
+
+        def terraform(*args: str) -> subprocess.CompletedProcess:
+            return subprocess.run(
+                ["terraform", *args],
+                cwd=workdir,
+                env=env,
+                capture_output=True,
+                text=True,
+            )
 
-        except Exception as e:
-            self.logger.error(f"Terraform linting failed: {e}")
-            return False
-        finally:
-            os.chdir(original_cwd)
+        def init() -> bool:
+            result = terraform("init", "-backend=false", "-input=false", "-no-color")
+            if result.returncode != 0:
+                errors.append(
+                    f"terraform init failed in {relative}: {result.stderr.strip()}"
+                )
+            return result.returncode == 0
+
+        # Each module gets its own data directory; init again only when
+        # validate reports that modules or providers are missing
+        needs_init = not data_dir.exists()
+        if needs_init and not init():
+            return False, [], errors
+
+        # After one init (up front or on demand), validate's result stands
+        init_done = needs_init
+        while True:
+            result = terraform("validate", "-json", "-no-color")
+            try:
+                findings = list(parse_terraform_validate([result.stdout]))
+            except (ValueError, KeyError) as e:
+                errors.append(f"terraform validate output in {relative}: {e}")
+                return False, [], errors
+            if init_done or not any(
+                "terraform init" in finding.message for finding in findings
+            ):
+                break
+            init_done = True
+            if not init():
+                return False, [], errors
+
+        success = result.returncode == 0
+        if not success and not findings:
+            errors.append(
+                f"terraform validate failed in {relative}: {result.stderr.strip()}"
+            )
+
+        tflint = self.tools.resolve("tflint")
+        if tflint:
+            cmd = [tflint, "--format", "json", "--no-color"]
+            config = self._tflint_config()
+            if config:
+                cmd.append(f"--config={config}")
+            result = subprocess.run(cmd, cwd=workdir, capture_output=True, text=True)
+            try:
+                issues = list(parse_tflint([result.stdout]))
+            except (ValueError, KeyError) as e:
+                errors.append(f"tflint output in {relative}: {e}")
+                issues, result.returncode = [], 1
+            if result.returncode != 0:
+                success = False
+                if not issues:
+                    errors.append(
+                        f"tflint failed in {relative}: {result.stderr.strip()}"
+                    )
+            findings.extend(issues)
+
+        return success, findings, errors
+
+    def _tflint_config(self) -> Path | None:
+        """Find the tflint configuration file"""
+        for candidate in (".tflint.hcl", "config/terraform/.tflint.hcl"):
+            path = self.project_root / candidate
+            if path.exists():
+                return path
+        return None
 
     def run_shell_lint(
         self, target: str, verbose: bool, fix: bool, strict: bool
     ) -> bool:
         """Run shellcheck and shfmt on shell scripts using uv"""
-        success = True
-
         # Find shell scripts only in project directories, not third-party collections
         project_dirs = [
             "scripts/",
@@ -263,124 +672,344 @@ class LintManager:
             ".github/",
         ]
 
-        shell_scripts = []
-        for project_dir in project_dirs:
-            dir_path = self.project_root / project_dir
-            if dir_path.exists():
-                shell_scripts.extend(dir_path.rglob("*.sh"))
-
+        shell_scripts = self.files.of_type("shell", project_dirs)
         if not shell_scripts:
             self.logger.debug("No shell scripts found in project directories")
             return True
 
-        # Run shellcheck via uv
-        for script in shell_scripts:
-            cmd = ["uv", "run", "shellcheck", str(script)]
-            if not self._run_command(cmd, f"shellcheck {script.name}"):
+        def run(paths: list[Path]) -> bool:
+            scripts = sorted(str(p.relative_to(self.project_root)) for p in paths)
+            self.logger.debug(f"Checking {len(scripts)} shell scripts")
+
+            shellcheck_ok = self._run_shellcheck(scripts)
+            shfmt_ok = self._run_shfmt(scripts, verbose, fix)
+            return shellcheck_ok and shfmt_ok
+
+        return self._cached_run("shell", shell_scripts, run, flags={"fix": fix})
+
+    def _run_shellcheck(self, scripts: list[str]) -> bool:
+        """Run shellcheck once per ARG_MAX chunk, collecting its findings"""
+        base_cmd = [*self.tools.command("shellcheck"), "-f", "json1"]
+        success = True
+        for cmd in self._chunked(base_cmd, scripts):
+            # Exit code 1 only means findings were reported
+            if not self._run_findings(cmd, "shellcheck", parse_shellcheck):
                 success = False
+        return success
 
-        # Run shfmt via uv
-        for script in shell_scripts:
-            cmd = ["uv", "run", "shfmt", "-i", "2", "-s"]
-            if fix:
-                cmd.extend(["-w", str(script)])
-            else:
-                cmd.extend(["-d", str(script)])
+    def _run_shfmt(self, scripts: list[str], verbose: bool, fix: bool) -> bool:
+        """Run shfmt once per ARG_MAX chunk, listing (or fixing) unformatted files"""
+        base_cmd = [*self.tools.command("shfmt"), "-i", "2", "-s"]
+
+        if fix:
+            success = True
+            for cmd in self._chunked(base_cmd + ["-w"], scripts):
+                if not self._run_command(cmd, "shfmt"):
+                    success = False
+            return success
 
-            if not self._run_command(cmd, f"shfmt {script.name}"):
+        found = len(self.findings)
+        success = True
+        for cmd in self._chunked(base_cmd + ["-l"], scripts):
+            if not self._run_findings(cmd, "shfmt", parse_shfmt, fail_on_findings=True):
                 success = False
 
+        # Diffs only for the files that need them
+        if verbose and not success:
+            with self._findings_lock:
+                unformatted = [
+                    finding.path
+                    for finding in self.findings[found:]
+                    if finding.tool == "shfmt"
+                ]
+            for cmd in self._chunked(base_cmd + ["-d"], unformatted):
+                result = subprocess.run(
+                    cmd, cwd=self.project_root, capture_output=True, text=True
+                )
+                if result.stdout.strip():
+                    self.logger.error(result.stdout.strip())
+
         return success
 
+    @staticmethod
+    def _chunked(cmd: list[str], paths: list[str]) -> Iterator[list[str]]:
+        """Split ``cmd + paths`` into command lines that fit within ARG_MAX"""
+        # Arguments and the environment share the ARG_MAX budget; each string
+        # also costs a pointer and a NUL terminator
+        budget = os.sysconf("SC_ARG_MAX") - 4096
+        budget -= sum(len(k) + len(v) + 2 + 8 for k, v in os.environ.items())
+        base = sum(len(arg) + 1 + 8 for arg in cmd)
+
+        chunk: list[str] = []
+        size = base
+        for path in paths:
+            cost = len(path) + 1 + 8
+            if chunk and size + cost > budget:
+                yield cmd + chunk
+                chunk, size = [], base
+            chunk.append(path)
+            size += cost
+
+        if chunk:
+            yield cmd + chunk
+
     def run_markdown_lint(
         self, target: str, verbose: bool, fix: bool, strict: bool
     ) -> bool:
         """Run pymarkdown linting via uv"""
-        # Find markdown files in project directories
-        project_dirs = [
-            "docs/",
-            "README.md",
-            "*.md",
-            "ansible/",
-            "terraform/",
-        ]
+        # Find markdown files in the project root and project directories
+        project_dirs = ["docs/", "ansible/", "terraform/"]
 
-        markdown_files = []
-        for project_dir in project_dirs:
-            if project_dir.endswith(".md"):
-                md_file = self.project_root / project_dir
-                if md_file.exists():
-                    markdown_files.append(md_file)
-            else:
-                dir_path = self.project_root / project_dir
-                if dir_path.exists():
-                    # For terraform directory, exclude .terraform subdirectory
-                    if project_dir == "terraform/":
-                        for md_file in dir_path.rglob("*.md"):
-                            # Skip files in .terraform directory
-                            if ".terraform" not in str(md_file):
-                                markdown_files.append(md_file)
-                    else:
-                        markdown_files.extend(dir_path.rglob("*.md"))
+        markdown_files = [
+            path
+            for path in self.files.of_type("markdown")
+            if path.parent == self.project_root
+        ] + self.files.of_type("markdown", project_dirs)
 
         if not markdown_files:
             self.logger.debug("No markdown files found in project directories")
             return True
 
-            # Choose between fix and scan based on fix flag
+        # Choose between fix and scan based on fix flag
         command = "fix" if fix else "scan"
-        cmd = ["uv", "run", "pymarkdown", "-d", "MD033,MD036", command] + [
-            str(f) for f in markdown_files
-        ]
+        cmd = [*self.tools.command("pymarkdown"), "-d", "MD033,MD036", command]
 
         # Add strict flag for scan command (fix doesn't support strict)
         if strict and not fix:
             cmd.append("--strict")
 
-        # Handle pymarkdown fix mode differently - it returns non-zero when fixes are made
-        if fix:
-            return self._run_markdown_fix_command(cmd)
+        def run(paths: list[Path]) -> bool:
+            # pymarkdown fix returns non-zero when fixes are made
+            if fix:
+                return self._run_markdown_fix_command(cmd + [str(p) for p in paths])
+            return self._run_chunked(cmd, paths, "pymarkdown", parse_pymarkdown)
+
+        return self._cached_run(
+            "pymarkdown", markdown_files, run, flags={"strict": strict, "fix": fix}
+        )
+
+    def changed_files(
+        self, since: str | None = None, staged: bool = False
+    ) -> list[Path] | None:
+        """Get files changed since a git ref (plus untracked files) or staged
+
+        Returns:
+            list: Existing changed files, or None if git failed
+        """
+        if staged:
+            commands = [
+                ["git", "diff", "--cached", "--name-only", "--relative", "-z"],
+            ]
         else:
-            return self._run_command(cmd, "pymarkdown")
+            commands = [
+                ["git", "diff", "--name-only", "--relative", "-z", since or "HEAD"],
+                ["git", "ls-files", "--others", "--exclude-standard", "-z"],
+            ]
 
-    def _run_command(
+        names = set()
+        for cmd in commands:
+            result = subprocess.run(
+                cmd, cwd=self.project_root, capture_output=True, text=True
+            )
+            if result.returncode != 0:
+                self.logger.error(f"{' '.join(cmd)} failed: {result.stderr.strip()}")
+                return None
+            names.update(name for name in result.stdout.split("\0") if name)
+
+        # Deleted files show up in the diff but have nothing left to lint
+        return sorted(
+            self.project_root / name
+            for name in names
+            if (self.project_root / name).is_file()
+        )
+
+    def _owns(self, linter_name: str, paths: list[Path]) -> bool:
+        """Check whether any of the paths belongs to a linter"""
+        patterns = self.LINTER_ROUTES.get(linter_name, ("*",))
+        return any(
+            fnmatch(str(path.relative_to(self.project_root)), pattern)
+            for path in paths
+            for pattern in patterns
+        )
+
+    def _cached_run(
+        self,
+        tool: str,
+        files: list[Path],
+        run: Callable[[list[Path]], bool],
+        record_all: bool = False,
+        flags: dict[str, object] | None = None,
+    ) -> bool:
+        """Run a linter on the files without a cached pass and cache new passes
+
+        Args:
+            tool: Key into CACHE_TOOLS
+            run: Lints the given files and returns success
+            record_all: Lint all files whenever any changed (for tools that
+                check a whole configuration rather than single files)
+            flags: Run options that change the verdict (e.g. strict), so a
+                lenient pass is never reused by a stricter run
+        """
+        if not files:
+            return True
+        if self.cache is None:
+            return run(files)
+
+        binaries, configs = self.CACHE_TOOLS[tool]
+        context = [f"{name}={value}" for name, value in (flags or {}).items()]
+        pending = self.cache.pending(tool, files, configs, binaries, context)
+        if not pending:
+            self.logger.info(f"{tool}: {len(files)} files unchanged since last pass")
+            return True
+
+        # Files with a cached pass already have their current key stored, so
+        # only the pending keys (taken before linting) need recording
+        if record_all:
+            success = run(files)
+        else:
+            if len(pending) < len(files):
+                self.logger.info(
+                    f"{tool}: {len(files) - len(pending)} files cached, "
+                    f"linting {len(pending)}"
+                )
+            success = run(list(pending))
+        if success:
+            self.cache.record(tool, pending)
+        return success
+
+    def _run_chunked(
+        self,
+        cmd: list[str],
+        paths: list[Path],
+        tool_name: str,
+        parser: Callable[[Iterable[str]], Iterator[Finding]] | None = None,
+    ) -> bool:
+        """Run a command on project-relative paths, split to fit ARG_MAX
+
+        Args:
+            parser: Parses the command's output into findings (outside of fix
+                mode, where the output is only logged)
+        """
+        relative = [str(path.relative_to(self.project_root)) for path in paths]
+        success = True
+        for chunk in self._chunked(cmd, relative):
+            if parser:
+                ok = self._run_findings(chunk, tool_name, parser)
+            else:
+                ok = self._run_command(chunk, tool_name)
+            if not ok:
+                success = False
+        return success
+
+    def _run_findings(
         self,
         cmd: list[str],
         tool_name: str,
+        parser: Callable[[Iterable[str]], Iterator[Finding]],
         cwd: str | None = None,
         env: dict | None = None,
+        fail_on_findings: bool = False,
     ) -> bool:
-        """Run a command and return success status"""
-        try:
-            run_cwd = self.project_root / cwd if cwd else self.project_root
+        """Run a command, parsing its output into findings as it streams
 
-            # Set up environment - start with current environment and add custom env vars
-            run_env = os.environ.copy()
-            if env:
-                run_env.update(env)
-
-            result = subprocess.run(
+        Finding paths are made project-relative. The command succeeds on a
+        zero exit code (and, with ``fail_on_findings``, no findings).
+        """
+        run_cwd = self.project_root / cwd if cwd else self.project_root
+        run_env = os.environ.copy()
+        if env:
+            run_env.update(env)
+
+        found = 0
+        with (
+            tempfile.TemporaryFile(mode="w+") as stderr,
+            subprocess.Popen(
                 cmd,
                 cwd=run_cwd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
                 text=True,
-                check=True,
                 env=run_env,
-            )
-
-            if result.stdout.strip():
-                self.logger.debug(f"{tool_name} output: {result.stdout.strip()}")
+            ) as process,
+        ):
+            try:
+                # Fixed-size reads: single-line JSON documents stay bounded too
+                chunks = iter(lambda: process.stdout.read(self.READ_SIZE), "")
+                for finding in parser(chunks):
+                    self._add_finding(finding, run_cwd)
+                    found += 1
+                parsed = True
+            except (ValueError, KeyError) as e:
+                self.logger.error(f"{tool_name} output could not be parsed: {e}")
+                process.stdout.read()
+                parsed = False
+            returncode = process.wait()
+
+            stderr.seek(0)
+            errors = stderr.read().strip()
+
+        if returncode != 0 and not found:
+            self.logger.error(f"{tool_name} failed with exit code {returncode}")
+            if errors:
+                self.logger.error(f"stderr: {errors}")
+        elif errors:
+            self.logger.debug(f"{tool_name} stderr: {errors}")
+
+        return parsed and returncode == 0 and not (fail_on_findings and found)
+
+    def _add_finding(self, finding: Finding, cwd: Path):
+        """Record a finding with a project-relative path and log it"""
+        path = Path(os.path.normpath(cwd / finding.path))
+        if path.is_relative_to(self.project_root):
+            finding = replace(finding, path=str(path.relative_to(self.project_root)))
+
+        with self._findings_lock:
+            self.findings.append(finding)
+
+        message = f"{finding.tool} {finding}"
+        if finding.level == "error":
+            self.logger.error(message)
+        elif finding.level == "warning":
+            self.logger.warn(message)
+        else:
+            self.logger.info(message)
 
-            return True
+    def _run_command(
+        self,
+        cmd: list[str],
+        tool_name: str,
+        cwd: str | None = None,
+        env: dict | None = None,
+    ) -> bool:
+        """Run a command and return success status
 
-        except subprocess.CalledProcessError as e:
-            self.logger.error(f"{tool_name} failed with exit code {e.returncode}")
-            if e.stdout:
-                self.logger.error(f"stdout: {e.stdout}")
-            if e.stderr:
-                self.logger.error(f"stderr: {e.stderr}")
+        Output goes to the log file line by line as it streams; only its
+        last lines are kept, to report a failure.
+        """
+        run_cwd = self.project_root / cwd if cwd else self.project_root
+
+        # Set up environment - start with current environment and add custom env vars
+        run_env = os.environ.copy()
+        if env:
+            run_env.update(env)
+
+        # Straight to the shared logger: a worker's buffered logger would
+        # hold the whole output in memory until the linter finishes
+        result = run_streaming(
+            cmd,
+            lambda _stream, line: self._logger.output(tool_name, line, mirror=False),
+            cwd=run_cwd,
+            env=run_env,
+        )
+
+        if result.returncode != 0:
+            self.logger.error(f"{tool_name} failed with exit code {result.returncode}")
+            for line in result.tail:
+                self.logger.error(f"  {line}")
             return False
 
+        return True
+
     def _run_markdown_fix_command(self, cmd: list[str]) -> bool:
         """Run pymarkdown fix command and handle its special exit codes
 
@@ -425,13 +1054,58 @@ class LintManager:
             self.logger.error(f"pymarkdown fix failed with exception: {e}")
             return False
 
-    def _command_exists(self, command: str) -> bool:
-        """Check if a command exists"""
-        try:
-            subprocess.run(["which", command], check=True, capture_output=True)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+    def benchmark_overhead(self, runs: int = 5):
+        """Compare per-invocation startup of each linter via uv run and directly"""
+        self.logger.info(f"Timing '<tool> --version' ({runs} runs each)...")
+
+        table = Table(title="Lint tool invocation overhead (median)")
+        table.add_column("Tool")
+        table.add_column("uv run", justify="right")
+        table.add_column("Direct", justify="right")
+        table.add_column("Saved", justify="right")
+
+        for tool in ("ruff", "yamllint", "ansible-lint", "shellcheck", "shfmt"):
+            timings = self.tools.benchmark(tool, runs)
+            if not timings:
+                table.add_row(tool, "-", "-", "[dim]not installed[/dim]")
+                continue
+
+            uv_run = timings.get("uv run")
+            direct = timings["direct"]
+            table.add_row(
+                tool,
+                f"{uv_run * 1000:.0f}ms" if uv_run else "-",
+                f"{direct * 1000:.0f}ms",
+                f"{(uv_run - direct) * 1000:.0f}ms" if uv_run else "-",
+            )
+
+        self._logger.flush()
+        self.console.print(table)
+
+    def _print_findings(self, limit: int = 20):
+        """Print finding counts per file, files with the most errors first"""
+        if not self.findings:
+            return
+
+        summary = summarize(self.findings)
+        table = Table(title=f"Findings ({len(self.findings)} in {len(summary)} files)")
+        table.add_column("File")
+        table.add_column("Errors", justify="right", style="red")
+        table.add_column("Warnings", justify="right", style="yellow")
+        table.add_column("Notes", justify="right", style="dim")
+
+        for path, counts in list(summary.items())[:limit]:
+            table.add_row(
+                path,
+                str(counts["error"]),
+                str(counts["warning"]),
+                str(counts["note"]),
+            )
+        if len(summary) > limit:
+            table.add_row(f"[dim]... {len(summary) - limit} more files[/dim]")
+
+        self._logger.flush()
+        self.console.print(table)
 
     def _print_summary(self, results: dict[str, bool], overall_success: bool):
         """Print linting summary"""
@@ -515,7 +1189,46 @@ Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 @click.option("--verbose", "-v", is_flag=True, help="Enable verbose output")
 @click.option("--fix", "-f", is_flag=True, help="Try to auto-fix issues where possible")
 @click.option("--strict", is_flag=True, help="Use strict mode (exit on warnings)")
-def cli(target, verbose, fix, strict):
+@click.option(
+    "--jobs",
+    "-j",
+    type=int,
+    help="Linters to run at once (default: CPU count, 1 runs them serially)",
+)
+@click.option(
+    "--no-cache", is_flag=True, help="Lint every file, ignoring cached passes"
+)
+@click.option("--since", metavar="REF", help="Only lint files changed since a git ref")
+@click.option("--staged", is_flag=True, help="Only lint files staged for commit")
+@click.option(
+    "--sarif",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write merged findings as SARIF here (default: next to the log file)",
+)
+@click.option(
+    "--watch",
+    "-w",
+    is_flag=True,
+    help="Relint changed files whenever they are saved, until interrupted",
+)
+@click.option(
+    "--benchmark-overhead",
+    is_flag=True,
+    help="Time tool startup via 'uv run' versus direct execution, then exit",
+)
+def cli(
+    target,
+    verbose,
+    fix,
+    strict,
+    jobs,
+    no_cache,
+    since,
+    staged,
+    sarif,
+    watch,
+    benchmark_overhead,
+):
     """All Things Linux Infrastructure Linting
 
     Run comprehensive linting checks on Ansible infrastructure code
@@ -535,15 +1248,42 @@ def cli(target, verbose, fix, strict):
     logger.info(f"Verbose: {verbose}")
     logger.info(f"Auto-fix: {fix}")
     logger.info(f"Strict mode: {strict}")
+    logger.info(f"Jobs: {'1 (fix mode)' if fix else jobs or os.cpu_count()}")
 
     # Initialize lint manager
-    lint_manager = LintManager(project_root, logger)
+    lint_manager = LintManager(project_root, logger, use_cache=not no_cache)
+
+    if benchmark_overhead:
+        lint_manager.benchmark_overhead()
+        return
+
+    # Restrict to changed files
+    paths = None
+    if since and staged:
+        raise click.UsageError("--since and --staged cannot be combined")
+    if watch:
+        if fix or since or staged:
+            raise click.UsageError(
+                "--watch cannot be combined with --fix, --since or --staged"
+            )
+        lint_manager.check_prerequisites()
+        try:
+            lint_manager.watch(target, verbose, strict, jobs, sarif)
+        except KeyboardInterrupt:
+            logger.info("Stopped watching")
+        return
+    if since or staged:
+        paths = lint_manager.changed_files(since, staged)
+        if paths is None:
+            sys.exit(1)
 
     # Check prerequisites
     lint_manager.check_prerequisites()
 
     # Run targeted checks
-    overall_success = lint_manager.run_all_linters(target, verbose, fix, strict)
+    overall_success = lint_manager.run_all_linters(
+        target, verbose, fix, strict, jobs, paths, sarif
+    )
 
     # Final result
     if overall_success:
@@ -0,0 +1,201 @@
+"""Compressed log archives: one per tool per day, a byte budget and search"""
+
+import fcntl
+import gzip
+import os
+import re
+import shutil
+from collections.abc import Iterator
+from pathlib import Path
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    zstd = None
+
+# e.g. "deploy-20250704_052731.log"
+LOG_NAME = re.compile(r"^(?P<tool>[^-]+)-(?P<day>\d{8})_\d{6}\.log$")
+# Files written next to a run's log, archived along with it
+RUN_ARTIFACTS = (".trace.json", ".sarif")
+# A log or one of its run's files, e.g. "lint-20250704_052731.sarif"
+RUN_FILE_NAME = re.compile(
+    r"^(?P<tool>[^-]+)-(?P<day>\d{8})_\d{6}(?P<kind>\.log|\.trace\.json|\.sarif)$"
+)
+# e.g. "deploy-20250704.log.gz" or "deploy-20250704.trace.json.zst"
+ARCHIVE_NAME = re.compile(
+    r"^(?P<tool>[^-]+)-(?P<day>\d{8})(?P<kind>\.log|\.trace\.json|\.sarif)"
+    r"\.(?:gz|zst)$"
+)
+
+# Starts each log inside an archive, so matches can name the original file
+MEMBER_HEADER = "==> {name} <==\n"
+MEMBER_LINE = re.compile(r"^==> (?P<name>\S+) <==$")
+
+DECOMPRESS_ERRORS = (EOFError, OSError) + ((zstd.ZstdError,) if zstd else ())
+
+
+def open_log(path: Path, mode: str = "rt"):
+    """Open a plain, gzip or zstd log file (text modes replace bad bytes)"""
+    kwargs = {"errors": "replace"} if "t" in mode else {}
+    if path.suffix == ".gz":
+        return gzip.open(path, mode, **kwargs)
+    if path.suffix == ".zst":
+        if zstd is None:
+            raise OSError(f"{path.name}: reading zstd archives needs Python 3.14+")
+        return zstd.open(path, mode, **kwargs)
+    return open(path, mode, **kwargs)
+
+
+class LogArchive:
+    """Append completed logs to compressed per-tool, per-day archives
+
+    Each log becomes its own compressed member (gzip) or frame (zstd),
+    appended under a file lock, so archiving a log never rewrites the
+    archive. Reading an archive yields the logs back to back, each after a
+    ``==> name <==`` line. zstd is used when the standard library has it,
+    gzip otherwise; both kinds are read back. Deploy traces and SARIF files
+    go to archives of their own kind, so searches only read logs.
+    """
+
+    def __init__(self, archive_dir: Path):
+        self.archive_dir = archive_dir
+        self.suffix = ".zst" if zstd else ".gz"
+        self.damaged: list[Path] = []
+
+    def add(self, log_file: Path, name: str | None = None) -> Path:
+        """Append a log (or trace or SARIF file) to its tool's archive for the day
+
+        Args:
+            name: The file's name, if it has been renamed since
+
+        Returns:
+            Path: The archive it was added to
+
+        Raises:
+            ValueError: If the name is not a tool log or run file name
+        """
+        name = name or log_file.name
+        match = RUN_FILE_NAME.match(name)
+        if not match:
+            raise ValueError(f"Not a tool log: {name}")
+
+        path = self._archive_path(match["tool"], match["day"], match["kind"])
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        with open(path, "ab") as raw, open(log_file, "rb") as source:
+            fcntl.flock(raw, fcntl.LOCK_EX)
+            start = raw.seek(0, os.SEEK_END)
+            try:
+                with self._writer(raw) as out:
+                    out.write(MEMBER_HEADER.format(name=name).encode())
+                    shutil.copyfileobj(source, out, 1024 * 1024)
+            except BaseException:
+                # Drop the partial member, which would hide any added later
+                raw.truncate(start)
+                raise
+        return path
+
+    def archives(
+        self, tool: str | None = None, since: str | None = None, kind: str | None = None
+    ) -> list[tuple[Path, int]]:
+        """List archives oldest first, optionally for one tool or from a day
+
+        Args:
+            since: First day to include, as YYYYMMDD
+            kind: Only archives of this kind (".log", ".trace.json", ".sarif")
+
+        Returns:
+            list: (path, size in bytes) pairs
+        """
+        found = []
+        try:
+            entries = os.scandir(self.archive_dir)
+        except OSError:
+            return found
+
+        with entries:
+            for entry in entries:
+                match = ARCHIVE_NAME.match(entry.name)
+                if not match or (tool and match["tool"] != tool):
+                    continue
+                if (since and match["day"] < since) or (kind and match["kind"] != kind):
+                    continue
+                try:
+                    size = entry.stat().st_size
+                except OSError:
+                    continue
+                found.append((match["day"], entry.name, Path(entry.path), size))
+
+        return [(path, size) for _day, _name, path, size in sorted(found)]
+
+    def enforce_budget(self, max_bytes: int) -> int:
+        """Delete the oldest archives until they fit in max_bytes
+
+        Returns:
+            int: Number of archives removed
+        """
+        archives = self.archives()
+        total = sum(size for _path, size in archives)
+        removed = 0
+        for path, size in archives:
+            if total <= max_bytes:
+                break
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass
+            total -= size
+        return removed
+
+    def search(
+        self, pattern: re.Pattern, tool: str | None = None, since: str | None = None
+    ) -> Iterator[tuple[str, int, str]]:
+        """Stream matching lines out of the archives, oldest first
+
+        Archives are decompressed on the fly, never to disk. Archives that
+        cannot be read to the end (e.g. cut short by a crash) are searched
+        as far as possible and listed in ``damaged``.
+
+        Yields:
+            tuple: (original log name, line number in that log, line)
+        """
+        for path, _size in self.archives(tool, since, ".log"):
+            yield from search_file(path, pattern, self.damaged)
+
+    def _archive_path(self, tool: str, day: str, kind: str = ".log") -> Path:
+        """The day's archive, keeping whichever format it was started in"""
+        for suffix in (".zst", ".gz"):
+            path = self.archive_dir / f"{tool}-{day}{kind}{suffix}"
+            if path.exists():
+                return path
+        return self.archive_dir / f"{tool}-{day}{kind}{self.suffix}"
+
+    @staticmethod
+    def _writer(raw):
+        if raw.name.endswith(".zst"):
+            return zstd.ZstdFile(raw, "w")
+        return gzip.GzipFile(filename="", fileobj=raw, mode="wb", compresslevel=6)
+
+
+def search_file(
+    path: Path, pattern: re.Pattern, damaged: list[Path] | None = None
+) -> Iterator[tuple[str, int, str]]:
+    """Stream matching lines of a plain log or an archive
+
+    Yields:
+        tuple: (original log name, line number in that log, line)
+    """
+    name, number = path.name, 0
+    try:
+        with open_log(path) as f:
+            for line in f:
+                member = MEMBER_LINE.match(line)
+                if member:
+                    name, number = member["name"], 0
+                    continue
+                number += 1
+                if pattern.search(line):
+                    yield name, number, line.rstrip("\n")
+    except DECOMPRESS_ERRORS:
+        if damaged is not None:
+            damaged.append(path)
@@ -0,0 +1,157 @@
+"""Content-hash cache of lint results"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+
+from .journal import fingerprint
+from .tools import ToolResolver
+
+
+class LintCache:
+    """Remember which files passed which linter
+
+    A file's key combines its content hash with the tool name, the tool's
+    version, a hash of the tool's config files and the run flags that change
+    its verdict (e.g. strict mode), so editing the file, upgrading the tool,
+    changing its configuration or linting more strictly all invalidate the
+    cached pass. Tool versions are cached by binary path and mtime, so a
+    fully cached run never starts the tools at all.
+    """
+
+    def __init__(self, cache_dir: Path, tools: ToolResolver):
+        self.cache_dir = cache_dir
+        self.tools = tools
+        self.project_root = tools.project_root
+        self._versions_file = cache_dir / "versions.json"
+        self._lock = threading.Lock()
+
+    def tool_version(self, tool: str) -> str | None:
+        """Get a tool's version string, or None if the tool is not installed"""
+        binary = self.tools.resolve(tool)
+        if not binary:
+            return None
+
+        stamp = f"{binary}:{os.stat(binary).st_mtime_ns}"
+        with self._lock:
+            versions = self._load(self._versions_file)
+        if stamp in versions:
+            return versions[stamp]
+
+        try:
+            result = subprocess.run(
+                [binary, "--version"], capture_output=True, text=True, timeout=30
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        version = (result.stdout or result.stderr).strip()
+
+        with self._lock:
+            versions = self._load(self._versions_file)
+            versions[stamp] = version
+            self._save(self._versions_file, versions)
+        return version
+
+    def pending(
+        self,
+        tool: str,
+        files: list[Path],
+        configs: list[str],
+        binaries: list[str] | None = None,
+        flags: list[str] | None = None,
+    ) -> dict[Path, str | None]:
+        """Get the files without a cached pass for a tool, with their keys
+
+        The keys hash the content as it is now, before the tool runs, so a
+        file saved while it is being linted is not recorded as passing.
+
+        Args:
+            configs: Project-relative config files the results depend on
+            binaries: Executables whose versions the results depend on
+                (default: the tool name)
+            flags: Run options the results depend on, e.g. "strict=True"
+
+        Returns:
+            dict: The key to ``record`` for each pending file (None for files
+                that cannot be cached, e.g. when the tool is not installed)
+        """
+        context = self._context(tool, configs, binaries, flags)
+        if context is None:
+            return dict.fromkeys(files)
+
+        passed = self._load(self._tool_file(tool))
+        pending = {}
+        for path in files:
+            key = self._key(path, context)
+            if key is None or passed.get(self._relative(path)) != key:
+                pending[path] = key
+        return pending
+
+    def record(self, tool: str, keys: dict[Path, str | None]):
+        """Remember that files passed a tool, under the keys from ``pending``"""
+        keys = {path: key for path, key in keys.items() if key}
+        if not keys:
+            return
+
+        tool_file = self._tool_file(tool)
+        with self._lock:
+            passed = self._load(tool_file)
+            for path, key in keys.items():
+                passed[self._relative(path)] = key
+            self._save(tool_file, passed)
+
+    def clear(self):
+        """Drop all cached results"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _context(
+        self,
+        tool: str,
+        configs: list[str],
+        binaries: list[str] | None,
+        flags: list[str] | None = None,
+    ) -> str | None:
+        """Hash of everything besides file content that a result depends on"""
+        versions = [self.tool_version(binary) for binary in binaries or [tool]]
+        if None in versions:
+            return None
+        return fingerprint(
+            [self.project_root / config for config in configs],
+            tool,
+            *versions,
+            *sorted(flags or []),
+        )
+
+    def _key(self, path: Path, context: str) -> str | None:
+        try:
+            content = path.read_bytes()
+        except OSError:
+            return None
+        return hashlib.sha256(context.encode() + content).hexdigest()
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return str(path.relative_to(self.project_root))
+        except ValueError:
+            return str(path)
+
+    def _tool_file(self, tool: str) -> Path:
+        return self.cache_dir / f"{tool}.json"
+
+    @staticmethod
+    def _load(path: Path) -> dict:
+        try:
+            return json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save(self, path: Path, data: dict):
+        """Write a cache file atomically"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(data, sort_keys=True))
+        os.replace(tmp_path, path)
@@ -18,7 +18,7 @@ class ConfigManager:
         self.logger = logger
         self.console = Console()
 
-        self.domains_file = project_root / "domains.yml"
+        self.domains_file = project_root / "config" / "domains.yml"
         self._domains_config = None
 
     def check_prerequisites(self) -> bool:
@@ -94,6 +94,39 @@ class ConfigManager:
         config = self.load_domains_config()
         return config.get("domains", {}).get(domain_key)
 
+    def get_inventory_hosts(self, name: str) -> list[str]:
+        """Get the inventory hostnames for a domain or shared component
+
+        Mirrors the naming used by ``ansible/inventories/dynamic.py`` so that
+        hosts can be targeted with ``--limit`` without running the inventory.
+        """
+        config = self.load_domains_config()
+        item = config.get("domains", {}).get(name) or config.get(
+            "shared_infrastructure", {}
+        ).get(name)
+        if not item or not item.get("enabled", False) or item.get("external"):
+            return []
+
+        hosts = []
+        if "server" in item:
+            hostname = (
+                item.get("domain")
+                or (item.get("services") and item["services"][0])
+                or name
+            ).replace("_", "-")
+            count = item.get("server", {}).get("count", 1)
+            if count > 1:
+                hosts.extend(f"{hostname}-{i + 1}" for i in range(count))
+            else:
+                hosts.append(hostname)
+        elif "servers" in item:
+            for server in item.get("servers", []):
+                role = server.get("role")
+                if role:
+                    hosts.append(f"{name.replace('_', '-')}-{role}")
+
+        return hosts
+
     def toggle_domain(self, domain_name: str, enable: bool) -> bool:
         """Enable or disable a domain"""
         config = self.load_domains_config()
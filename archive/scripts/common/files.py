@@ -0,0 +1,109 @@
+"""Single-pass project file discovery shared by the linters"""
+
+import os
+import subprocess
+import threading
+from pathlib import Path
+
+# File types by suffix
+FILE_TYPES = {
+    ".py": "python",
+    ".yml": "yaml",
+    ".yaml": "yaml",
+    ".tf": "terraform",
+    ".tfvars": "terraform",
+    ".sh": "shell",
+    ".md": "markdown",
+}
+
+# Directories never descended into: tool state, virtualenvs, vendored content
+# (.ansible holds installed collections and roles)
+PRUNE_DIRS = {
+    ".git",
+    ".venv",
+    ".terraform",
+    ".ansible",
+    ".cache",
+    "node_modules",
+    "__pycache__",
+}
+
+
+class ProjectFiles:
+    """Walk the project once and classify its files by type
+
+    Uses ``git ls-files`` (tracked plus untracked, minus ignored) when the
+    project is a git checkout and falls back to an ``os.walk`` that prunes
+    ``PRUNE_DIRS`` before descending. The walk happens on first use and is
+    shared by every caller afterwards. Given explicit ``paths`` (such as the
+    files changed in git), those are classified instead of walking.
+    """
+
+    def __init__(self, project_root: Path, paths: list[Path] | None = None):
+        self.project_root = project_root
+        self._paths = paths
+        self._by_type: dict[str, list[Path]] | None = None
+        self._lock = threading.Lock()
+
+    def of_type(self, file_type: str, dirs: list[str] | None = None) -> list[Path]:
+        """Get files of a type, optionally only those under some directories"""
+        files = self._classified().get(file_type, [])
+        if dirs is None:
+            return files
+
+        roots = [self.project_root / directory for directory in dirs]
+        return [path for path in files if any(path.is_relative_to(r) for r in roots)]
+
+    def _classified(self) -> dict[str, list[Path]]:
+        with self._lock:
+            if self._by_type is None:
+                by_type: dict[str, list[Path]] = {}
+                if self._paths is not None:
+                    paths = [p for p in self._paths if not self._pruned(p)]
+                else:
+                    paths = self._git_files() or self._walk()
+
+                for path in sorted(paths):
+                    file_type = FILE_TYPES.get(path.suffix)
+                    if file_type:
+                        by_type.setdefault(file_type, []).append(path)
+                self._by_type = by_type
+            return self._by_type
+
+    def _git_files(self) -> list[Path] | None:
+        """List tracked and untracked, non-ignored files via git"""
+        try:
+            result = subprocess.run(
+                ["git", "ls-files", "--cached", "--others", "--exclude-standard", "-z"],
+                cwd=self.project_root,
+                capture_output=True,
+                text=True,
+            )
+        except FileNotFoundError:
+            return None
+        if result.returncode != 0:
+            return None
+
+        files = []
+        for name in result.stdout.split("\0"):
+            path = self.project_root / name
+            if not name or self._pruned(path):
+                continue
+            # Tracked files deleted in the working tree are still listed
+            if path.is_file():
+                files.append(path)
+        return files
+
+    def _pruned(self, path: Path) -> bool:
+        """Check whether a file lies in an excluded directory"""
+        return bool(
+            PRUNE_DIRS.intersection(path.relative_to(self.project_root).parts[:-1])
+        )
+
+    def _walk(self) -> list[Path]:
+        """List files with os.walk, pruning excluded directories"""
+        files = []
+        for dirpath, dirnames, filenames in os.walk(self.project_root):
+            dirnames[:] = [d for d in dirnames if d not in PRUNE_DIRS]
+            files.extend(Path(dirpath) / name for name in filenames)
+        return files
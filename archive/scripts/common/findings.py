@@ -0,0 +1,364 @@
+"""Structured lint findings, tool output parsers and SARIF export
+
+Each parser takes a tool's machine-readable output in pieces (lines or
+fixed-size reads) and yields findings as it goes, so output never has to be
+held in memory as a whole. Tools that only emit a single JSON document are
+decoded one array element (one finding) at a time.
+"""
+
+import json
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+
+@dataclass(frozen=True)
+class Finding:
+    """A single issue reported by a linter"""
+
+    tool: str
+    path: str
+    line: int
+    column: int
+    rule: str
+    level: str  # error, warning or note
+    message: str
+
+    def __str__(self) -> str:
+        location = f"{self.path}:{self.line}:{self.column}" if self.line else self.path
+        return f"{location}: {self.level} {self.rule}: {self.message}"
+
+
+def _lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Re-split output pieces into lines (without line endings)"""
+    rest = ""
+    for chunk in chunks:
+        *lines, rest = (rest + chunk).split("\n")
+        yield from lines
+    if rest:
+        yield rest
+
+
+class _JsonStream:
+    """Incremental reader of one JSON document arriving in pieces"""
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _more(self) -> bool:
+        """Append the next piece, dropping what has been consumed"""
+        for chunk in self._chunks:
+            if chunk:
+                self._buffer = self._buffer[self._pos :] + chunk
+                self._pos = 0
+                return True
+        self._eof = True
+        return False
+
+    def peek(self) -> str:
+        """The next non-whitespace character, or "" at the end"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos].isspace():
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._more():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """Consume one of the given characters"""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"expected one of {chars!r} in JSON, got {char!r}")
+        self._pos += 1
+        return char
+
+    def value(self):
+        """Decode the next complete value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A number at the end of the buffer may continue in the next piece
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._more()
+
+    def array(self) -> Iterator:
+        """Decode the elements of the array that starts next, one by one"""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(",]") == "]":
+                return
+
+
+def _json_items(chunks: Iterable[str], *keys: str) -> Iterator[tuple[str, object]]:
+    """Stream the elements of a JSON array document, or of top-level arrays
+
+    Without keys the document is an array and each element is yielded with
+    an empty key. With keys the document is an object, and the elements of
+    the arrays under those keys are yielded with their key; other values are
+    skipped. Only one element is held in memory at a time.
+    """
+    stream = _JsonStream(chunks)
+    if not stream.peek():
+        return
+    if not keys:
+        for item in stream.array():
+            yield "", item
+        return
+
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        if key in keys and stream.peek() == "[":
+            for item in stream.array():
+                yield key, item
+        else:
+            stream.value()
+        if stream.expect(",}") == "}":
+            return
+
+
+def _level(severity: str) -> str:
+    """Map a tool severity onto a SARIF level"""
+    severity = severity.lower()
+    if severity in ("error", "fatal", "critical", "blocker", "major"):
+        return "error"
+    if severity in ("warning", "minor"):
+        return "warning"
+    return "note"
+
+
+def parse_ruff(output: Iterable[str]) -> Iterator[Finding]:
+    """Parse ``ruff check --output-format json-lines``"""
+    for line in _lines(output):
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        location = item.get("location") or {}
+        yield Finding(
+            "ruff",
+            item["filename"],
+            location.get("row", 0),
+            location.get("column", 0),
+            item.get("code") or "syntax-error",
+            "error",
+            item["message"],
+        )
+
+
+YAMLLINT_LINE = re.compile(
+    r"^(?P<path>.+?):(?P<line>\d+):(?P<column>\d+): \[(?P<level>\w+)\] "
+    r"(?P<message>.*?)(?: \((?P<rule>[\w-]+)\))?$"
+)
+
+
+def parse_yamllint(output: Iterable[str]) -> Iterator[Finding]:
+    """Parse ``yamllint -f parsable``"""
+    for line in _lines(output):
+        match = YAMLLINT_LINE.match(line)
+        if match:
+            yield Finding(
+                "yamllint",
+                match["path"],
+                int(match["line"]),
+                int(match["column"]),
+                match["rule"] or "syntax",
+                _level(match["level"]),
+                match["message"],
+            )
+
+
+def parse_ansible_lint(output: Iterable[str]) -> Iterator[Finding]:
+    """Parse ``ansible-lint -f codeclimate`` (one JSON array)"""
+    for _key, item in _json_items(output):
+        location = item.get("location", {})
+        if "positions" in location:
+            begin = location["positions"].get("begin", {})
+            line, column = begin.get("line", 0), begin.get("column", 0)
+        else:
+            line, column = location.get("lines", {}).get("begin", 0), 0
+        yield Finding(
+            "ansible-lint",
+            location.get("path", ""),
+            line,
+            column,
+            item.get("check_name", ""),
+            _level(item.get("severity", "major")),
+            item.get("description", ""),
+        )
+
+
+def parse_shellcheck(output: Iterable[str]) -> Iterator[Finding]:
+    """Parse ``shellcheck -f json1`` (one JSON object)"""
+    for _key, comment in _json_items(output, "comments"):
+        yield Finding(
+            "shellcheck",
+            comment["file"],
+            comment["line"],
+            comment["column"],
+            f"SC{comment['code']}",
+            _level(comment["level"]),
+            comment["message"],
+        )
+
+
+def parse_shfmt(output: Iterable[str]) -> Iterator[Finding]:
+    """Parse ``shfmt -l`` (one unformatted file per line)"""
+    for line in _lines(output):
+        if line.strip():
+            yield Finding(
+                "shfmt", line.strip(), 0, 0, "format", "error", "not formatted"
+            )
+
+
+def parse_terraform_fmt(output: Iterable[str]) -> Iterator[Finding]:
+    """Parse ``terraform fmt -check -list=true`` (one file per line)"""
+    for line in _lines(output):
+        if line.strip():
+            yield Finding(
+                "terraform", line.strip(), 0, 0, "fmt", "error", "not formatted"
+            )
+
+
+def parse_terraform_validate(output: Iterable[str]) -> Iterator[Finding]:
+    """Parse ``terraform validate -json`` (one JSON object)"""
+    for _key, diagnostic in _json_items(output, "diagnostics"):
+        start = diagnostic.get("range", {}).get("start", {})
+        message = diagnostic.get("summary", "")
+        if diagnostic.get("detail"):
+            message = f"{message}: {diagnostic['detail']}"
+        yield Finding(
+            "terraform",
+            diagnostic.get("range", {}).get("filename", ""),
+            start.get("line", 0),
+            start.get("column", 0),
+            "validate",
+            _level(diagnostic.get("severity", "error")),
+            message,
+        )
+
+
+def parse_tflint(output: Iterable[str]) -> Iterator[Finding]:
+    """Parse ``tflint --format json`` (one JSON object)"""
+    for key, item in _json_items(output, "issues", "errors"):
+        if key == "issues":
+            rng = item.get("range", {})
+            yield Finding(
+                "tflint",
+                rng.get("filename", ""),
+                rng.get("start", {}).get("line", 0),
+                rng.get("start", {}).get("column", 0),
+                item.get("rule", {}).get("name", ""),
+                _level(item.get("rule", {}).get("severity", "warning")),
+                item.get("message", ""),
+            )
+        else:
+            rng = item.get("range") or {}
+            yield Finding(
+                "tflint",
+                rng.get("filename", ""),
+                rng.get("start", {}).get("line", 0),
+                rng.get("start", {}).get("column", 0),
+                "error",
+                "error",
+                item.get("message", ""),
+            )
+
+
+PYMARKDOWN_LINE = re.compile(
+    r"^(?P<path>.+?):(?P<line>\d+):(?P<column>\d+): (?P<rule>MD\d+): (?P<message>.*)$"
+)
+
+
+def parse_pymarkdown(output: Iterable[str]) -> Iterator[Finding]:
+    """Parse ``pymarkdown scan`` output"""
+    for line in _lines(output):
+        match = PYMARKDOWN_LINE.match(line)
+        if match:
+            yield Finding(
+                "pymarkdown",
+                match["path"],
+                int(match["line"]),
+                int(match["column"]),
+                match["rule"],
+                "warning",
+                match["message"],
+            )
+
+
+def summarize(findings: Iterable[Finding]) -> dict[str, dict[str, int]]:
+    """Count findings per file and level, files with the most errors first"""
+    summary: dict[str, dict[str, int]] = {}
+    for finding in findings:
+        counts = summary.setdefault(finding.path, {"error": 0, "warning": 0, "note": 0})
+        counts[finding.level] += 1
+    return dict(
+        sorted(
+            summary.items(),
+            key=lambda item: (-item[1]["error"], -item[1]["warning"], item[0]),
+        )
+    )
+
+
+def write_sarif(findings: Iterable[Finding], path: Path) -> Path:
+    """Write findings as one SARIF 2.1.0 log with a run per tool"""
+    by_tool: dict[str, list[Finding]] = {}
+    for finding in findings:
+        by_tool.setdefault(finding.tool, []).append(finding)
+
+    runs = []
+    for tool, tool_findings in sorted(by_tool.items()):
+        results = []
+        for finding in tool_findings:
+            location: dict = {"artifactLocation": {"uri": finding.path}}
+            if finding.line > 0:
+                location["region"] = {"startLine": finding.line}
+                if finding.column > 0:
+                    location["region"]["startColumn"] = finding.column
+            results.append(
+                {
+                    "ruleId": finding.rule,
+                    "level": finding.level,
+                    "message": {"text": finding.message},
+                    "locations": [{"physicalLocation": location}],
+                }
+            )
+
+        rules = sorted({finding.rule for finding in tool_findings})
+        runs.append(
+            {
+                "tool": {
+                    "driver": {
+                        "name": tool,
+                        "rules": [{"id": rule} for rule in rules],
+                    }
+                },
+                "results": results,
+            }
+        )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"version": "2.1.0", "$schema": SARIF_SCHEMA, "runs": runs}, f)
+    return path
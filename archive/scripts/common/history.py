@@ -0,0 +1,236 @@
+"""Deploy history database with duration regression detection"""
+
+import sqlite3
+import statistics
+from collections import defaultdict
+from contextlib import closing
+from pathlib import Path
+
+from .tracing import Tracer
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    command TEXT NOT NULL,
+    environment TEXT NOT NULL,
+    started REAL NOT NULL,
+    duration REAL NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    domain TEXT,
+    host TEXT,
+    task TEXT,
+    started REAL NOT NULL,
+    duration REAL NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_lookup ON runs (command, environment, id);
+CREATE INDEX IF NOT EXISTS timings_run ON timings (run_id);
+"""
+
+# Column each report grouping keys on, and whether it reads task rows
+GROUPS = {
+    "phase": ("phase", False),
+    "domain": ("domain", True),
+    "host": ("host", True),
+    "task": ("task", True),
+}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Linear-interpolated percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class DeployHistory:
+    """Structured timings of every plan/apply run in a local SQLite database
+
+    Each run stores its phase spans (Terraform steps, playbooks, gates) and
+    the per-host task spans collected by the ``atl_trace`` callback. Task rows
+    are attributed to the innermost phase they ran in and to the domain of
+    their host.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating the schema on first use"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.db_path)
+        connection.execute("PRAGMA foreign_keys = ON")
+        connection.executescript(SCHEMA)
+        return connection
+
+    def record(
+        self,
+        command: str,
+        environment: str,
+        tracer: Tracer,
+        started: float,
+        finished: float,
+        success: bool,
+        domains: dict[str, str] | None = None,
+    ) -> int:
+        """Store a finished run and its spans
+
+        Args:
+            domains: Domain name keyed by inventory host
+
+        Returns:
+            int: The new run id
+        """
+        domains = domains or {}
+        phases = [span for span in tracer.spans if span["cat"] != "task"]
+
+        rows = []
+        for span in tracer.spans:
+            args = span["args"]
+            host = args.get("host")
+            is_task = span["cat"] == "task"
+            rows.append(
+                (
+                    span["cat"],
+                    self._enclosing_phase(span, phases) if is_task else span["name"],
+                    domains.get(host) if host else args.get("domain"),
+                    host,
+                    span["name"] if is_task else None,
+                    span["ts"] / 1_000_000,
+                    span["dur"] / 1_000_000,
+                    args.get("status", "ok"),
+                )
+            )
+
+        with closing(self._connect()) as connection, connection:
+            cursor = connection.execute(
+                "INSERT INTO runs (command, environment, started, duration, status) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    command,
+                    environment,
+                    started,
+                    finished - started,
+                    "success" if success else "failed",
+                ),
+            )
+            run_id = cursor.lastrowid
+            connection.executemany(
+                "INSERT INTO timings (run_id, category, phase, domain, host, task, "
+                "started, duration, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, *row) for row in rows],
+            )
+
+        return run_id
+
+    @staticmethod
+    def _enclosing_phase(task: dict, phases: list[dict]) -> str:
+        """Find the innermost phase span a task span ran inside"""
+        end = task["ts"] + task["dur"]
+        inside = [
+            span
+            for span in phases
+            if span["ts"] <= task["ts"] and end <= span["ts"] + span["dur"]
+        ]
+        if not inside:
+            return "unknown"
+        return min(inside, key=lambda span: span["dur"])["name"]
+
+    def runs(self, command: str, environment: str, limit: int = 20) -> list[dict]:
+        """Get the most recent runs, newest first"""
+        with closing(self._connect()) as connection:
+            connection.row_factory = sqlite3.Row
+            rows = connection.execute(
+                "SELECT * FROM runs WHERE command = ? AND environment = ? "
+                "ORDER BY id DESC LIMIT ?",
+                (command, environment, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def durations(
+        self, command: str, environment: str, group: str = "phase", runs: int = 30
+    ) -> dict[str, list[tuple[int, float]]]:
+        """Get per-run durations for each phase, domain, host or task
+
+        Durations of the same key within one run are summed, so a phase that
+        runs per batch or a task that runs per host reports its total time.
+
+        Returns:
+            dict: ``(run_id, seconds)`` pairs keyed by name, oldest run first
+        """
+        column, tasks = GROUPS[group]
+        category = "= 'task'" if tasks else "!= 'task'"
+
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                f"SELECT t.run_id, t.{column}, SUM(t.duration) FROM timings t "
+                "JOIN (SELECT id FROM runs WHERE command = ? AND environment = ? "
+                "ORDER BY id DESC LIMIT ?) r ON r.id = t.run_id "
+                f"WHERE t.category {category} AND t.{column} IS NOT NULL "
+                f"GROUP BY t.run_id, t.{column} ORDER BY t.run_id",
+                (command, environment, runs),
+            ).fetchall()
+
+        durations: dict[str, list[tuple[int, float]]] = defaultdict(list)
+        for run_id, key, seconds in rows:
+            durations[key].append((run_id, seconds))
+        return dict(durations)
+
+    def regressions(
+        self,
+        command: str,
+        environment: str,
+        group: str = "phase",
+        window: int = 20,
+        threshold: float = 2.0,
+        min_samples: int = 5,
+    ) -> list[dict]:
+        """Find keys of the latest run that took longer than mean + threshold σ
+
+        The baseline for each key is its duration in the trailing ``window``
+        runs before the latest one. A key whose baseline never varied is
+        flagged when it got slower at all, with a ``sigma`` of None.
+        """
+        latest = self.runs(command, environment, limit=1)
+        if not latest:
+            return []
+        run_id = latest[0]["id"]
+
+        flagged = []
+        for key, samples in self.durations(
+            command, environment, group, window + 1
+        ).items():
+            if samples[-1][0] != run_id:
+                continue
+
+            seconds = samples[-1][1]
+            baseline = [duration for _, duration in samples[:-1]]
+            if len(baseline) < min_samples:
+                continue
+
+            mean = statistics.fmean(baseline)
+            stdev = statistics.stdev(baseline)
+            if seconds > mean + threshold * stdev and seconds > mean:
+                flagged.append(
+                    {
+                        "name": key,
+                        "seconds": seconds,
+                        "mean": mean,
+                        "stdev": stdev,
+                        # None when the baseline never varied
+                        "sigma": (seconds - mean) / stdev if stdev else None,
+                    }
+                )
+
+        return sorted(
+            flagged,
+            key=lambda item: (item["sigma"] is None, item["sigma"] or 0),
+            reverse=True,
+        )
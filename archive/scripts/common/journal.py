@@ -0,0 +1,111 @@
+"""Run journal for checkpointed, resumable deployments"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+
+def fingerprint(paths: list[Path], *extra: str) -> str:
+    """Hash the contents of files (in sorted order) plus extra strings"""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(str(path).encode())
+        try:
+            digest.update(path.read_bytes())
+        except OSError:
+            digest.update(b"<missing>")
+    for value in extra:
+        digest.update(value.encode())
+    return digest.hexdigest()
+
+
+class RunJournal:
+    """Record completed phases, domains and hosts of a deployment run
+
+    The journal is rewritten after every checkpoint, so an interrupted or
+    failed run leaves behind exactly what it finished. A later run started
+    with the same arguments and ``resume=True`` picks up from there.
+    """
+
+    def __init__(self, state_dir: Path, name: str):
+        self.path = state_dir / f"{name}.json"
+        self.data: dict = {}
+
+    def start(self, args: dict, resume: bool = False) -> bool:
+        """Begin a run, resuming the previous one when possible
+
+        Returns:
+            bool: True if an unfinished run with the same arguments was resumed
+        """
+        if resume and self.path.exists():
+            try:
+                previous = json.loads(self.path.read_text())
+            except (OSError, json.JSONDecodeError):
+                previous = {}
+
+            if previous.get("args") == args and previous.get("status") != "completed":
+                self.data = previous
+                self.data["status"] = "running"
+                self.data["resumed"] = datetime.now().isoformat()
+                self._save()
+                return True
+
+        self.data = {
+            "args": args,
+            "status": "running",
+            "started": datetime.now().isoformat(),
+            "phases": {},
+            "hosts": {},
+            "domains": {},
+        }
+        self._save()
+        return False
+
+    def phase_done(self, phase: str, fingerprint: str | None = None) -> bool:
+        """Check whether a phase completed (with the same inputs)"""
+        entry = self.data.get("phases", {}).get(phase)
+        return bool(entry) and entry.get("fingerprint") == fingerprint
+
+    def complete_phase(self, phase: str, fingerprint: str | None = None):
+        """Checkpoint a completed phase"""
+        self.data["phases"][phase] = {
+            "fingerprint": fingerprint,
+            "finished": datetime.now().isoformat(),
+        }
+        self._save()
+
+    def hosts_done(self, phase: str) -> list[str]:
+        """Get the hosts that completed a phase"""
+        return self.data.get("hosts", {}).get(phase, [])
+
+    def complete_hosts(self, phase: str, hosts: list[str]):
+        """Checkpoint hosts that completed a phase"""
+        done = self.data["hosts"].setdefault(phase, [])
+        done.extend(host for host in hosts if host not in done)
+        self._save()
+
+    def domains_done(self, phase: str) -> list[str]:
+        """Get the domains whose hosts all completed a phase"""
+        return self.data.get("domains", {}).get(phase, [])
+
+    def complete_domain(self, phase: str, domain: str):
+        """Checkpoint a domain that completed a phase"""
+        done = self.data["domains"].setdefault(phase, [])
+        if domain not in done:
+            done.append(domain)
+            self._save()
+
+    def finish(self, success: bool):
+        """Mark the run as completed or failed"""
+        self.data["status"] = "completed" if success else "failed"
+        self.data["finished"] = datetime.now().isoformat()
+        self._save()
+
+    def _save(self):
+        """Write the journal atomically"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.data, indent=2))
+        os.replace(tmp_path, self.path)
@@ -1,8 +1,16 @@
 """Logging utilities for infrastructure scripts"""
 
+import atexit
+import json
 import logging
+import os
+import queue
 import re
-from datetime import datetime, timedelta
+import threading
+import time
+from datetime import datetime
+from fnmatch import fnmatch
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 from rich.console import Console
@@ -10,80 +18,319 @@ from rich.logging import RichHandler
 from rich.panel import Panel
 from rich.text import Text
 
+from .archive import LOG_NAME, RUN_ARTIFACTS, RUN_FILE_NAME, LogArchive
+
+# Default size budget of the compressed log archives
+DEFAULT_ARCHIVE_MB = 256
+
+# A file claimed for archiving, with the claiming process's PID
+# e.g. ".deploy-20250704_052731.log.4127.archiving"
+CLAIM_NAME = re.compile(r"^\.(?P<name>.+?)(?:\.(?P<pid>\d+))?\.archiving$")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # Exists, owned by someone else
+    return True
+
 
 class LogCleaner:
-    """Handles cleanup of old log files"""
+    """Handles rotation of old log files
+
+    Logs beyond the per-tool limit or age are moved into compressed daily
+    archives under ``logs/archive`` (see ``LogArchive``) rather than
+    deleted, together with the trace and SARIF files written next to them;
+    the archives are pruned oldest first to fit a byte budget.
+
+    A full pass lists the directory once, stats each file once and records
+    the remaining logs of each tool in a manifest. Between full passes (at
+    most one per ``CLEANUP_INTERVAL``, tracked by a marker file) new loggers
+    only enforce their own tool's limits from the manifest, so startup cost
+    does not grow with the size of the log directory.
+    """
+
+    LOG_NAME = LOG_NAME
+    # Log reports, only removed once expired
+    REPORT_PATTERNS = ("*-report-*.txt",)
+    CLEANUP_INTERVAL = 3600
 
     def __init__(self, log_dir: Path):
         self.log_dir = log_dir
+        self.manifest_file = log_dir / ".manifest.json"
+        self.marker_file = log_dir / ".last-cleanup"
+        self.archive = LogArchive(log_dir / "archive")
+
+    def scan(
+        self,
+    ) -> tuple[dict[str, list[tuple[float, str]]], list[tuple[float, str]]]:
+        """List log files with a single stat each
+
+        Logs left claimed by an archiving process that has since died are
+        renamed back, so the pass archives them again.
 
-    def cleanup_logs(self, max_files_per_type: int = 10, max_age_days: int = 30):
-        """Clean up old log files
+        Returns:
+            tuple: ({tool: [(mtime, name), ...] newest first}, [(mtime, name)]
+                of the reports, traces and SARIF files)
+        """
+        groups: dict[str, list[tuple[float, str]]] = {}
+        others: list[tuple[float, str]] = []
+        try:
+            entries = os.scandir(self.log_dir)
+        except OSError:
+            return groups, others
+
+        with entries:
+            for entry in entries:
+                name = entry.name
+                claim = CLAIM_NAME.match(name)
+                if claim and not (claim["pid"] and _pid_alive(int(claim["pid"]))):
+                    name = claim["name"]
+                match = self.LOG_NAME.match(name)
+                if (
+                    not match
+                    and not RUN_FILE_NAME.match(name)
+                    and not any(
+                        fnmatch(name, pattern) for pattern in self.REPORT_PATTERNS
+                    )
+                ):
+                    continue
+                try:
+                    mtime = entry.stat().st_mtime
+                except OSError:
+                    continue
+                if name != entry.name:
+                    # Claimed by a process that died while archiving it: put
+                    # the log back so it is archived again
+                    try:
+                        os.rename(entry.path, self.log_dir / name)
+                    except OSError:
+                        continue
+                if match:
+                    groups.setdefault(match.group(1), []).append((mtime, name))
+                else:
+                    others.append((mtime, name))
+
+        for files in groups.values():
+            files.sort(reverse=True)
+        return groups, others
+
+    @staticmethod
+    def expired(
+        files: list[tuple[float, str]], max_files: int | None, max_age_days: int
+    ) -> list[str]:
+        """Names beyond the newest max_files (if given) or older than max_age_days
+
+        Args:
+            files: (mtime, name) pairs, newest first
+        """
+        cutoff = time.time() - max_age_days * 86400
+        return [
+            name
+            for index, (mtime, name) in enumerate(files)
+            if (max_files is not None and index >= max_files) or mtime < cutoff
+        ]
+
+    def cleanup_logs(
+        self,
+        max_files_per_type: int = 10,
+        max_age_days: int = 30,
+        max_archive_mb: int = DEFAULT_ARCHIVE_MB,
+    ):
+        """Archive old log files and prune the archives
 
         Args:
             max_files_per_type: Maximum number of log files to keep per tool type
             max_age_days: Maximum age of log files in days
+            max_archive_mb: Size budget of the log archives
 
         Returns:
-            int: Number of files removed
+            int: Number of files archived or removed
         """
         if not self.log_dir.exists():
             return 0
 
-        # Group log files by type (tool name)
-        log_groups = {}
-        cutoff_date = datetime.now() - timedelta(days=max_age_days)
-
-        for log_file in self.log_dir.glob("*.log"):
-            # Extract tool name from filename (e.g., "deploy-20250704_052731.log" -> "deploy")
-            match = re.match(r"^([^-]+)-\d{8}_\d{6}\.log$", log_file.name)
-            if match:
-                tool_name = match.group(1)
-                if tool_name not in log_groups:
-                    log_groups[tool_name] = []
-                log_groups[tool_name].append(log_file)
+        self.marker_file.touch()
+        groups, others = self.scan()
 
         files_removed = 0
+        manifest = {}
+        for tool_name, log_files in groups.items():
+            expired = self.expired(log_files, max_files_per_type, max_age_days)
+            files_removed += self._archive(self._with_artifacts(expired))
+            manifest[tool_name] = [
+                [mtime, name] for mtime, name in log_files if name not in expired
+            ]
+
+        # Expired reports are removed; traces and SARIF files that outlived
+        # their log are archived like it
+        expired = self.expired(others, None, max_age_days)
+        files_removed += self._archive([n for n in expired if RUN_FILE_NAME.match(n)])
+        files_removed += self._remove(
+            [n for n in expired if not RUN_FILE_NAME.match(n)]
+        )
 
-        # Clean up each tool's logs
-        for _tool_name, log_files in log_groups.items():
-            # Sort by modification time (newest first)
-            log_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
+        self.archive.enforce_budget(max_archive_mb * 1024 * 1024)
+        self._save_manifest(manifest)
+        return files_removed
 
-            # Remove files beyond the limit
-            if len(log_files) > max_files_per_type:
-                for log_file in log_files[max_files_per_type:]:
-                    try:
-                        log_file.unlink()
-                        files_removed += 1
-                    except OSError:
-                        pass  # File might be in use or already deleted
+    def rotate(
+        self,
+        log_file: Path,
+        max_files_per_type: int = 10,
+        max_age_days: int = 30,
+        max_archive_mb: int = DEFAULT_ARCHIVE_MB,
+    ) -> int:
+        """Make room for a new log file and record it in the manifest
 
-            # Remove old files
-            for log_file in log_files[:max_files_per_type]:  # Only check recent files
-                try:
-                    file_time = datetime.fromtimestamp(log_file.stat().st_mtime)
-                    if file_time < cutoff_date:
-                        log_file.unlink()
-                        files_removed += 1
-                except OSError:
-                    pass
+        Runs a full cleanup when the last one is older than CLEANUP_INTERVAL,
+        otherwise only prunes the new file's tool using the manifest.
 
-        # Also clean up any orphaned log report files
-        for report_file in self.log_dir.glob("*-report-*.txt"):
+        Returns:
+            int: Number of files archived or removed
+        """
+        match = self.LOG_NAME.match(log_file.name)
+        try:
+            due = (
+                time.time() - self.marker_file.stat().st_mtime >= self.CLEANUP_INTERVAL
+            )
+        except OSError:
+            due = True
+
+        files_removed = (
+            self.cleanup_logs(max_files_per_type, max_age_days, max_archive_mb)
+            if due
+            else 0
+        )
+        if not match:
+            return files_removed
+
+        manifest = self._load_manifest()
+        log_files = [(mtime, name) for mtime, name in manifest.get(match.group(1), [])]
+        if not due:
+            expired = self.expired(log_files, max_files_per_type, max_age_days)
+            files_removed += self._archive(self._with_artifacts(expired))
+            log_files = [item for item in log_files if item[1] not in expired]
+
+        manifest[match.group(1)] = [[time.time(), log_file.name]] + [
+            [mtime, name] for mtime, name in log_files
+        ]
+        self._save_manifest(manifest)
+        return files_removed
+
+    @staticmethod
+    def _with_artifacts(names: list[str]) -> list[str]:
+        """Add the names of the trace and SARIF files each log's run may have"""
+        return names + [
+            name.removesuffix(".log") + suffix
+            for name in names
+            for suffix in RUN_ARTIFACTS
+        ]
+
+    def _archive(self, names: list[str]) -> int:
+        """Move logs (and their runs' files) into the archives, skipping missing ones
+
+        Each log is first renamed to claim it, so concurrent cleanups never
+        archive the same log twice. A log that cannot be archived is kept,
+        and one left claimed by a crash is put back by the next full pass.
+        """
+        archived = 0
+        for name in sorted(names):  # Oldest first, by the timestamp in the name
+            log_file = self.log_dir / name
+            claimed = self.log_dir / f".{name}.{os.getpid()}.archiving"
             try:
-                file_time = datetime.fromtimestamp(report_file.stat().st_mtime)
-                if file_time < cutoff_date:
-                    report_file.unlink()
-                    files_removed += 1
+                os.rename(log_file, claimed)
             except OSError:
-                pass
+                continue  # Claimed by another process, or already gone
+            try:
+                self.archive.add(claimed, name)
+            except OSError:
+                os.replace(claimed, log_file)
+                continue
+            claimed.unlink()
+            archived += 1
+        return archived
+
+    def _remove(self, names: list[str]) -> int:
+        removed = 0
+        for name in names:
+            try:
+                (self.log_dir / name).unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass  # Already removed, e.g. by another process
+            except OSError:
+                pass  # File might be in use
+        return removed
 
-        return files_removed
+    def _load_manifest(self) -> dict[str, list[list]]:
+        try:
+            return json.loads(self.manifest_file.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save_manifest(self, manifest: dict[str, list[list]]):
+        """Write the manifest atomically"""
+        tmp_path = self.manifest_file.with_name(f".manifest.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(manifest))
+            os.replace(tmp_path, self.manifest_file)
+        except OSError:
+            pass  # Rebuilt by the next full cleanup
+
+
+# The queue listener of each logger name. Creating another InfraLogger with
+# the same name replaces its handlers instead of stacking more of them.
+_listeners: dict[str, QueueListener] = {}
+_listeners_lock = threading.Lock()
+
+
+@atexit.register
+def _stop_listeners():
+    """Drain every queue before the interpreter exits"""
+    with _listeners_lock:
+        for listener in _listeners.values():
+            listener.stop()
+        _listeners.clear()
+
+
+# Records waiting for the listener; logging blocks once this many are queued,
+# so a command printing faster than the terminal renders cannot grow memory
+LOG_QUEUE_SIZE = 10_000
+
+
+class _BlockingQueueHandler(QueueHandler):
+    """Queue handler that waits for room in a bounded queue"""
+
+    def enqueue(self, record: logging.LogRecord):
+        self.queue.put(record)
+
+
+class _ConsoleHandler(RichHandler):
+    """Rich console handler that also renders success messages and raw output"""
+
+    def emit(self, record: logging.LogRecord):
+        output = getattr(record, "output", None)
+        if output is not None:
+            self.console.out(output, highlight=False)
+            return
+        success = getattr(record, "success", None)
+        if success is not None:
+            self.console.print(f"✅ {success}", style="green")
+        super().emit(record)
 
 
 class InfraLogger:
-    """Logger for infrastructure operations with rich output"""
+    """Logger for infrastructure operations with rich output
+
+    Log calls only put records on a queue; a listener thread writes them to
+    the log file and renders them on the console, so callers never block on
+    file I/O or terminal rendering. Output printed straight to the console
+    should call ``flush()`` first to keep it in order with queued records.
+    """
 
     def __init__(
         self, name: str, log_dir: Path | None = None, auto_cleanup: bool = True
@@ -99,15 +346,15 @@ class InfraLogger:
 
         self.log_dir.mkdir(exist_ok=True)
 
-        # Auto-cleanup old logs
-        if auto_cleanup:
-            cleaner = LogCleaner(self.log_dir)
-            cleaner.cleanup_logs(max_files_per_type=5, max_age_days=7)
-
         # Create log file
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.log_file = self.log_dir / f"{name}-{timestamp}.log"
 
+        # Auto-cleanup old logs (a full pass at most once per interval)
+        if auto_cleanup:
+            cleaner = LogCleaner(self.log_dir)
+            cleaner.rotate(self.log_file, max_files_per_type=5, max_age_days=7)
+
         # Setup logger
         self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.DEBUG)
@@ -121,14 +368,33 @@ class InfraLogger:
         file_handler.setFormatter(file_formatter)
 
         # Rich console handler
-        console_handler = RichHandler(
+        console_handler = _ConsoleHandler(
             console=self.console, show_time=True, show_path=False, rich_tracebacks=True
         )
         console_handler.setLevel(logging.INFO)
 
-        # Add handlers
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # Both handlers run on the listener thread, behind a queue
+        log_queue: queue.Queue = queue.Queue(LOG_QUEUE_SIZE)
+        listener = QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        with _listeners_lock:
+            previous = _listeners.pop(name, None)
+            if previous:
+                previous.stop()
+                for handler in previous.handlers:
+                    handler.close()
+            for handler in list(self.logger.handlers):
+                self.logger.removeHandler(handler)
+            self.logger.addHandler(_BlockingQueueHandler(log_queue))
+            listener.start()
+            _listeners[name] = listener
+
+    def flush(self):
+        """Wait until every queued record has been written and rendered"""
+        for handler in self.logger.handlers:
+            if isinstance(handler, QueueHandler):
+                handler.queue.join()
 
     def info(self, message: str):
         """Log info message"""
@@ -148,11 +414,23 @@ class InfraLogger:
 
     def success(self, message: str):
         """Log success message with green styling"""
-        self.console.print(f"✅ {message}", style="green")
-        self.logger.info(f"SUCCESS: {message}")
+        self.logger.info(f"SUCCESS: {message}", extra={"success": message})
+
+    def output(self, source: str, line: str, mirror: bool = True):
+        """Log a line of command output, mirrored to the console as-is
+
+        Args:
+            mirror: Also print it on the console (otherwise only the log
+                file gets it)
+        """
+        if mirror:
+            self.logger.info(f"{source} | {line}", extra={"output": line})
+        else:
+            self.logger.debug(f"{source} | {line}")
 
     def banner(self, title: str, subtitle: str = ""):
         """Display a banner"""
+        self.flush()
         if subtitle:
             text = Text(f"{title}\n{subtitle}", justify="center")
         else:
@@ -168,10 +446,12 @@ class InfraLogger:
 
     def table_start(self, title: str):
         """Start a table output"""
+        self.flush()
         self.console.print(f"\n[bold blue]{title}[/bold blue]")
 
     def table_row(self, key: str, value: str, status: str = "enabled"):
         """Print a table row"""
+        self.flush()
         if status == "enabled":
             self.console.print(f"  [green]•[/green] {key} -> {value}")
         else:
@@ -182,10 +462,39 @@ class InfraLogger:
         log_dir: Path | None = None,
         max_files_per_type: int = 5,
         max_age_days: int = 7,
+        max_archive_mb: int = DEFAULT_ARCHIVE_MB,
     ):
         """Manually clean up log files"""
         if log_dir is None:
             log_dir = Path.cwd() / "logs"
 
         cleaner = LogCleaner(log_dir)
-        return cleaner.cleanup_logs(max_files_per_type, max_age_days)
+        return cleaner.cleanup_logs(max_files_per_type, max_age_days, max_archive_mb)
+
+
+class BufferedLogger:
+    """Records calls to an InfraLogger so they can be replayed later
+
+    Used to keep the output of tasks that run concurrently from interleaving:
+    each task logs into its own buffer and the buffers are replayed in a
+    fixed order.
+    """
+
+    def __init__(self, logger: InfraLogger):
+        self._logger = logger
+        self.records: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        if not callable(getattr(self._logger, name)):
+            return getattr(self._logger, name)
+
+        def record(*args, **kwargs):
+            self.records.append((name, args, kwargs))
+
+        return record
+
+    def replay(self):
+        """Send the recorded calls to the wrapped logger"""
+        for name, args, kwargs in self.records:
+            getattr(self._logger, name)(*args, **kwargs)
+        self.records.clear()
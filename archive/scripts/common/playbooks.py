@@ -0,0 +1,248 @@
+"""Recursive, cached Ansible playbook indexer"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+# Below this many files to parse, starting worker processes costs more than
+# parsing inline
+POOL_THRESHOLD = 8
+
+# Keywords that pull in another playbook or task file
+INCLUDE_KEYWORDS = ("import_playbook", "include_tasks", "import_tasks")
+
+# Play sections holding tasks, in execution order
+TASK_SECTIONS = ("pre_tasks", "tasks", "post_tasks", "handlers")
+
+
+def _include(item: dict) -> tuple[str, str] | None:
+    """Get the keyword and file of an include/import, if the item is one"""
+    for key, value in item.items():
+        keyword = key.removeprefix("ansible.builtin.")
+        if keyword not in INCLUDE_KEYWORDS:
+            continue
+        if isinstance(value, dict):
+            value = value.get("file")
+        if isinstance(value, str):
+            return keyword, value.strip()
+    return None
+
+
+def _walk_tasks(tasks, names: list[str], includes: list[list[str]]):
+    """Collect task names and include references, descending into blocks"""
+    if not isinstance(tasks, list):
+        return
+    for task in tasks:
+        if not isinstance(task, dict):
+            continue
+        include = _include(task)
+        if include:
+            includes.append([*include, task.get("name", "")])
+        if "name" in task:
+            names.append(str(task["name"]))
+        for section in ("block", "rescue", "always"):
+            _walk_tasks(task.get(section), names, includes)
+
+
+def parse(content: bytes) -> dict:
+    """Parse a playbook or task file into plays, tasks and include references
+
+    A module-level function of plain data so it can run in a worker process.
+    Top-level items with ``hosts`` (or an ``import_playbook``) are plays; any
+    others are tasks, so task files parse the same way as playbooks.
+    """
+    try:
+        documents = list(yaml.load_all(content, Loader=SafeLoader))
+    except yaml.YAMLError as e:
+        return {"plays": [], "tasks": [], "includes": [], "error": str(e)}
+
+    items = []
+    for document in documents:
+        if isinstance(document, list):
+            for item in document:
+                # Tolerate plays nested one list deeper
+                items.extend(item if isinstance(item, list) else [item])
+        elif isinstance(document, dict):
+            items.append(document)
+
+    plays, tasks, includes = [], [], []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        include = _include(item)
+        if include and include[0] == "import_playbook":
+            includes.append([*include, item.get("name", "")])
+        elif "hosts" in item:
+            play = {
+                "name": str(item.get("name", "")),
+                "hosts": str(item.get("hosts", "undefined")),
+                "tasks": [],
+                "includes": [],
+            }
+            for section in TASK_SECTIONS:
+                _walk_tasks(item.get(section), play["tasks"], play["includes"])
+            plays.append(play)
+        else:
+            _walk_tasks([item], tasks, includes)
+
+    return {"plays": plays, "tasks": tasks, "includes": includes, "error": None}
+
+
+class PlaybookIndex:
+    """Index every playbook under a directory and the files they pull in
+
+    Files are parsed with libyaml's ``CSafeLoader`` (when PyYAML has it), in
+    a process pool when there are enough of them. ``import_playbook``,
+    ``include_tasks`` and ``import_tasks`` references are followed, including
+    to files outside the playbook directory. Parse results are cached by
+    content hash, so only changed files are parsed again.
+    """
+
+    def __init__(self, ansible_dir: Path, cache_file: Path, jobs: int | None = None):
+        self.ansible_dir = ansible_dir
+        self.playbooks_dir = ansible_dir / "playbooks"
+        self.cache_file = cache_file
+        self.jobs = jobs
+        self.entries: dict[Path, dict] = {}
+        self.missing: list[tuple[Path, str]] = []
+
+    def build(self) -> dict[Path, dict]:
+        """Parse the playbook tree, following includes
+
+        Returns:
+            dict: Parse results keyed by file, each with the included files
+                resolved under ``resolved``
+        """
+        cache = self._load_cache()
+        self.entries = {}
+        self.missing = []
+
+        pending = sorted(
+            path
+            for pattern in ("*.yml", "*.yaml")
+            for path in self.playbooks_dir.rglob(pattern)
+        )
+        while pending:
+            parsed = self._parse_all(pending, cache)
+            pending = []
+            for path, entry in parsed.items():
+                entry["resolved"] = {}
+                references = list(entry["includes"])
+                for play in entry["plays"]:
+                    references.extend(play["includes"])
+                for _keyword, reference, _name in references:
+                    target = self._resolve(reference, path)
+                    if target is None:
+                        if "{{" not in reference:
+                            self.missing.append((path, reference))
+                        continue
+                    entry["resolved"][reference] = target
+                    if target not in self.entries and target not in parsed:
+                        pending.append(target)
+                self.entries[path] = entry
+            pending = sorted(set(pending) - self.entries.keys())
+
+        self._save_cache(cache)
+        return self.entries
+
+    def playbooks(self) -> list[Path]:
+        """Files with at least one play or playbook import, in path order"""
+        return sorted(
+            path
+            for path, entry in self.entries.items()
+            if entry["plays"]
+            or any(include[0] == "import_playbook" for include in entry["includes"])
+        )
+
+    def expand_tasks(self, path: Path, play: dict) -> list[str]:
+        """Task names of a play followed by those of the task files it includes"""
+        names = list(play["tasks"])
+        for _keyword, reference, _name in play["includes"]:
+            target = self.entries[path]["resolved"].get(reference)
+            if target:
+                names.extend(self._included_tasks(target, {target}))
+        return names
+
+    def _included_tasks(self, path: Path, seen: set[Path]) -> list[str]:
+        entry = self.entries.get(path)
+        if not entry:
+            return []
+        names = list(entry["tasks"])
+        for _keyword, reference, _name in entry["includes"]:
+            target = entry["resolved"].get(reference)
+            if target and target not in seen:
+                names.extend(self._included_tasks(target, seen | {target}))
+        return names
+
+    def _resolve(self, reference: str, source: Path) -> Path | None:
+        """Find an included file the way Ansible searches for it"""
+        if "{{" in reference:
+            return None
+        for base in (source.parent, self.playbooks_dir, self.ansible_dir):
+            candidate = Path(os.path.normpath(base / reference))
+            if candidate.is_file():
+                return candidate
+        return None
+
+    def _parse_all(self, paths: list[Path], cache: dict) -> dict[Path, dict]:
+        """Parse files, reusing cached results for unchanged content"""
+        results = {}
+        todo = {}
+        for path in paths:
+            try:
+                content = path.read_bytes()
+            except OSError as e:
+                results[path] = {
+                    "plays": [],
+                    "tasks": [],
+                    "includes": [],
+                    "error": str(e),
+                }
+                continue
+            digest = hashlib.sha256(content).hexdigest()
+            cached = cache.get(digest)
+            if cached is not None:
+                # Shallow copy: build() only adds top-level keys
+                results[path] = {**cached, "hash": digest}
+            else:
+                todo[path] = (digest, content)
+
+        if len(todo) >= POOL_THRESHOLD:
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                parsed = executor.map(
+                    parse, [content for _, content in todo.values()], chunksize=4
+                )
+                outputs = list(parsed)
+        else:
+            outputs = [parse(content) for _, content in todo.values()]
+
+        for (path, (digest, _)), output in zip(todo.items(), outputs, strict=True):
+            cache[digest] = output
+            results[path] = {**output, "hash": digest}
+
+        return results
+
+    def _load_cache(self) -> dict:
+        try:
+            return json.loads(self.cache_file.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save_cache(self, cache: dict):
+        """Keep only results for current file contents and write atomically"""
+        live = {entry.get("hash") for entry in self.entries.values()}
+        cache = {digest: result for digest, result in cache.items() if digest in live}
+
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_file.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(cache, sort_keys=True))
+        os.replace(tmp_path, self.cache_file)
@@ -0,0 +1,109 @@
+"""Streaming subprocess runner with bounded memory"""
+
+import os
+import selectors
+import subprocess
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+# Lines of output kept for error reporting
+TAIL_LINES = 200
+# Bytes read per system call, and the longest line kept whole
+READ_SIZE = 64 * 1024
+# Emit an unterminated line (e.g. an input prompt) once output stalls this long
+PARTIAL_TIMEOUT = 0.2
+
+
+@dataclass
+class StreamResult:
+    """Outcome of a streamed command"""
+
+    cmd: list[str]
+    returncode: int
+    tail: list[str]  # The last lines of output, stdout and stderr interleaved
+    lines: int  # Total lines of output
+
+    def check(self):
+        """Raise CalledProcessError (carrying the tail as stderr) on failure"""
+        if self.returncode != 0:
+            raise subprocess.CalledProcessError(
+                self.returncode, self.cmd, stderr="\n".join(self.tail)
+            )
+
+
+def run_streaming(
+    cmd: list[str],
+    on_line: Callable[[str, str], None],
+    cwd: Path | str | None = None,
+    env: dict[str, str] | None = None,
+    tail_lines: int = TAIL_LINES,
+) -> StreamResult:
+    """Run a command, handing each line of its output over as it arrives
+
+    stdout and stderr are read through a selector in fixed-size chunks, so
+    memory use stays flat however much the command prints: only partial
+    lines (at most ``READ_SIZE`` bytes each) and the last ``tail_lines``
+    lines are held. stdin is inherited, so prompts still work; a prompt
+    without a trailing newline is handed over once output pauses.
+
+    Args:
+        on_line: Called with the stream name ("stdout" or "stderr") and the
+            line, without its line ending
+
+    Raises:
+        OSError: If the command cannot be started
+    """
+    tail: deque[str] = deque(maxlen=tail_lines)
+    count = 0
+
+    def emit(stream: str, data: bytes):
+        nonlocal count
+        line = data.decode(errors="replace").rstrip("\r\n")
+        tail.append(line)
+        count += 1
+        on_line(stream, line)
+
+    with (
+        subprocess.Popen(
+            cmd, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        ) as process,
+        selectors.DefaultSelector() as selector,
+    ):
+        partial = {"stdout": b"", "stderr": b""}
+        selector.register(process.stdout, selectors.EVENT_READ, "stdout")
+        selector.register(process.stderr, selectors.EVENT_READ, "stderr")
+
+        while selector.get_map():
+            timeout = PARTIAL_TIMEOUT if any(partial.values()) else None
+            events = selector.select(timeout)
+            if not events:
+                # Output stalled mid-line, most likely at a prompt
+                for stream, data in partial.items():
+                    if data:
+                        emit(stream, data)
+                        partial[stream] = b""
+                continue
+
+            for key, _mask in events:
+                stream = key.data
+                chunk = os.read(key.fd, READ_SIZE)
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                    if partial[stream]:
+                        emit(stream, partial[stream])
+                        partial[stream] = b""
+                    continue
+
+                *lines, rest = (partial[stream] + chunk).split(b"\n")
+                for line in lines:
+                    emit(stream, line)
+                if len(rest) >= READ_SIZE:
+                    emit(stream, rest)
+                    rest = b""
+                partial[stream] = rest
+
+        returncode = process.wait()
+
+    return StreamResult(cmd, returncode, list(tail), count)
@@ -0,0 +1,110 @@
+"""Rolling-batch scheduling for multi-host deployments"""
+
+import math
+from collections.abc import Callable
+
+from .logging import InfraLogger
+
+
+def parse_amount(value: str | int, total: int) -> int:
+    """Resolve a count such as ``2`` or a percentage such as ``"25%"``"""
+    text = str(value).strip()
+    if text.endswith("%"):
+        return math.ceil(total * float(text[:-1]) / 100)
+    return int(text)
+
+
+class RollingScheduler:
+    """Roll a deployment over hosts in batches with health gates between them
+
+    Hosts are grouped (usually by domain) and each batch takes up to
+    ``batch_size`` hosts from every group, so a scaled-out domain never loses
+    more than one batch worth of capacity while single-host domains still run
+    alongside it instead of waiting their turn.
+    """
+
+    def __init__(
+        self,
+        logger: InfraLogger,
+        batch_size: str | int = "25%",
+        max_failures: str | int = 0,
+    ):
+        self.logger = logger
+        self.batch_size = batch_size
+        self.max_failures = max_failures
+
+    def plan(self, groups: dict[str, list[str]]) -> list[list[str]]:
+        """Split grouped hosts into rollout batches"""
+        per_group = {
+            name: max(parse_amount(self.batch_size, len(hosts)), 1)
+            for name, hosts in groups.items()
+        }
+
+        batches = []
+        offset = 0
+        while True:
+            batch = []
+            for name, hosts in groups.items():
+                start = offset * per_group[name]
+                batch.extend(hosts[start : start + per_group[name]])
+            if not batch:
+                return batches
+            batches.append(batch)
+            offset += 1
+
+    def run(
+        self,
+        groups: dict[str, list[str]],
+        deploy: Callable[[list[str]], list[str]],
+        health_gate: Callable[[list[str]], bool] | None = None,
+    ) -> dict:
+        """Deploy batch by batch, stopping once failures exceed the threshold
+
+        Args:
+            groups: Hosts keyed by group (domain) name
+            deploy: Deploys a batch and returns the hosts that failed
+            health_gate: Checks a finished batch before the next one starts
+
+        Returns:
+            dict: ``completed``, ``failed`` and ``pending`` host lists plus
+            ``success``
+        """
+        batches = self.plan(groups)
+        total = sum(len(batch) for batch in batches)
+        allowed = parse_amount(self.max_failures, total)
+
+        completed: list[str] = []
+        failed: list[str] = []
+        pending = [host for batch in batches for host in batch]
+
+        for index, batch in enumerate(batches, 1):
+            self.logger.info(
+                f"Rolling batch {index}/{len(batches)}: {', '.join(batch)}"
+            )
+            batch_failed = deploy(batch)
+            pending = pending[len(batch) :]
+            failed.extend(batch_failed)
+            completed.extend(host for host in batch if host not in batch_failed)
+
+            if len(failed) > allowed:
+                self.logger.error(
+                    f"{len(failed)} hosts failed (max {allowed}), stopping rollout"
+                )
+                break
+
+            healthy = [host for host in batch if host not in batch_failed]
+            if pending and health_gate and healthy and not health_gate(healthy):
+                self.logger.error(
+                    f"Health gate failed after batch {index}, stopping rollout"
+                )
+                break
+
+        if pending:
+            self.logger.warn(f"Not deployed: {', '.join(pending)}")
+
+        return {
+            "completed": completed,
+            "failed": failed,
+            "pending": pending,
+            "success": not failed and not pending,
+        }
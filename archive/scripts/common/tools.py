@@ -0,0 +1,99 @@
+"""Resolve project tool executables once per session"""
+
+import shutil
+import statistics
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+from .logging import InfraLogger
+
+
+class ToolResolver:
+    """Find tool binaries in the project virtualenv and run them directly
+
+    ``uv run <tool>`` checks the lockfile and syncs the environment on every
+    call. The resolver checks once that the environment matches uv.lock,
+    then hands out absolute binary paths so tools start without uv. When the
+    environment is out of date (or this uv cannot check it), and for tools
+    that cannot be found, it falls back to ``uv run``, which syncs as needed.
+    """
+
+    def __init__(self, project_root: Path, logger: InfraLogger):
+        self.project_root = project_root
+        self.logger = logger
+        self.venv_bin = project_root / ".venv" / "bin"
+        self._paths: dict[str, str | None] = {}
+        self._synced = False
+        self._use_uv_run = False
+        self._lock = threading.Lock()
+
+    def command(self, tool: str) -> list[str]:
+        """Get the command prefix that runs a tool"""
+        path = self.resolve(tool)
+        return [path] if path else ["uv", "run", tool]
+
+    def resolve(self, tool: str) -> str | None:
+        """Get a tool's executable, preferring the project virtualenv"""
+        with self._lock:
+            if tool not in self._paths:
+                self._check_synced()
+                if self._use_uv_run:
+                    self._paths[tool] = None
+                else:
+                    self._paths[tool] = shutil.which(
+                        tool, path=str(self.venv_bin)
+                    ) or shutil.which(tool)
+            return self._paths[tool]
+
+    def _check_synced(self):
+        """Check once per session that the virtualenv matches uv.lock
+
+        ``uv sync --check`` exits non-zero both when the environment is out
+        of date and when this uv predates the flag; either way tools then run
+        through ``uv run`` rather than from a possibly stale virtualenv.
+        """
+        if self._synced:
+            return
+        self._synced = True
+
+        if not shutil.which("uv") or not (self.project_root / "uv.lock").exists():
+            return
+
+        check = subprocess.run(
+            ["uv", "sync", "--check"],
+            cwd=self.project_root,
+            capture_output=True,
+            text=True,
+        )
+        if check.returncode != 0:
+            self.logger.debug(
+                f"uv sync --check failed, running tools with uv run: "
+                f"{check.stderr.strip()}"
+            )
+            self._use_uv_run = True
+
+    def benchmark(self, tool: str, runs: int = 5) -> dict[str, float] | None:
+        """Median seconds for ``<tool> --version`` via ``uv run`` and directly"""
+        path = self.resolve(tool)
+        if not path:
+            return None
+
+        timings = {}
+        for label, cmd in (
+            ("uv run", ["uv", "run", tool, "--version"]),
+            ("direct", [path, "--version"]),
+        ):
+            samples = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                try:
+                    subprocess.run(cmd, cwd=self.project_root, capture_output=True)
+                except FileNotFoundError:
+                    break
+                samples.append(time.perf_counter() - start)
+            if samples:
+                timings[label] = statistics.median(samples)
+
+        return timings
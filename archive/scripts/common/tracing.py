@@ -0,0 +1,195 @@
+"""Span tracing for infrastructure operations
+
+Spans are exported in the Chrome trace-event format, which can be opened in
+``chrome://tracing`` or https://ui.perfetto.dev.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+
+class Tracer:
+    """Collects timed spans and exports them as Chrome trace events"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.spans: list[dict] = []
+        self._tracks: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, category: str = "phase", **args) -> Iterator[dict]:
+        """Time the enclosed block as a span
+
+        The yielded dict is recorded as the span's args, so callers can attach
+        details (exit codes, host counts) while the span is open.
+        """
+        start = time.time()
+        args.setdefault("status", "ok")
+        try:
+            yield args
+        except BaseException:
+            args["status"] = "error"
+            raise
+        finally:
+            self.add_span(name, category, start, time.time(), **args)
+
+    def add_span(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        end: float,
+        track: str | None = None,
+        **args,
+    ):
+        """Record a span that was timed elsewhere (start/end in epoch seconds)"""
+        if track is None:
+            track = threading.current_thread().name
+
+        with self._lock:
+            tid = self._tracks.setdefault(track, len(self._tracks) + 1)
+            self.spans.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": int(start * 1_000_000),
+                    "dur": max(int((end - start) * 1_000_000), 0),
+                    "pid": os.getpid(),
+                    "tid": tid,
+                    "args": args,
+                }
+            )
+
+    @contextmanager
+    def ansible_events(self, env: dict[str, str], callback_dir: Path):
+        """Collect per-task spans from an ansible-playbook run
+
+        Enables the ``atl_trace`` callback plugin through ``env`` and turns the
+        events it writes into ``task`` spans, one track per host. The yielded
+        dict is filled with the per-host play recap once the block exits.
+        """
+        fd, name = tempfile.mkstemp(prefix="atl-trace-", suffix=".jsonl")
+        os.close(fd)
+        events_file = Path(name)
+
+        plugin_path = env.get("ANSIBLE_CALLBACK_PLUGINS")
+        env["ANSIBLE_CALLBACK_PLUGINS"] = (
+            f"{callback_dir}:{plugin_path}" if plugin_path else str(callback_dir)
+        )
+        enabled = env.get("ANSIBLE_CALLBACKS_ENABLED")
+        env["ANSIBLE_CALLBACKS_ENABLED"] = (
+            f"{enabled},atl_trace" if enabled else "atl_trace"
+        )
+        env["ATL_TRACE_FILE"] = str(events_file)
+
+        run: dict = {"hosts": {}}
+        try:
+            yield run
+        finally:
+            if events_file.exists():
+                run["hosts"] = self.load_ansible_events(events_file)
+                events_file.unlink(missing_ok=True)
+
+    def load_ansible_events(self, events_file: Path) -> dict[str, dict]:
+        """Turn ``atl_trace`` callback output into task spans
+
+        Returns:
+            dict: Play recap (ok/changed/failures/unreachable) keyed by host
+        """
+        hosts = {}
+        with open(events_file) as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if event.get("event") == "stats":
+                    hosts[event["host"]] = event
+                if event.get("event") != "task":
+                    continue
+
+                name = event["task"]
+                if event.get("role"):
+                    name = f"{event['role']} : {name}"
+                self.add_span(
+                    name,
+                    "task",
+                    event["start"],
+                    event["end"],
+                    track=event["host"],
+                    host=event["host"],
+                    play=event.get("play", ""),
+                    role=event.get("role", ""),
+                    status=event.get("status", "ok"),
+                )
+
+        return hosts
+
+    def write(self, path: Path) -> Path:
+        """Write collected spans as Chrome trace-event JSON"""
+        metadata = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": os.getpid(),
+                "args": {"name": self.name},
+            }
+        ]
+        metadata.extend(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": os.getpid(),
+                "tid": tid,
+                "args": {"name": track},
+            }
+            for track, tid in self._tracks.items()
+        )
+
+        with open(path, "w") as f:
+            json.dump(
+                {"traceEvents": metadata + self.spans, "displayTimeUnit": "ms"}, f
+            )
+        return path
+
+    def slowest(self, limit: int = 10) -> list[dict]:
+        """Get the longest spans, slowest first"""
+        return sorted(self.spans, key=lambda s: s["dur"], reverse=True)[:limit]
+
+    def print_summary(self, console: Console, limit: int = 10):
+        """Print a table of the slowest spans"""
+        if not self.spans:
+            return
+
+        table = Table(title=f"Slowest {self.name} spans")
+        table.add_column("Span")
+        table.add_column("Category", style="dim")
+        table.add_column("Track", style="dim")
+        table.add_column("Duration", justify="right")
+        table.add_column("Status")
+
+        tracks = {tid: track for track, tid in self._tracks.items()}
+        for span in self.slowest(limit):
+            status = span["args"].get("status", "ok")
+            table.add_row(
+                span["name"],
+                span["cat"],
+                tracks.get(span["tid"], ""),
+                f"{span['dur'] / 1_000_000:.2f}s",
+                f"[red]{status}[/red]"
+                if status in ("error", "failed", "unreachable")
+                else f"[green]{status}[/green]",
+            )
+
+        console.print(table)
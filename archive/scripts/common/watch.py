@@ -0,0 +1,215 @@
+"""Debounced file change notifications via inotify, with a polling fallback"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from .files import PRUNE_DIRS
+
+# inotify event masks (see inotify(7))
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class FileWatcher:
+    """Yield batches of changed files under some directories
+
+    Uses inotify on Linux (through libc, so no extra dependency) and falls
+    back to comparing mtimes every ``poll_interval`` seconds elsewhere. A
+    burst of events is collected into one batch until nothing has changed for
+    ``debounce`` seconds, so saving several files (or an editor writing a
+    temporary file and renaming it) triggers a single batch.
+
+    A batch of ``None`` means events were lost (the inotify queue
+    overflowed) and everything should be treated as changed.
+    """
+
+    def __init__(
+        self, roots: list[Path], debounce: float = 0.3, poll_interval: float = 1.0
+    ):
+        self.roots = [root for root in roots if root.is_dir()]
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._fd: int | None = None
+        self._watches: dict[int, Path] = {}
+        self._snapshot: dict[Path, int] = {}
+        self._libc = self._load_libc()
+        self.backend = "inotify" if self._libc else "polling"
+
+    def __enter__(self) -> "FileWatcher":
+        if self._libc:
+            fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                self._libc = None
+                self.backend = "polling"
+            else:
+                self._fd = fd
+                for root in self.roots:
+                    self._watch_tree(root)
+        if self._fd is None:
+            self._snapshot = self._scan()
+        return self
+
+    def __exit__(self, *exc):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    @staticmethod
+    def _load_libc() -> ctypes.CDLL | None:
+        """Load libc if it provides inotify"""
+        name = ctypes.util.find_library("c")
+        if not name:
+            return None
+        try:
+            libc = ctypes.CDLL(name, use_errno=True)
+            add_watch = libc.inotify_add_watch
+            if not hasattr(libc, "inotify_init1"):
+                return None
+        except (OSError, AttributeError):
+            return None
+        add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        return libc
+
+    def batches(self) -> Iterator[set[Path] | None]:
+        """Block until files change, then yield them (forever)"""
+        while True:
+            if self._fd is not None:
+                yield self._next_inotify_batch()
+            else:
+                yield self._next_polled_batch()
+
+    # inotify backend
+
+    def _watch_tree(self, directory: Path) -> list[Path]:
+        """Watch a directory and its subdirectories
+
+        Returns:
+            list: Files already present (for directories created mid-watch)
+        """
+        files = []
+        for dirpath, dirnames, filenames in os.walk(directory):
+            dirnames[:] = [d for d in dirnames if d not in PRUNE_DIRS]
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(dirpath), WATCH_MASK
+            )
+            if wd >= 0:
+                self._watches[wd] = Path(dirpath)
+            files.extend(Path(dirpath) / name for name in filenames)
+        return files
+
+    def _next_inotify_batch(self) -> set[Path] | None:
+        changed: set[Path] = set()
+        overflowed = False
+
+        # Wait for the first event, then until the burst goes quiet
+        timeout = None
+        while True:
+            ready, _, _ = select.select([self._fd], [], [], timeout)
+            if not ready:
+                if changed or overflowed:
+                    break
+                continue
+            overflowed |= self._read_events(changed)
+            timeout = self.debounce
+
+        return None if overflowed else changed
+
+    def _read_events(self, changed: set[Path]) -> bool:
+        """Drain pending inotify events into ``changed``
+
+        Returns:
+            bool: Whether the event queue overflowed
+        """
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+
+        overflowed = False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                overflowed = True
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / os.fsdecode(name)
+
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and path.name not in PRUNE_DIRS:
+                    changed.update(self._watch_tree(path))
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE):
+                changed.add(path)
+
+        return overflowed
+
+    # Polling backend
+
+    def _scan(self) -> dict[Path, int]:
+        """Modification time of every file under the roots"""
+        mtimes = {}
+        stack = list(self.roots)
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in PRUNE_DIRS:
+                            stack.append(Path(entry.path))
+                    elif entry.is_file():
+                        mtimes[Path(entry.path)] = entry.stat().st_mtime_ns
+                except OSError:
+                    continue
+        return mtimes
+
+    def _poll(self) -> set[Path]:
+        """Files added, modified or removed since the last scan"""
+        snapshot = self._scan()
+        changed = {
+            path
+            for path in snapshot.keys() | self._snapshot.keys()
+            if snapshot.get(path) != self._snapshot.get(path)
+        }
+        self._snapshot = snapshot
+        return changed
+
+    def _next_polled_batch(self) -> set[Path]:
+        changed: set[Path] = set()
+        while True:
+            time.sleep(self.debounce if changed else self.poll_interval)
+            new = self._poll()
+            if not new and changed:
+                return changed
+            changed |= new
@@ -0,0 +1,13 @@
+"""Shared fixtures"""
+
+import pytest
+
+from scripts.common.logging import InfraLogger
+
+
+@pytest.fixture
+def logger(tmp_path):
+    """An InfraLogger writing to a temporary log directory"""
+    logger = InfraLogger("test", log_dir=tmp_path / "logs", auto_cleanup=False)
+    yield logger
+    logger.flush()
@@ -0,0 +1,161 @@
+"""Tests for compressed log archives"""
+
+import gzip
+import os
+import re
+
+import pytest
+
+from scripts.common import archive as archive_module
+from scripts.common.archive import LogArchive, open_log, search_file
+
+pytestmark = pytest.mark.unit
+
+
+def make_log(tmp_path, name: str, content: str):
+    path = tmp_path / name
+    path.write_text(content)
+    return path
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return LogArchive(tmp_path / "archive")
+
+
+def test_logs_append_to_one_archive_per_tool_and_day(tmp_path, archive):
+    first = archive.add(make_log(tmp_path, "deploy-20261001_080000.log", "a\n"))
+    second = archive.add(make_log(tmp_path, "deploy-20261001_090000.log", "b\n"))
+    other = archive.add(make_log(tmp_path, "deploy-20261002_080000.log", "c\n"))
+
+    assert first == second != other
+    assert first.name.startswith("deploy-20261001.log.")
+    with open_log(first) as f:
+        assert f.read() == (
+            "==> deploy-20261001_080000.log <==\na\n"
+            "==> deploy-20261001_090000.log <==\nb\n"
+        )
+
+
+def test_add_uses_the_original_name_of_a_claimed_log(tmp_path, archive):
+    claimed = make_log(tmp_path, ".lint-20261001_080000.log.archiving", "x\n")
+
+    path = archive.add(claimed, "lint-20261001_080000.log")
+
+    assert path.name.startswith("lint-20261001.log.")
+
+
+def test_failed_add_leaves_no_partial_member(tmp_path, archive, monkeypatch):
+    archive.add(make_log(tmp_path, "deploy-20261001_080000.log", "a\n"))
+
+    def fail(source, out, length):
+        out.write(b"partial")
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(archive_module.shutil, "copyfileobj", fail)
+    with pytest.raises(OSError):
+        archive.add(make_log(tmp_path, "deploy-20261001_090000.log", "b\n"))
+    monkeypatch.undo()
+    path = archive.add(make_log(tmp_path, "deploy-20261001_100000.log", "c\n"))
+
+    with open_log(path) as f:
+        assert f.read() == (
+            "==> deploy-20261001_080000.log <==\na\n"
+            "==> deploy-20261001_100000.log <==\nc\n"
+        )
+
+
+def test_run_files_get_archives_of_their_own_kind(tmp_path, archive):
+    log = archive.add(make_log(tmp_path, "deploy-20261001_080000.log", "ok\n"))
+    trace = archive.add(make_log(tmp_path, "deploy-20261001_080000.trace.json", "ok"))
+
+    assert trace.name.startswith("deploy-20261001.trace.json.")
+    assert [path for path, _ in archive.archives(kind=".log")] == [log]
+    assert [name for name, _, _ in archive.search(re.compile("ok"))] == [
+        "deploy-20261001_080000.log"
+    ]
+
+
+def test_add_rejects_other_files(tmp_path, archive):
+    with pytest.raises(ValueError):
+        archive.add(make_log(tmp_path, "notes.txt", ""))
+
+
+def test_archives_filter_by_tool_and_day(tmp_path, archive):
+    for name in (
+        "deploy-20261001_080000.log",
+        "lint-20261002_080000.log",
+        "deploy-20261003_080000.log",
+    ):
+        archive.add(make_log(tmp_path, name, "line\n"))
+
+    def names(**kwargs):
+        return [path.name.split(".")[0] for path, _ in archive.archives(**kwargs)]
+
+    assert names() == ["deploy-20261001", "lint-20261002", "deploy-20261003"]
+    assert names(tool="deploy") == ["deploy-20261001", "deploy-20261003"]
+    assert names(since="20261002") == ["lint-20261002", "deploy-20261003"]
+
+
+def test_existing_gzip_archives_keep_their_format(tmp_path, archive):
+    archive.archive_dir.mkdir()
+    existing = archive.archive_dir / "deploy-20261001.log.gz"
+    with gzip.open(existing, "wt") as f:
+        f.write("==> deploy-20261001_070000.log <==\nold\n")
+
+    path = archive.add(make_log(tmp_path, "deploy-20261001_080000.log", "new\n"))
+
+    assert path == existing
+    with open_log(path) as f:
+        assert f.read().endswith("==> deploy-20261001_080000.log <==\nnew\n")
+
+
+def test_enforce_budget_removes_oldest_first(tmp_path, archive):
+    for day in range(1, 4):
+        log = make_log(tmp_path, f"deploy-2026100{day}_080000.log", "")
+        log.write_bytes(os.urandom(4096))  # Incompressible
+        archive.add(log)
+    sizes = [size for _, size in archive.archives()]
+
+    removed = archive.enforce_budget(sum(sizes[1:]))
+
+    assert removed == 1
+    assert [path.name.split(".")[0] for path, _ in archive.archives()] == [
+        "deploy-20261002",
+        "deploy-20261003",
+    ]
+
+
+def test_search_names_the_original_log_and_line(tmp_path, archive):
+    archive.add(
+        make_log(tmp_path, "deploy-20261001_080000.log", "ok\nERROR: disk full\n")
+    )
+    archive.add(make_log(tmp_path, "deploy-20261001_090000.log", "error again\n"))
+
+    matches = list(archive.search(re.compile("error", re.IGNORECASE)))
+
+    assert matches == [
+        ("deploy-20261001_080000.log", 2, "ERROR: disk full"),
+        ("deploy-20261001_090000.log", 1, "error again"),
+    ]
+
+
+def test_truncated_archive_is_searched_and_reported(tmp_path, archive):
+    path = archive.add(
+        make_log(tmp_path, "deploy-20261001_080000.log", "needle\n" + "x" * 100_000)
+    )
+    data = path.read_bytes()
+    path.write_bytes(data[: len(data) - 20])
+
+    matches = list(archive.search(re.compile("needle")))
+
+    assert matches == [("deploy-20261001_080000.log", 1, "needle")]
+    assert archive.damaged == [path]
+
+
+def test_search_file_reads_plain_logs(tmp_path):
+    log = make_log(tmp_path, "lint-20261001_080000.log", "a\nmatch\n")
+
+    assert list(search_file(log, re.compile("match"))) == [
+        ("lint-20261001_080000.log", 2, "match")
+    ]
@@ -0,0 +1,110 @@
+"""Tests for the lint result cache"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from scripts.common.cache import LintCache
+from scripts.common.tools import ToolResolver
+
+pytestmark = pytest.mark.unit
+
+
+def install_tool(project: Path, version: str):
+    """Put a fake linter that only reports its version into the project venv"""
+    tool = project / ".venv" / "bin" / "fakelint"
+    tool.parent.mkdir(parents=True, exist_ok=True)
+    tool.write_text(f"#!/bin/sh\necho 'fakelint {version}'\n")
+    tool.chmod(0o755)
+    # Versions are cached by mtime, so make every install look new
+    stamp = tool.stat().st_mtime_ns + len(version)
+    os.utime(tool, ns=(stamp, stamp))
+
+
+@pytest.fixture
+def project(tmp_path, logger):
+    install_tool(tmp_path, "1.0")
+    (tmp_path / ".fakelint.yml").write_text("rules: {}\n")
+    for name in ("a.yml", "b.yml"):
+        (tmp_path / name).write_text(f"{name}: true\n")
+    return tmp_path
+
+
+@pytest.fixture
+def cache(project, logger):
+    return LintCache(project / ".cache" / "lint", ToolResolver(project, logger))
+
+
+def lint(cache: LintCache, files, flags=None):
+    """Record a pass for whatever is pending and return what was pending"""
+    pending = cache.pending("fakelint", files, [".fakelint.yml"], None, flags)
+    cache.record("fakelint", pending)
+    return [path.name for path in pending]
+
+
+def test_passes_are_reused(project, cache):
+    files = [project / "a.yml", project / "b.yml"]
+
+    assert lint(cache, files) == ["a.yml", "b.yml"]
+    assert lint(cache, files) == []
+
+
+def test_editing_a_file_invalidates_only_that_file(project, cache):
+    files = [project / "a.yml", project / "b.yml"]
+    lint(cache, files)
+    (project / "b.yml").write_text("b.yml: false\n")
+
+    assert lint(cache, files) == ["b.yml"]
+
+
+def test_config_change_invalidates_everything(project, cache):
+    files = [project / "a.yml", project / "b.yml"]
+    lint(cache, files)
+    (project / ".fakelint.yml").write_text("rules: {strict: true}\n")
+
+    assert lint(cache, files) == ["a.yml", "b.yml"]
+
+
+def test_tool_upgrade_invalidates_everything(project, cache):
+    files = [project / "a.yml"]
+    lint(cache, files)
+    install_tool(project, "2.0")
+
+    assert lint(cache, files) == ["a.yml"]
+
+
+def test_lenient_pass_is_not_reused_by_a_strict_run(project, cache):
+    files = [project / "a.yml"]
+    lint(cache, files, ["strict=False"])
+
+    assert lint(cache, files, ["strict=True"]) == ["a.yml"]
+    assert lint(cache, files, ["strict=True"]) == []
+
+
+def test_missing_tool_disables_caching(project, cache):
+    (project / ".venv" / "bin" / "fakelint").unlink()
+    files = [project / "a.yml"]
+
+    # Nothing is cached without a version to key on
+    assert lint(cache, files) == ["a.yml"]
+    assert lint(cache, files) == ["a.yml"]
+
+
+def test_clear_drops_all_passes(project, cache):
+    files = [project / "a.yml"]
+    lint(cache, files)
+    cache.clear()
+
+    assert lint(cache, files) == ["a.yml"]
+
+
+def test_file_saved_during_a_run_stays_pending(project, cache):
+    files = [project / "a.yml", project / "b.yml"]
+    pending = cache.pending("fakelint", files, [".fakelint.yml"])
+
+    # Saved after the linter read it, so the new content was never linted
+    (project / "a.yml").write_text("a.yml: edited\n")
+    cache.record("fakelint", pending)
+
+    assert lint(cache, files) == ["a.yml"]
@@ -0,0 +1,88 @@
+"""Tests for the top-level CLI wiring"""
+
+import pytest
+from click.testing import CliRunner
+
+from scripts.cli import cli
+from scripts.commands import deploy
+from scripts.common.history import DeployHistory
+from scripts.common.tracing import Tracer
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """Point the deploy commands at an empty project directory"""
+    monkeypatch.setattr(deploy, "PROJECT_ROOT", tmp_path)
+    return tmp_path
+
+
+def test_infra_history_reads_the_history_database(project, caplog):
+    history = DeployHistory(project / ".state" / "history.db")
+    for seconds in (10.0, 12.0):
+        tracer = Tracer("deploy")
+        tracer.add_span("terraform apply", "phase", 0.0, seconds)
+        history.record("apply", "staging", tracer, 0.0, seconds, True)
+
+    result = CliRunner().invoke(cli, ["infra", "-e", "staging", "history"])
+
+    assert result.exit_code == 0, result.output
+    assert "2 apply runs in staging" in caplog.text
+
+
+def test_infra_history_without_runs(project, caplog):
+    result = CliRunner().invoke(cli, ["infra", "history", "--runs", "5"])
+
+    assert result.exit_code == 0, result.output
+    assert "No apply runs recorded for development yet" in caplog.text
+
+
+def test_infra_history_rejects_a_single_run(project):
+    result = CliRunner().invoke(cli, ["infra", "history", "--runs", "1"])
+
+    assert result.exit_code == 2
+
+
+def test_infra_facts_clear(project):
+    cache_dir = project / ".ansible" / "facts_cache"
+    cache_dir.mkdir(parents=True)
+    (cache_dir / "ansible_factsweb1").write_text("{}")
+
+    result = CliRunner().invoke(cli, ["infra", "facts", "clear"])
+
+    assert result.exit_code == 0, result.output
+    assert not (cache_dir / "ansible_factsweb1").exists()
+
+
+def test_quick_apply_dry_run_sets_up_the_deploy_context(project, caplog):
+    result = CliRunner().invoke(cli, ["apply", "--dry-run", "--resume"])
+
+    # Stops at the prerequisite check (no domains.yml) instead of a KeyError
+    assert isinstance(result.exception, SystemExit), result.exception
+    assert result.exit_code == 1
+    assert "domains.yml not found" in caplog.text
+
+
+def test_quick_apply_refuses_pipeline_dry_run(project):
+    result = CliRunner().invoke(cli, ["apply", "--dry-run", "--pipeline"])
+
+    assert result.exit_code == 2
+    assert "--pipeline" in result.output
+
+
+def test_quick_plan_sets_up_the_deploy_context(project, caplog):
+    result = CliRunner().invoke(cli, ["plan", "-e", "staging"])
+
+    assert result.exit_code == 1
+    assert "domains.yml not found" in caplog.text
+
+
+def test_infra_facts_warm_reaches_the_deployment_manager(project, caplog, monkeypatch):
+    monkeypatch.setenv("PATH", str(project / "bin"))
+
+    result = CliRunner().invoke(cli, ["infra", "facts", "warm", "--limit", "web"])
+
+    assert result.exit_code == 1
+    assert "Warming fact cache for 'web'" in caplog.text
+    assert "ansible not found in PATH" in caplog.text
@@ -0,0 +1,59 @@
+"""Tests for the emergency path's use of cached facts"""
+
+import os
+import time
+
+import pytest
+
+from scripts.commands.emergency import FACT_EXPIRY_MARGIN, EmergencyManager
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def emergency(tmp_path, logger, monkeypatch):
+    for name in ("ANSIBLE_CACHE_PLUGIN", "ANSIBLE_CACHE_PLUGIN_TIMEOUT"):
+        monkeypatch.delenv(name, raising=False)
+    return EmergencyManager(tmp_path, logger)
+
+
+def cache_facts(emergency, host: str, age: float):
+    """Write a cached facts file last updated ``age`` seconds ago"""
+    path = emergency.deployment.fact_cache_dir / f"ansible_facts{host}"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("{}")
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+def test_facts_expire_with_the_configured_cache_timeout(emergency):
+    env = emergency._env()
+    timeout = emergency.deployment.FACT_CACHE_TIMEOUT
+    assert env["ANSIBLE_CACHE_PLUGIN_TIMEOUT"] == str(timeout)
+
+    cache_facts(emergency, "web1", age=60)
+    assert emergency._facts_cached(["web1"], env)
+
+    # Too close to expiring to outlast the playbook
+    cache_facts(emergency, "web2", age=timeout - FACT_EXPIRY_MARGIN + 60)
+    assert not emergency._facts_cached(["web1", "web2"], env)
+
+    assert not emergency._facts_cached(["web1", "db1"], env)
+
+
+def test_timeout_defaults_to_the_deploy_fact_cache_timeout(emergency):
+    cache_facts(emergency, "web1", age=emergency.deployment.FACT_CACHE_TIMEOUT)
+
+    assert not emergency._facts_cached(["web1"], {})
+
+
+def test_zero_timeout_never_expires(emergency):
+    cache_facts(emergency, "web1", age=10 * 86400)
+
+    assert emergency._facts_cached(["web1"], {"ANSIBLE_CACHE_PLUGIN_TIMEOUT": "0"})
+
+
+def test_non_file_cache_plugins_have_no_cached_facts(emergency):
+    cache_facts(emergency, "web1", age=60)
+
+    assert not emergency._facts_cached(["web1"], {"ANSIBLE_CACHE_PLUGIN": "memory"})
@@ -0,0 +1,80 @@
+"""Tests for shared project file discovery"""
+
+import shutil
+import subprocess
+
+import pytest
+
+from scripts.common.files import ProjectFiles
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def project(tmp_path):
+    """A project with source files, ignored files and tool state"""
+    root = tmp_path / "project"
+    for name in [
+        "setup.py",
+        "scripts/cli.py",
+        "ansible/site.yml",
+        "terraform/main.tf",
+        "docs/index.md",
+        "notes.txt",
+        "build/generated.py",
+        ".venv/lib/site.py",
+        ".ansible/collections/galaxy.yml",
+        "terraform/.terraform/modules/vpc/main.tf",
+    ]:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+    (root / ".gitignore").write_text("build/\n")
+    return root
+
+
+def relative(root, paths):
+    return [str(path.relative_to(root)) for path in paths]
+
+
+@pytest.mark.skipif(not shutil.which("git"), reason="git not installed")
+def test_git_listing_excludes_ignored_and_pruned_paths(project):
+    subprocess.run(["git", "init", "-q"], cwd=project, check=True)
+    subprocess.run(["git", "add", "setup.py", "scripts"], cwd=project, check=True)
+    # Tracked files deleted from the working tree are skipped
+    (project / "setup.py").unlink()
+
+    found = ProjectFiles(project)
+
+    assert relative(project, found.of_type("python")) == ["scripts/cli.py"]
+    assert relative(project, found.of_type("yaml")) == ["ansible/site.yml"]
+    assert relative(project, found.of_type("terraform")) == ["terraform/main.tf"]
+    assert relative(project, found.of_type("markdown", ["docs/"])) == ["docs/index.md"]
+
+
+def test_walk_fallback_prunes_tool_directories(project, monkeypatch):
+    monkeypatch.setattr(ProjectFiles, "_git_files", lambda self: None)
+
+    found = ProjectFiles(project)
+
+    # Without git there is no .gitignore handling, only PRUNE_DIRS
+    assert relative(project, found.of_type("python")) == [
+        "build/generated.py",
+        "scripts/cli.py",
+        "setup.py",
+    ]
+    assert relative(project, found.of_type("yaml")) == ["ansible/site.yml"]
+    assert relative(project, found.of_type("terraform")) == ["terraform/main.tf"]
+
+
+def test_explicit_paths_are_classified_without_walking(project):
+    paths = [
+        project / "scripts/cli.py",
+        project / "notes.txt",
+        project / ".venv/lib/site.py",
+    ]
+
+    found = ProjectFiles(project, paths)
+
+    assert relative(project, found.of_type("python")) == ["scripts/cli.py"]
+    assert found.of_type("yaml") == []
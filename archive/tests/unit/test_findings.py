@@ -0,0 +1,356 @@
+"""Tests for linter output parsers and SARIF export"""
+
+import json
+
+import pytest
+
+from scripts.common.findings import (
+    Finding,
+    parse_ansible_lint,
+    parse_pymarkdown,
+    parse_ruff,
+    parse_shellcheck,
+    parse_shfmt,
+    parse_terraform_fmt,
+    parse_terraform_validate,
+    parse_tflint,
+    parse_yamllint,
+    summarize,
+    write_sarif,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def lines(text: str) -> list[str]:
+    return text.splitlines(keepends=True)
+
+
+def test_parse_ruff():
+    output = (
+        '{"code":"F401","filename":"scripts/cli.py","location":{"row":3,"column":8},'
+        '"message":"`os` imported but unused"}\n'
+        "\n"
+        '{"code":null,"filename":"scripts/bad.py","location":{"row":1,"column":5},'
+        '"message":"SyntaxError: Expected an expression"}\n'
+    )
+
+    assert list(parse_ruff(lines(output))) == [
+        Finding(
+            "ruff", "scripts/cli.py", 3, 8, "F401", "error", "`os` imported but unused"
+        ),
+        Finding(
+            "ruff",
+            "scripts/bad.py",
+            1,
+            5,
+            "syntax-error",
+            "error",
+            "SyntaxError: Expected an expression",
+        ),
+    ]
+
+
+def test_parse_yamllint():
+    output = (
+        "ansible/site.yml:4:81: [warning] line too long (95 > 80 characters) "
+        "(line-length)\n"
+        "configs/domains.yml:7:1: [error] syntax error: expected <block end>\n"
+        "not a finding\n"
+    )
+
+    assert list(parse_yamllint(lines(output))) == [
+        Finding(
+            "yamllint",
+            "ansible/site.yml",
+            4,
+            81,
+            "line-length",
+            "warning",
+            "line too long (95 > 80 characters)",
+        ),
+        Finding(
+            "yamllint",
+            "configs/domains.yml",
+            7,
+            1,
+            "syntax",
+            "error",
+            "syntax error: expected <block end>",
+        ),
+    ]
+
+
+def test_parse_ansible_lint():
+    output = json.dumps(
+        [
+            {
+                "check_name": "name[missing]",
+                "description": "All tasks should be named.",
+                "severity": "major",
+                "location": {
+                    "path": "ansible/roles/web/tasks/main.yml",
+                    "lines": {"begin": 12},
+                },
+            },
+            {
+                "check_name": "yaml[truthy]",
+                "description": "Truthy value should be one of [false, true]",
+                "severity": "minor",
+                "location": {
+                    "path": "ansible/site.yml",
+                    "positions": {"begin": {"line": 3, "column": 10}},
+                },
+            },
+        ]
+    )
+
+    assert list(parse_ansible_lint(lines(output))) == [
+        Finding(
+            "ansible-lint",
+            "ansible/roles/web/tasks/main.yml",
+            12,
+            0,
+            "name[missing]",
+            "error",
+            "All tasks should be named.",
+        ),
+        Finding(
+            "ansible-lint",
+            "ansible/site.yml",
+            3,
+            10,
+            "yaml[truthy]",
+            "warning",
+            "Truthy value should be one of [false, true]",
+        ),
+    ]
+
+
+def test_parse_shellcheck():
+    output = json.dumps(
+        {
+            "comments": [
+                {
+                    "file": "scripts/setup.sh",
+                    "line": 5,
+                    "column": 3,
+                    "level": "info",
+                    "code": 2086,
+                    "message": "Double quote to prevent globbing.",
+                }
+            ]
+        }
+    )
+
+    assert list(parse_shellcheck(lines(output))) == [
+        Finding(
+            "shellcheck",
+            "scripts/setup.sh",
+            5,
+            3,
+            "SC2086",
+            "note",
+            "Double quote to prevent globbing.",
+        )
+    ]
+
+
+def test_parse_file_lists():
+    assert list(parse_shfmt(["scripts/a.sh\n", "\n"])) == [
+        Finding("shfmt", "scripts/a.sh", 0, 0, "format", "error", "not formatted")
+    ]
+    assert list(parse_terraform_fmt(["modules/compute/main.tf\n"])) == [
+        Finding(
+            "terraform",
+            "modules/compute/main.tf",
+            0,
+            0,
+            "fmt",
+            "error",
+            "not formatted",
+        )
+    ]
+
+
+def test_parse_terraform_validate():
+    output = json.dumps(
+        {
+            "valid": False,
+            "diagnostics": [
+                {
+                    "severity": "error",
+                    "summary": "Unsupported argument",
+                    "detail": 'An argument named "imgae" is not expected here.',
+                    "range": {
+                        "filename": "main.tf",
+                        "start": {"line": 14, "column": 3},
+                    },
+                },
+                {"severity": "warning", "summary": "Deprecated attribute"},
+            ],
+        }
+    )
+
+    assert list(parse_terraform_validate(lines(output))) == [
+        Finding(
+            "terraform",
+            "main.tf",
+            14,
+            3,
+            "validate",
+            "error",
+            'Unsupported argument: An argument named "imgae" is not expected here.',
+        ),
+        Finding("terraform", "", 0, 0, "validate", "warning", "Deprecated attribute"),
+    ]
+
+
+def test_parse_tflint():
+    output = json.dumps(
+        {
+            "issues": [
+                {
+                    "rule": {
+                        "name": "terraform_typed_variables",
+                        "severity": "warning",
+                    },
+                    "message": 'variable "zone" should have a type',
+                    "range": {"filename": "variables.tf", "start": {"line": 2}},
+                }
+            ],
+            "errors": [{"message": "Failed to load configurations", "range": None}],
+        }
+    )
+
+    assert list(parse_tflint(lines(output))) == [
+        Finding(
+            "tflint",
+            "variables.tf",
+            2,
+            0,
+            "terraform_typed_variables",
+            "warning",
+            'variable "zone" should have a type',
+        ),
+        Finding("tflint", "", 0, 0, "error", "error", "Failed to load configurations"),
+    ]
+
+
+def test_parse_pymarkdown():
+    output = (
+        "docs/index.md:10:1: MD022: Headings should be surrounded by blank lines.\n"
+    )
+
+    assert list(parse_pymarkdown(lines(output))) == [
+        Finding(
+            "pymarkdown",
+            "docs/index.md",
+            10,
+            1,
+            "MD022",
+            "warning",
+            "Headings should be surrounded by blank lines.",
+        )
+    ]
+
+
+@pytest.mark.parametrize(
+    "parser",
+    [parse_ansible_lint, parse_shellcheck, parse_terraform_validate, parse_tflint],
+)
+def test_empty_json_output_has_no_findings(parser):
+    assert list(parser([])) == []
+    assert list(parser(["\n"])) == []
+
+
+def test_json_output_is_parsed_from_arbitrary_chunks():
+    output = json.dumps(
+        {
+            "version": "0.41.0",
+            "issues": [
+                {
+                    "rule": {"name": "terraform_typed_variables"},
+                    "message": f"variable {index} should have a type",
+                    "range": {"filename": "variables.tf", "start": {"line": index}},
+                }
+                for index in range(3)
+            ],
+            "errors": [],
+        }
+    )
+
+    findings = list(parse_tflint(iter(output)))
+
+    assert [finding.line for finding in findings] == [0, 1, 2]
+    assert findings == list(parse_tflint([output]))
+
+
+def test_json_findings_are_yielded_before_the_document_ends():
+    chunks = ['[{"check_name": "yaml", "severity": "minor",', ' "location": {}}, {']
+
+    finding = next(parse_ansible_lint(iter(chunks)))
+
+    assert finding.rule == "yaml"
+
+
+def test_truncated_json_output_raises():
+    with pytest.raises(ValueError):
+        list(parse_shellcheck(['{"comments": [{"file": "a.sh"', ', "line": 1']))
+
+
+def test_line_output_is_reassembled_across_chunks():
+    output = "a.yml:1:2: [error] too many spaces (commas)\nb.yml:3:4: [warning] x (y)"
+
+    findings = list(parse_yamllint([output[:10], output[10:50], output[50:]]))
+
+    assert [(finding.path, finding.line) for finding in findings] == [
+        ("a.yml", 1),
+        ("b.yml", 3),
+    ]
+
+
+def test_summarize_orders_by_errors():
+    findings = [
+        Finding("ruff", "b.py", 1, 1, "F401", "warning", "x"),
+        Finding("ruff", "a.py", 1, 1, "F401", "error", "x"),
+        Finding("ruff", "a.py", 2, 1, "F401", "error", "x"),
+        Finding("ruff", "c.py", 1, 1, "F401", "error", "x"),
+    ]
+
+    summary = summarize(findings)
+
+    assert list(summary) == ["a.py", "c.py", "b.py"]
+    assert summary["a.py"] == {"error": 2, "warning": 0, "note": 0}
+
+
+def test_write_sarif_groups_runs_by_tool(tmp_path):
+    findings = [
+        Finding("yamllint", "a.yml", 4, 2, "truthy", "warning", "truthy value"),
+        Finding("shfmt", "b.sh", 0, 0, "format", "error", "not formatted"),
+        Finding("yamllint", "c.yml", 1, 0, "truthy", "warning", "truthy value"),
+    ]
+
+    path = write_sarif(findings, tmp_path / "out" / "lint.sarif")
+    sarif = json.loads(path.read_text())
+
+    assert sarif["version"] == "2.1.0"
+    assert [run["tool"]["driver"]["name"] for run in sarif["runs"]] == [
+        "shfmt",
+        "yamllint",
+    ]
+    shfmt, yamllint = sarif["runs"]
+    assert shfmt["results"][0]["locations"][0]["physicalLocation"] == {
+        "artifactLocation": {"uri": "b.sh"}
+    }
+    assert yamllint["tool"]["driver"]["rules"] == [{"id": "truthy"}]
+    assert [
+        result["locations"][0]["physicalLocation"].get("region")
+        for result in yamllint["results"]
+    ] == [{"startLine": 4, "startColumn": 2}, {"startLine": 1}]
+
+
+def test_write_sarif_without_findings(tmp_path):
+    sarif = json.loads(write_sarif([], tmp_path / "lint.sarif").read_text())
+
+    assert sarif["runs"] == []
@@ -0,0 +1,93 @@
+"""Tests for the deploy history database"""
+
+import pytest
+
+from scripts.common.history import DeployHistory, percentile
+from scripts.common.tracing import Tracer
+
+pytestmark = pytest.mark.unit
+
+
+def record_run(history: DeployHistory, phases: dict[str, float], **tasks: float):
+    """Store a run whose phases (and tasks on web1) took the given seconds"""
+    tracer = Tracer("apply")
+    start = 1000.0
+    for name, seconds in phases.items():
+        tracer.add_span(name, "phase", start, start + seconds)
+        for task, task_seconds in tasks.items():
+            tracer.add_span(
+                task, "task", start, start + task_seconds, host="web1", status="ok"
+            )
+        start += seconds
+    return history.record(
+        "apply", "production", tracer, 1000.0, start, True, {"web1": "web"}
+    )
+
+
+@pytest.fixture
+def history(tmp_path):
+    return DeployHistory(tmp_path / "history.db")
+
+
+def test_percentile_interpolates():
+    assert percentile([1.0], 95) == 1.0
+    assert percentile([4.0, 1.0, 3.0, 2.0], 50) == 2.5
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 100) == 5.0
+
+
+def test_tasks_are_attributed_to_their_phase_and_domain(history):
+    record_run(history, {"ansible": 10.0}, setup=4.0)
+
+    assert history.durations("apply", "production", "phase") == {"ansible": [(1, 10.0)]}
+    assert history.durations("apply", "production", "domain") == {"web": [(1, 4.0)]}
+    assert history.durations("apply", "production", "task") == {"setup": [(1, 4.0)]}
+
+
+def test_regression_beyond_threshold_sigma_is_flagged(history):
+    for seconds in (10.0, 11.0, 9.0, 10.0, 11.0, 9.0):
+        record_run(history, {"terraform": seconds, "ansible": 20.0 + seconds % 2})
+    record_run(history, {"terraform": 30.0, "ansible": 20.5})
+
+    (flagged,) = history.regressions("apply", "production", min_samples=5)
+
+    assert flagged["name"] == "terraform"
+    assert flagged["mean"] == pytest.approx(10.0)
+    assert flagged["sigma"] == pytest.approx(20.0 / flagged["stdev"])
+
+
+def test_small_changes_are_not_flagged(history):
+    for seconds in (10.0, 11.0, 9.0, 10.0, 11.0, 9.0, 11.0):
+        record_run(history, {"terraform": seconds})
+
+    assert history.regressions("apply", "production") == []
+
+
+def test_flat_baseline_reports_no_sigma(history):
+    for _ in range(5):
+        record_run(history, {"terraform": 10.0, "ansible": 10.0})
+    record_run(history, {"terraform": 12.0, "ansible": 10.0})
+
+    (flagged,) = history.regressions("apply", "production")
+
+    assert flagged["name"] == "terraform"
+    assert flagged["stdev"] == 0
+    assert flagged["sigma"] is None
+
+
+def test_too_few_samples_are_not_judged(history):
+    for seconds in (10.0, 10.5, 50.0):
+        record_run(history, {"terraform": seconds})
+
+    assert history.regressions("apply", "production", min_samples=5) == []
+
+
+def test_window_limits_the_baseline(history):
+    # An old slow run outside the window no longer widens the baseline
+    for seconds in (100.0, 10.0, 11.0, 9.0, 10.0, 11.0, 9.0):
+        record_run(history, {"terraform": seconds})
+    record_run(history, {"terraform": 20.0})
+
+    assert history.regressions("apply", "production", window=20) == []
+    assert [
+        item["name"] for item in history.regressions("apply", "production", window=6)
+    ] == ["terraform"]
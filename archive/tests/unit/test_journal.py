@@ -0,0 +1,80 @@
+"""Tests for the deployment run journal"""
+
+import json
+
+import pytest
+
+from scripts.common.journal import RunJournal, fingerprint
+
+pytestmark = pytest.mark.unit
+
+
+def test_fingerprint_tracks_content_and_extras(tmp_path):
+    config = tmp_path / "main.tf"
+    config.write_text("a")
+    original = fingerprint([config], "production")
+
+    assert fingerprint([config], "production") == original
+    assert fingerprint([config], "staging") != original
+    config.write_text("b")
+    assert fingerprint([config], "production") != original
+
+
+def test_fingerprint_ignores_order_and_marks_missing_files(tmp_path):
+    first, second = tmp_path / "a", tmp_path / "b"
+    first.write_text("1")
+    second.write_text("2")
+
+    assert fingerprint([first, second]) == fingerprint([second, first])
+    assert fingerprint([tmp_path / "missing"]) != fingerprint([])
+
+
+def test_resume_picks_up_an_unfinished_run(tmp_path):
+    journal = RunJournal(tmp_path, "apply")
+    assert not journal.start({"env": "production"})
+    journal.complete_phase("terraform", "abc")
+    journal.complete_hosts("ansible", ["web1"])
+    journal.finish(success=False)
+
+    resumed = RunJournal(tmp_path, "apply")
+    assert resumed.start({"env": "production"}, resume=True)
+    assert resumed.phase_done("terraform", "abc")
+    assert resumed.hosts_done("ansible") == ["web1"]
+
+
+def test_changed_inputs_invalidate_a_phase(tmp_path):
+    journal = RunJournal(tmp_path, "apply")
+    journal.start({})
+    journal.complete_phase("terraform", "abc")
+
+    assert not journal.phase_done("terraform", "def")
+    assert not journal.phase_done("ansible", "abc")
+
+
+@pytest.mark.parametrize(
+    ("args", "finished"),
+    [({"env": "staging"}, False), ({"env": "production"}, True)],
+)
+def test_resume_starts_over(tmp_path, args, finished):
+    journal = RunJournal(tmp_path, "apply")
+    journal.start({"env": "production"})
+    journal.complete_phase("terraform")
+    journal.finish(success=finished)
+
+    fresh = RunJournal(tmp_path, "apply")
+    assert not fresh.start(args, resume=True)
+    assert not fresh.phase_done("terraform")
+
+
+def test_checkpoints_are_written_immediately(tmp_path):
+    journal = RunJournal(tmp_path, "apply")
+    journal.start({})
+    journal.complete_hosts("ansible", ["web1", "web2"])
+    journal.complete_hosts("ansible", ["web2", "web3"])
+    journal.complete_domain("ansible", "web")
+    journal.complete_domain("ansible", "web")
+
+    data = json.loads((tmp_path / "apply.json").read_text())
+    assert data["hosts"]["ansible"] == ["web1", "web2", "web3"]
+    assert data["domains"]["ansible"] == ["web"]
+    assert data["status"] == "running"
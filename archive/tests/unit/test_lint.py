@@ -0,0 +1,163 @@
+"""Tests for the lint orchestrator"""
+
+import threading
+import time
+
+import pytest
+
+from scripts.commands import lint
+from scripts.commands.lint import LintManager
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def manager(tmp_path, logger):
+    return LintManager(tmp_path, logger, use_cache=False)
+
+
+def fake_linter(name: str, delay: float = 0.0, barrier=None, success=True):
+    """A linter that logs its name, optionally after waiting on the others"""
+
+    def run(manager, target, verbose, fix, strict):
+        if barrier:
+            barrier.wait(timeout=5)
+        time.sleep(delay)
+        manager.logger.info(f"{name} output")
+        return success
+
+    return run
+
+
+def test_linters_run_concurrently_and_replay_output_in_order(
+    manager, logger, tmp_path, monkeypatch, caplog
+):
+    barrier = threading.Barrier(2)
+    linters = {
+        "run_ruff_lint": fake_linter("ruff", delay=0.2, barrier=barrier),
+        "run_yaml_lint": fake_linter("yamllint", barrier=barrier, success=False),
+        "run_ansible_lint": fake_linter("ansible-lint"),
+        "run_terraform_lint": fake_linter("terraform"),
+        "run_shell_lint": fake_linter("shellcheck"),
+        "run_markdown_lint": fake_linter("pymarkdown"),
+    }
+    for method, linter in linters.items():
+        monkeypatch.setattr(LintManager, method, linter)
+    monkeypatch.setattr(LintManager, "check_prerequisites", lambda self: {})
+
+    # ruff and yamllint can only pass the barrier by running at the same time
+    success = manager.run_all_linters(jobs=6, sarif=tmp_path / "lint.sarif")
+    logger.flush()
+
+    assert not success
+    outputs = [
+        record.getMessage()
+        for record in caplog.records
+        if record.getMessage().endswith(" output")
+    ]
+    assert outputs == [
+        "ruff output",
+        "yamllint output",
+        "ansible-lint output",
+        "terraform output",
+        "shellcheck output",
+        "pymarkdown output",
+    ]
+    assert "❌ YAML (yamllint) failed" in caplog.text
+    assert (tmp_path / "lint.sarif").exists()
+
+
+def arg_cost(args: list[str]) -> int:
+    """Bytes a command line takes: strings, NUL terminators and pointers"""
+    return sum(len(arg) + 1 + 8 for arg in args)
+
+
+def test_chunked_keeps_every_command_line_under_the_budget(monkeypatch):
+    cmd = ["shellcheck", "-f", "json1"]
+    paths = [f"scripts/s{index:03}.sh" for index in range(50)]
+    budget = arg_cost(cmd) + 3 * arg_cost(paths[:1]) + 5
+    monkeypatch.setattr(lint.os, "environ", {})
+    monkeypatch.setattr(lint.os, "sysconf", lambda name: budget + 4096)
+
+    chunks = list(LintManager._chunked(cmd, paths))
+
+    assert len(chunks) == 17
+    assert all(chunk[: len(cmd)] == cmd for chunk in chunks)
+    assert all(arg_cost(chunk) <= budget for chunk in chunks)
+    assert [path for chunk in chunks for path in chunk[len(cmd) :]] == paths
+
+
+def test_chunked_counts_the_environment_against_the_budget(monkeypatch):
+    cmd = ["shfmt", "-l"]
+    paths = ["a.sh", "b.sh"]
+    budget = arg_cost(cmd) + arg_cost(paths)
+    monkeypatch.setattr(lint.os, "sysconf", lambda name: budget + 4096)
+
+    monkeypatch.setattr(lint.os, "environ", {})
+    assert list(LintManager._chunked(cmd, paths)) == [cmd + paths]
+
+    monkeypatch.setattr(lint.os, "environ", {"HOME": "/root"})
+    assert list(LintManager._chunked(cmd, paths)) == [cmd + ["a.sh"], cmd + ["b.sh"]]
+
+
+def test_terraform_scratch_mirrors_sources_and_keeps_init_output(manager, tmp_path):
+    source = tmp_path / "terraform"
+    for name in ["main.tf", "modules/vpc/main.tf", "terraform.tfstate"]:
+        (source / name).parent.mkdir(parents=True, exist_ok=True)
+        (source / name).write_text(name)
+    (source / ".terraform" / "providers").mkdir(parents=True)
+
+    scratch = manager._terraform_scratch()
+    (scratch / ".terraform.lock.hcl").write_text("lock")
+    (source / "modules/vpc/main.tf").unlink()
+    (source / "variables.tf").write_text("variable")
+    manager._terraform_scratch()
+
+    files = sorted(
+        str(path.relative_to(scratch)) for path in scratch.rglob("*") if path.is_file()
+    )
+    assert scratch == tmp_path / ".terraform" / "lint" / "src"
+    assert files == [".terraform.lock.hcl", "main.tf", "variables.tf"]
+
+
+def test_terraform_module_inits_only_when_validate_needs_it(
+    manager, tmp_path, monkeypatch
+):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    calls = tmp_path / "terraform.calls"
+    terraform = bin_dir / "terraform"
+    terraform.write_text(
+        "#!/bin/sh\n"
+        f'echo "$1" >> {calls}\n'
+        'if [ "$1" = init ]; then mkdir -p "$TF_DATA_DIR"; : > "$TF_DATA_DIR/ok"; '
+        "exit 0; fi\n"
+        'if [ -e "$TF_DATA_DIR/ok" ]; then echo \'{"diagnostics": []}\'; exit 0; fi\n'
+        'echo \'{"diagnostics": [{"severity": "error", "summary": '
+        '"Module not installed", "detail": "Run terraform init."}]}\'\n'
+        "exit 1\n"
+    )
+    terraform.chmod(0o755)
+    # tflint is looked up on this process's PATH, so it is skipped
+    monkeypatch.setenv("PATH", str(bin_dir))
+    module = tmp_path / "terraform" / "modules" / "vpc"
+    module.mkdir(parents=True)
+    (module / "main.tf").write_text("")
+    scratch = manager._terraform_scratch()
+    env = {"PATH": f"{bin_dir}:/usr/bin:/bin"}
+    data_dir = tmp_path / ".terraform" / "lint" / "terraform-modules-vpc"
+
+    # No data directory yet: init up front
+    assert manager._check_terraform_module(module, scratch, env) == (True, [], [])
+    assert calls.read_text().split() == ["init", "validate"]
+
+    # Initialised: validate only
+    calls.unlink()
+    assert manager._check_terraform_module(module, scratch, env)[0]
+    assert calls.read_text().split() == ["validate"]
+
+    # Stale data directory: validate asks for init, which runs once
+    calls.unlink()
+    (data_dir / "ok").unlink()
+    assert manager._check_terraform_module(module, scratch, env)[0]
+    assert calls.read_text().split() == ["validate", "init", "validate"]
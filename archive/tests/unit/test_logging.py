@@ -0,0 +1,178 @@
+"""Tests for log rotation"""
+
+import json
+import os
+import subprocess
+import time
+
+import pytest
+
+from scripts.common.archive import open_log
+from scripts.common.logging import LogCleaner
+
+pytestmark = pytest.mark.unit
+
+DAY = 86400
+
+
+def make_log(log_dir, name: str, age_days: float = 0, content: str = "line\n"):
+    path = log_dir / name
+    path.write_text(content)
+    stamp = time.time() - age_days * DAY
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    path = tmp_path / "logs"
+    path.mkdir()
+    return path
+
+
+def test_scan_groups_logs_by_tool_newest_first(log_dir):
+    make_log(log_dir, "deploy-20261001_120000.log", age_days=2)
+    make_log(log_dir, "deploy-20261002_120000.log", age_days=1)
+    make_log(log_dir, "lint-20261002_120000.log")
+    make_log(log_dir, "lint-20261002_120000.sarif")
+    make_log(log_dir, "notes.txt")
+
+    groups, others = LogCleaner(log_dir).scan()
+
+    assert [name for _, name in groups["deploy"]] == [
+        "deploy-20261002_120000.log",
+        "deploy-20261001_120000.log",
+    ]
+    assert [name for _, name in groups["lint"]] == ["lint-20261002_120000.log"]
+    assert [name for _, name in others] == ["lint-20261002_120000.sarif"]
+
+
+def test_expired_by_count_and_age():
+    now = time.time()
+    files = [(now, "c"), (now - DAY, "b"), (now - 10 * DAY, "a")]
+
+    assert LogCleaner.expired(files, 2, 30) == ["a"]
+    assert LogCleaner.expired(files, None, 7) == ["a"]
+    assert LogCleaner.expired(files, 1, 30) == ["b", "a"]
+
+
+def test_cleanup_archives_old_logs_and_removes_old_reports(log_dir):
+    for day in range(1, 5):
+        make_log(
+            log_dir,
+            f"deploy-2026100{day}_120000.log",
+            age_days=5 - day,
+            content=f"run {day}\n",
+        )
+    make_log(log_dir, "deploy-report-20260901.txt", age_days=40)
+
+    cleaner = LogCleaner(log_dir)
+    removed = cleaner.cleanup_logs(max_files_per_type=2, max_age_days=30)
+
+    assert removed == 3
+    assert sorted(path.name for path in log_dir.glob("*.log")) == [
+        "deploy-20261003_120000.log",
+        "deploy-20261004_120000.log",
+    ]
+    assert not (log_dir / "deploy-report-20260901.txt").exists()
+
+    (archive, _size), _next_day = cleaner.archive.archives("deploy")
+    with open_log(archive) as f:
+        assert f.read() == "==> deploy-20261001_120000.log <==\nrun 1\n"
+
+    manifest = json.loads(cleaner.manifest_file.read_text())
+    assert [name for _, name in manifest["deploy"]] == [
+        "deploy-20261004_120000.log",
+        "deploy-20261003_120000.log",
+    ]
+
+
+def test_traces_and_sarif_files_are_archived_with_their_log(log_dir):
+    for day in (1, 2):
+        stamp = f"2026100{day}_120000"
+        make_log(log_dir, f"lint-{stamp}.log", age_days=3 - day)
+        make_log(log_dir, f"lint-{stamp}.sarif", age_days=3 - day, content="{}\n")
+    make_log(log_dir, "deploy-20260901_120000.trace.json", age_days=40)
+    make_log(log_dir, "deploy-20261002_120000.trace.json", age_days=1)
+
+    cleaner = LogCleaner(log_dir)
+    removed = cleaner.cleanup_logs(max_files_per_type=1, max_age_days=30)
+
+    assert removed == 3
+    assert sorted(path.name for path in log_dir.glob("[!.]*") if path.is_file()) == [
+        "deploy-20261002_120000.trace.json",
+        "lint-20261002_120000.log",
+        "lint-20261002_120000.sarif",
+    ]
+    assert [
+        path.name.removesuffix(cleaner.archive.suffix)
+        for path, _size in cleaner.archive.archives()
+    ] == ["deploy-20260901.trace.json", "lint-20261001.log", "lint-20261001.sarif"]
+    ((sarif, _size),) = cleaner.archive.archives("lint", kind=".sarif")
+    with open_log(sarif) as f:
+        assert f.read() == "==> lint-20261001_120000.sarif <==\n{}\n"
+
+
+def test_cleanup_archives_logs_left_claimed_by_a_crash(log_dir):
+    dead = subprocess.Popen(["true"])
+    dead.wait()
+    make_log(log_dir, f".deploy-20261001_120000.log.{dead.pid}.archiving", 40)
+    make_log(log_dir, ".deploy-20261002_120000.log.archiving", 40)
+    busy = make_log(log_dir, f".deploy-20261003_120000.log.{os.getpid()}.archiving", 40)
+
+    cleaner = LogCleaner(log_dir)
+    removed = cleaner.cleanup_logs(max_age_days=30)
+
+    assert removed == 2
+    assert sorted(path.name for path in log_dir.iterdir() if path.is_file()) == [
+        busy.name,
+        ".last-cleanup",
+        ".manifest.json",
+    ]
+    (archive, _size), *_ = cleaner.archive.archives("deploy")
+    with open_log(archive) as f:
+        assert "==> deploy-20261001_120000.log <==" in f.read()
+
+
+def test_rotate_between_full_passes_uses_the_manifest(log_dir):
+    cleaner = LogCleaner(log_dir)
+    make_log(log_dir, "deploy-20261001_120000.log", age_days=1)
+    cleaner.cleanup_logs(max_files_per_type=2)
+
+    # Not listed in the manifest, so a rotation between passes leaves it alone
+    make_log(log_dir, "deploy-20260930_120000.log", age_days=2)
+
+    # The limit applies to the logs already there, before the new one starts
+    new_log = log_dir / "deploy-20261002_120000.log"
+    assert cleaner.rotate(new_log, max_files_per_type=1) == 0
+    new_log.write_text("")
+    third = log_dir / "deploy-20261003_120000.log"
+    assert cleaner.rotate(third, max_files_per_type=1) == 1
+
+    assert not (log_dir / "deploy-20261001_120000.log").exists()
+    assert (log_dir / "deploy-20260930_120000.log").exists()
+    manifest = json.loads(cleaner.manifest_file.read_text())
+    assert [name for _, name in manifest["deploy"]] == [
+        "deploy-20261003_120000.log",
+        "deploy-20261002_120000.log",
+    ]
+
+
+def test_rotate_runs_a_full_pass_once_the_interval_passed(log_dir):
+    cleaner = LogCleaner(log_dir)
+    for day in range(1, 4):
+        make_log(log_dir, f"lint-2026100{day}_120000.log", age_days=4 - day)
+    cleaner.marker_file.touch()
+    stamp = time.time() - LogCleaner.CLEANUP_INTERVAL - 1
+    os.utime(cleaner.marker_file, (stamp, stamp))
+
+    removed = cleaner.rotate(log_dir / "lint-20261004_120000.log", max_files_per_type=2)
+
+    # The full pass keeps two logs, then the new one is recorded on top of them
+    assert removed == 1
+    manifest = json.loads(cleaner.manifest_file.read_text())
+    assert [name for _, name in manifest["lint"]] == [
+        "lint-20261004_120000.log",
+        "lint-20261003_120000.log",
+        "lint-20261002_120000.log",
+    ]
@@ -0,0 +1,176 @@
+"""Tests for the playbook indexer"""
+
+import json
+from textwrap import dedent
+
+import pytest
+
+from scripts.common.playbooks import POOL_THRESHOLD, PlaybookIndex, parse
+
+pytestmark = pytest.mark.unit
+
+SITE = """\
+- name: Base setup
+  hosts: all
+  pre_tasks:
+    - name: Refresh facts
+      ansible.builtin.setup:
+  tasks:
+    - name: Harden
+      block:
+        - name: Configure sshd
+          ansible.builtin.template:
+            src: sshd_config.j2
+      rescue:
+        - name: Report failure
+          ansible.builtin.debug:
+    - name: Common tasks
+      ansible.builtin.include_tasks: tasks/common.yml
+
+- name: Web tier
+  ansible.builtin.import_playbook: web.yml
+"""
+
+
+def write(root, relative: str, content: str):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(dedent(content))
+    return path
+
+
+@pytest.fixture
+def ansible_dir(tmp_path):
+    root = tmp_path / "ansible"
+    write(root, "playbooks/site.yml", SITE)
+    write(
+        root,
+        "playbooks/web.yml",
+        """\
+        - hosts: web
+          tasks:
+            - name: Install nginx
+              ansible.builtin.package:
+                name: nginx
+            - import_tasks: "{{ role_path }}/extra.yml"
+            - import_tasks: missing.yml
+        """,
+    )
+    write(
+        root,
+        "playbooks/tasks/common.yml",
+        """\
+        - name: Set timezone
+          ansible.builtin.timezone:
+            name: UTC
+        - name: Shared tasks
+          ansible.builtin.import_tasks:
+            file: shared/base.yml
+        """,
+    )
+    # Outside playbooks/, found relative to the ansible directory
+    write(root, "shared/base.yml", "- name: Install base packages\n  package: {}\n")
+    return root
+
+
+@pytest.fixture
+def index(ansible_dir, tmp_path):
+    return PlaybookIndex(ansible_dir, tmp_path / "cache" / "playbooks.json")
+
+
+def test_parse_collects_plays_tasks_and_includes():
+    result = parse(SITE.encode())
+
+    (play,) = result["plays"]
+    assert play["name"] == "Base setup"
+    assert play["hosts"] == "all"
+    assert play["tasks"] == [
+        "Refresh facts",
+        "Harden",
+        "Configure sshd",
+        "Report failure",
+        "Common tasks",
+    ]
+    assert play["includes"] == [["include_tasks", "tasks/common.yml", "Common tasks"]]
+    assert result["includes"] == [["import_playbook", "web.yml", "Web tier"]]
+    assert result["error"] is None
+
+
+def test_parse_reports_yaml_errors():
+    result = parse(b"- name: [unclosed\n")
+
+    assert result["plays"] == []
+    assert result["error"]
+
+
+def test_build_follows_includes(index, ansible_dir):
+    entries = index.build()
+
+    playbooks = ansible_dir / "playbooks"
+    assert ansible_dir / "shared" / "base.yml" in entries
+    assert index.playbooks() == [playbooks / "site.yml", playbooks / "web.yml"]
+    assert index.missing == [(playbooks / "web.yml", "missing.yml")]
+
+    site = playbooks / "site.yml"
+    assert index.expand_tasks(site, entries[site]["plays"][0]) == [
+        "Refresh facts",
+        "Harden",
+        "Configure sshd",
+        "Report failure",
+        "Common tasks",
+        "Set timezone",
+        "Shared tasks",
+        "Install base packages",
+    ]
+
+
+def test_unchanged_files_come_from_the_cache(index, ansible_dir, tmp_path):
+    index.build()
+    cache = json.loads(index.cache_file.read_text())
+    assert len(cache) == 4
+
+    # A cached result is trusted as long as the content hash matches
+    for result in cache.values():
+        for play in result["plays"]:
+            play["name"] = "from cache"
+    index.cache_file.write_text(json.dumps(cache))
+    write(ansible_dir, "playbooks/web.yml", "- hosts: web\n  name: Web\n")
+
+    entries = PlaybookIndex(ansible_dir, index.cache_file).build()
+
+    assert entries[ansible_dir / "playbooks" / "site.yml"]["plays"][0]["name"] == (
+        "from cache"
+    )
+    assert entries[ansible_dir / "playbooks" / "web.yml"]["plays"][0]["name"] == "Web"
+
+
+def test_stale_cache_entries_are_dropped(index, ansible_dir):
+    index.build()
+    before = set(json.loads(index.cache_file.read_text()))
+    write(ansible_dir, "playbooks/web.yml", "- hosts: web\n")
+    index.build()
+    after = set(json.loads(index.cache_file.read_text()))
+
+    # The old web.yml result is dropped and the new one takes its place
+    assert len(before - after) == 1
+    assert len(after - before) == 1
+
+
+def test_many_files_parse_in_a_process_pool(ansible_dir, tmp_path):
+    for number in range(POOL_THRESHOLD):
+        write(
+            ansible_dir,
+            f"playbooks/generated/play{number}.yml",
+            f"- hosts: group{number}\n  tasks:\n    - name: Task {number}\n",
+        )
+
+    index = PlaybookIndex(ansible_dir, tmp_path / "playbooks.json", jobs=2)
+    entries = index.build()
+
+    generated = ansible_dir / "playbooks" / "generated"
+    assert [
+        entries[generated / f"play{n}.yml"]["plays"][0]["tasks"] for n in (0, 7)
+    ] == [
+        ["Task 0"],
+        ["Task 7"],
+    ]
@@ -0,0 +1,112 @@
+"""Tests for streamed subprocess output"""
+
+import subprocess
+import sys
+
+import pytest
+
+from scripts.common.process import READ_SIZE, run_streaming
+
+pytestmark = pytest.mark.unit
+
+
+def python(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+def collect(cmd: list[str], **kwargs):
+    lines = []
+    result = run_streaming(
+        cmd, lambda stream, line: lines.append((stream, line)), **kwargs
+    )
+    return result, lines
+
+
+def test_lines_are_handed_over_per_stream():
+    result, lines = collect(
+        python(
+            "import sys\n"
+            "print('out 1', flush=True)\n"
+            "print('err 1', file=sys.stderr, flush=True)\n"
+            "sys.stdout.write('no newline')\n"
+        )
+    )
+
+    assert result.returncode == 0
+    assert result.lines == 3
+    assert sorted(lines) == [
+        ("stderr", "err 1"),
+        ("stdout", "no newline"),
+        ("stdout", "out 1"),
+    ]
+
+
+def test_only_the_tail_is_kept():
+    result, lines = collect(python("for i in range(1000): print(i)"), tail_lines=3)
+
+    assert len(lines) == result.lines == 1000
+    assert result.tail == ["997", "998", "999"]
+
+
+def test_overlong_lines_are_split():
+    result, lines = collect(python(f"print('x' * {READ_SIZE * 2 + 10})"))
+
+    assert [len(line) for _, line in lines] == [READ_SIZE, READ_SIZE, 10]
+    assert result.returncode == 0
+
+
+def test_stalled_partial_line_is_handed_over_before_exit():
+    # A prompt without a newline shows up while the command is still waiting
+    seen = []
+
+    def on_line(stream, line):
+        seen.append(line)
+
+    run_streaming(
+        python(
+            "import sys, time\n"
+            "sys.stdout.write('Continue? ')\n"
+            "sys.stdout.flush()\n"
+            "time.sleep(1)\n"
+            "print('done')\n"
+        ),
+        on_line,
+    )
+
+    assert seen == ["Continue? ", "done"]
+
+
+def test_check_raises_with_the_tail():
+    result, _ = collect(
+        python("import sys; print('boom', file=sys.stderr); sys.exit(3)")
+    )
+
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        result.check()
+    assert error.value.returncode == 3
+    assert error.value.stderr == "boom"
+
+
+def test_environment_and_directory_are_passed(tmp_path):
+    _, lines = collect(
+        python("import os; print(os.getcwd()); print(os.environ['ATL_TEST'])"),
+        cwd=tmp_path,
+        env={"ATL_TEST": "yes"},
+    )
+
+    assert [line for _, line in lines] == [str(tmp_path), "yes"]
+
+
+def test_missing_command_raises():
+    with pytest.raises(OSError):
+        run_streaming(["atl-no-such-command"], lambda stream, line: None)
+
+
+def test_logger_writes_command_output_to_its_log(logger):
+    logger.output("terraform", "Apply complete!")
+    logger.output("terraform", "debug detail", mirror=False)
+    logger.flush()
+
+    text = logger.log_file.read_text()
+    assert "INFO - terraform | Apply complete!" in text
+    assert "DEBUG - terraform | debug detail" in text
@@ -0,0 +1,97 @@
+"""Tests for rolling-batch scheduling"""
+
+import pytest
+
+from scripts.common.rollout import RollingScheduler, parse_amount
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize(
+    ("value", "total", "expected"),
+    [(2, 10, 2), ("3", 10, 3), ("25%", 10, 3), ("50%", 4, 2), ("0", 5, 0)],
+)
+def test_parse_amount(value, total, expected):
+    assert parse_amount(value, total) == expected
+
+
+def test_plan_takes_a_batch_from_every_group(logger):
+    scheduler = RollingScheduler(logger, batch_size="50%")
+    groups = {"web": ["web1", "web2", "web3", "web4"], "db": ["db1"]}
+
+    assert scheduler.plan(groups) == [["web1", "web2", "db1"], ["web3", "web4"]]
+
+
+def test_plan_runs_at_least_one_host_per_batch(logger):
+    scheduler = RollingScheduler(logger, batch_size="10%")
+
+    assert scheduler.plan({"web": ["a", "b"]}) == [["a"], ["b"]]
+
+
+def test_run_deploys_every_batch(logger):
+    scheduler = RollingScheduler(logger, batch_size=1)
+    deployed = []
+
+    def deploy(batch):
+        deployed.append(batch)
+        return []
+
+    result = scheduler.run({"web": ["a", "b"], "db": ["c"]}, deploy)
+
+    assert deployed == [["a", "c"], ["b"]]
+    assert result == {
+        "completed": ["a", "c", "b"],
+        "failed": [],
+        "pending": [],
+        "success": True,
+    }
+
+
+def test_run_stops_once_failures_exceed_the_budget(logger):
+    scheduler = RollingScheduler(logger, batch_size=1, max_failures=0)
+
+    result = scheduler.run({"web": ["a", "b", "c"]}, lambda batch: batch[:1])
+
+    assert result["failed"] == ["a"]
+    assert result["pending"] == ["b", "c"]
+    assert not result["success"]
+
+
+def test_run_continues_within_the_failure_budget(logger):
+    scheduler = RollingScheduler(logger, batch_size=1, max_failures="50%")
+
+    result = scheduler.run(
+        {"web": ["a", "b", "c", "d"]},
+        lambda batch: [host for host in batch if host in ("a", "b", "c")],
+    )
+
+    # 2 of 4 hosts may fail; the third failure stops the rollout
+    assert result["failed"] == ["a", "b", "c"]
+    assert result["completed"] == []
+    assert result["pending"] == ["d"]
+
+
+def test_run_stops_when_the_health_gate_fails(logger):
+    scheduler = RollingScheduler(logger, batch_size=1)
+    checked = []
+
+    def health_gate(hosts):
+        checked.append(hosts)
+        return False
+
+    result = scheduler.run({"web": ["a", "b"]}, lambda batch: [], health_gate)
+
+    assert checked == [["a"]]
+    assert result["completed"] == ["a"]
+    assert result["pending"] == ["b"]
+    assert not result["success"]
+
+
+def test_health_gate_is_skipped_after_the_last_batch(logger):
+    scheduler = RollingScheduler(logger, batch_size="100%")
+
+    result = scheduler.run(
+        {"web": ["a", "b"]}, lambda batch: [], lambda hosts: pytest.fail("gated")
+    )
+
+    assert result["success"]
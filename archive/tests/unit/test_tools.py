@@ -0,0 +1,83 @@
+"""Tests for lint tool resolution"""
+
+import pytest
+
+from scripts.common.tools import ToolResolver
+
+pytestmark = pytest.mark.unit
+
+
+def executable(path, script="exit 0"):
+    """Write an executable shell script"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"#!/bin/sh\n{script}\n")
+    path.chmod(0o755)
+    return path
+
+
+@pytest.fixture
+def bin_dir(tmp_path, monkeypatch):
+    """A PATH holding only the executables a test puts there"""
+    path = tmp_path / "bin"
+    path.mkdir()
+    monkeypatch.setenv("PATH", str(path))
+    return path
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    return root
+
+
+def fake_uv(bin_dir, check_exit):
+    """Install a uv that logs its arguments and fails --check as told"""
+    calls = bin_dir / "uv.calls"
+    executable(
+        bin_dir / "uv",
+        f'echo "$*" >> {calls}\n[ "$2" = "--check" ] && exit {check_exit}\nexit 0',
+    )
+    return calls
+
+
+def test_falls_back_to_path_then_uv_run_without_a_venv_binary(project, bin_dir, logger):
+    ruff = executable(bin_dir / "ruff")
+    tools = ToolResolver(project, logger)
+
+    assert tools.command("ruff") == [str(ruff)]
+    assert tools.command("shfmt") == ["uv", "run", "shfmt"]
+
+
+def test_prefers_the_venv_binary_when_in_sync(project, bin_dir, logger):
+    executable(bin_dir / "ruff")
+    venv_ruff = executable(project / ".venv" / "bin" / "ruff")
+    (project / "uv.lock").touch()
+    calls = fake_uv(bin_dir, check_exit=0)
+    tools = ToolResolver(project, logger)
+
+    assert tools.command("ruff") == [str(venv_ruff)]
+    assert tools.command("ruff") == [str(venv_ruff)]
+    assert calls.read_text().splitlines() == ["sync --check"]
+
+
+@pytest.mark.parametrize("check_exit", [1, 2])
+def test_failed_sync_check_runs_tools_through_uv_without_syncing(
+    project, bin_dir, logger, check_exit
+):
+    executable(project / ".venv" / "bin" / "ruff")
+    (project / "uv.lock").touch()
+    calls = fake_uv(bin_dir, check_exit)
+    tools = ToolResolver(project, logger)
+
+    assert tools.command("ruff") == ["uv", "run", "ruff"]
+    assert tools.resolve("yamllint") is None
+    assert calls.read_text().splitlines() == ["sync --check"]
+
+
+def test_sync_check_is_skipped_without_a_lockfile(project, bin_dir, logger):
+    venv_ruff = executable(project / ".venv" / "bin" / "ruff")
+    calls = fake_uv(bin_dir, check_exit=1)
+
+    assert ToolResolver(project, logger).command("ruff") == [str(venv_ruff)]
+    assert not calls.exists()
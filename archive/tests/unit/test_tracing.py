@@ -0,0 +1,171 @@
+"""Tests for span tracing and Chrome trace export"""
+
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from scripts.common import tracing
+from scripts.common.tracing import Tracer
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Make time.time() return 100.0, 101.0, 102.0... on successive calls"""
+    ticks = iter(range(100, 1000))
+    monkeypatch.setattr(tracing.time, "time", lambda: float(next(ticks)))
+
+
+def test_nested_spans_are_timed_and_contained(clock):
+    tracer = Tracer("apply")
+
+    with tracer.span("deploy") as outer:
+        with tracer.span("ansible", hosts=2) as inner:
+            inner["exit_code"] = 0
+        outer["domains"] = 1
+
+    inner, outer = tracer.spans
+    assert (outer["name"], outer["cat"], outer["ph"]) == ("deploy", "phase", "X")
+    assert outer["ts"] == 100_000_000
+    assert outer["dur"] == 3_000_000
+    assert inner["ts"] == 101_000_000
+    assert inner["dur"] == 1_000_000
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert inner["tid"] == outer["tid"]
+    assert inner["args"] == {"hosts": 2, "exit_code": 0, "status": "ok"}
+    assert outer["args"] == {"domains": 1, "status": "ok"}
+
+
+def test_span_records_errors(clock):
+    tracer = Tracer("apply")
+
+    with pytest.raises(RuntimeError), tracer.span("terraform"):
+        raise RuntimeError("boom")
+
+    assert tracer.spans[0]["args"]["status"] == "error"
+
+
+def test_add_span_assigns_one_track_per_name():
+    tracer = Tracer("apply")
+
+    tracer.add_span("setup", "task", 10.0, 12.5, track="web1", status="ok")
+    tracer.add_span("nginx", "task", 12.5, 13.0, track="web2")
+    tracer.add_span("reload", "task", 13.0, 12.0, track="web1")
+
+    setup, nginx, reload = tracer.spans
+    assert setup["ts"] == 10_000_000
+    assert setup["dur"] == 2_500_000
+    assert setup["args"] == {"status": "ok"}
+    assert setup["tid"] == reload["tid"] != nginx["tid"]
+    assert reload["dur"] == 0
+
+
+def test_add_span_defaults_to_the_current_thread():
+    tracer = Tracer("lint")
+
+    worker = threading.Thread(
+        target=tracer.add_span, args=("ruff", "linter", 1.0, 2.0), name="ruff"
+    )
+    worker.start()
+    worker.join()
+    tracer.add_span("total", "phase", 1.0, 3.0)
+
+    ruff, total = tracer.spans
+    assert ruff["tid"] != total["tid"]
+    assert tracer.slowest(1) == [total]
+
+
+def test_load_ansible_events_turns_tasks_into_spans(tmp_path):
+    events = tmp_path / "events.jsonl"
+    events.write_text(
+        "\n".join(
+            [
+                json.dumps(
+                    {
+                        "event": "task",
+                        "host": "web1",
+                        "task": "Install nginx",
+                        "role": "web",
+                        "play": "site",
+                        "start": 10.0,
+                        "end": 14.0,
+                        "status": "changed",
+                    }
+                ),
+                "not json",
+                json.dumps(
+                    {
+                        "event": "task",
+                        "host": "db1",
+                        "task": "Gather facts",
+                        "start": 10.0,
+                        "end": 11.0,
+                    }
+                ),
+                json.dumps({"event": "stats", "host": "web1", "changed": 1}),
+            ]
+        )
+        + "\n"
+    )
+    tracer = Tracer("apply")
+
+    hosts = tracer.load_ansible_events(events)
+
+    assert hosts == {"web1": {"event": "stats", "host": "web1", "changed": 1}}
+    web, db = tracer.spans
+    assert web["name"] == "web : Install nginx"
+    assert web["cat"] == "task"
+    assert web["dur"] == 4_000_000
+    assert web["args"] == {
+        "host": "web1",
+        "play": "site",
+        "role": "web",
+        "status": "changed",
+    }
+    assert db["name"] == "Gather facts"
+    assert db["args"]["status"] == "ok"
+    assert web["tid"] != db["tid"]
+
+
+def test_ansible_events_enables_the_callback_and_collects_its_output(tmp_path):
+    tracer = Tracer("apply")
+    env = {"ANSIBLE_CALLBACKS_ENABLED": "profile_tasks"}
+
+    with tracer.ansible_events(env, tmp_path / "callback") as run:
+        events_file = env["ATL_TRACE_FILE"]
+        with open(events_file, "w") as f:
+            f.write(json.dumps({"event": "stats", "host": "web1", "failures": 0}))
+
+    assert env["ANSIBLE_CALLBACK_PLUGINS"] == str(tmp_path / "callback")
+    assert env["ANSIBLE_CALLBACKS_ENABLED"] == "profile_tasks,atl_trace"
+    assert run["hosts"] == {"web1": {"event": "stats", "host": "web1", "failures": 0}}
+    assert not Path(events_file).exists()
+
+
+def test_write_exports_chrome_trace_events(tmp_path):
+    tracer = Tracer("apply")
+    tracer.add_span("terraform", "phase", 5.0, 7.0, track="main")
+    tracer.add_span("setup", "task", 5.5, 6.0, track="web1", host="web1")
+
+    path = tracer.write(tmp_path / "apply.trace.json")
+
+    trace = json.loads(path.read_text())
+    assert trace["displayTimeUnit"] == "ms"
+    metadata = [e for e in trace["traceEvents"] if e["ph"] == "M"]
+    spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert {(e["name"], e["args"]["name"]) for e in metadata} == {
+        ("process_name", "apply"),
+        ("thread_name", "main"),
+        ("thread_name", "web1"),
+    }
+    assert [(e["name"], e["ts"], e["dur"]) for e in spans] == [
+        ("terraform", 5_000_000, 2_000_000),
+        ("setup", 5_500_000, 500_000),
+    ]
+    threads = {e["args"]["name"]: e["tid"] for e in metadata if "tid" in e}
+    assert spans[1]["tid"] == threads["web1"]
+    assert all(e["pid"] == spans[0]["pid"] for e in trace["traceEvents"])
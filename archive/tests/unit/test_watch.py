@@ -0,0 +1,56 @@
+"""Tests for debounced file watching"""
+
+import threading
+import time
+
+import pytest
+
+from scripts.common.watch import FileWatcher
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "docs"
+    (root / ".venv").mkdir(parents=True)
+    (root / "index.md").write_text("# Index\n")
+    return root
+
+
+def write_burst(root):
+    """Save two files in quick succession, plus one in a pruned directory"""
+    time.sleep(0.05)
+    (root / "index.md").write_text("# Changed\n")
+    (root / ".venv" / "site.py").write_text("")
+    time.sleep(0.05)
+    (root / "guide.md").write_text("# Guide\n")
+
+
+@pytest.fixture(params=["polling", "inotify"])
+def watcher(request, root, monkeypatch):
+    if request.param == "polling":
+        monkeypatch.setattr(FileWatcher, "_load_libc", staticmethod(lambda: None))
+    watcher = FileWatcher([root], debounce=0.2, poll_interval=0.02)
+    if watcher.backend != request.param:
+        pytest.skip("inotify is not available")
+    with watcher:
+        yield watcher
+
+
+def test_a_burst_of_saves_yields_one_batch(watcher, root):
+    writer = threading.Thread(target=write_burst, args=(root,))
+    writer.start()
+
+    batch = next(watcher.batches())
+    writer.join()
+
+    assert batch == {root / "index.md", root / "guide.md"}
+    if watcher.backend == "polling":
+        assert watcher._poll() == set()
+
+
+def test_missing_roots_are_ignored(tmp_path, root):
+    watcher = FileWatcher([root, tmp_path / "missing"])
+
+    assert watcher.roots == [root]